@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the Phase I Todo Console App.
+
+Run any benchmark from the Phase_I directory, for example:
+    python -m benchmarks.bench_lookup
+"""
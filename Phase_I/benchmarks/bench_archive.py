@@ -0,0 +1,102 @@
+"""
+Benchmark: hot-set cost of a growing history, with and without an archive.
+
+Builds data directories holding a fixed number of active tasks plus an
+increasing number of tasks completed long ago. Each directory is opened
+twice: as is, and after archive_completed() has moved the old tasks to
+compressed segments. For each it reports the memory allocated by opening
+the service, a full `list` scan, the first pending-task query (which
+builds the status index) and a lookup of an archived task. With the
+archive the first three track the active work only, whatever the length
+of the history.
+
+Usage:
+    python -m benchmarks.bench_archive [active] [history sizes...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from src.services.task_service import TaskService
+from src.storage import JournalPersistence, TaskArchive
+
+DEFAULT_ACTIVE = 5_000
+DEFAULT_HISTORY = [20_000, 100_000, 400_000]
+AGE = timedelta(days=30)
+
+
+def write_history(directory: str, active: int, history: int):
+    """Persist `history` old completed tasks followed by `active` pending ones."""
+    service = TaskService(history_limit=0)
+    service.add_many((f"Old task {i}", f"Notes for old task {i}") for i in range(history))
+    long_ago = datetime.now() - 2 * AGE
+    for task in service.store:
+        task.completed = True
+        task.updated_at = long_ago
+    service.add_many((f"Active task {i}", f"Notes for active task {i}") for i in range(active))
+    persistence = JournalPersistence(directory, sync="none")
+    persistence.service = service
+    persistence.snapshot()
+    persistence.close()
+
+
+def open_service(directory: str, archived: bool) -> TaskService:
+    archive = TaskArchive(os.path.join(directory, "archive"), AGE) if archived else None
+    return TaskService(persistence=JournalPersistence(directory, sync="none"), history_limit=0,
+                       archive=archive)
+
+
+def measure(directory: str, archived: bool):
+    """Return (open MB, scan ms, pending query ms, archived lookup ms)."""
+    tracemalloc.start()
+    service = open_service(directory, archived)
+    opened_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in service.iter_tasks():
+        pass
+    scanned = time.perf_counter() - start
+
+    start = time.perf_counter()
+    service.query(completed=False, limit=50)
+    queried = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert service.get_task_by_id(1) is not None
+    looked_up = time.perf_counter() - start
+
+    service.close()
+    return opened_mb, scanned, queried, looked_up
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    active = int(args[0]) if args else DEFAULT_ACTIVE
+    histories = [int(arg) for arg in args[1:]] or DEFAULT_HISTORY
+    print(f"{active:,} active tasks")
+    print(f"{'history':>9} {'tier':<9} {'open MB':>8} {'list ms':>9} {'pending ms':>11} {'old get ms':>11}")
+    for history in histories:
+        root = tempfile.mkdtemp()
+        try:
+            write_history(root, active, history)
+            for archived in (False, True):
+                if archived:
+                    service = open_service(root, True)
+                    service.archive_completed()
+                    service.persistence.snapshot()
+                    service.close()
+                opened_mb, scanned, queried, looked_up = measure(root, archived)
+                tier = "archived" if archived else "hot"
+                print(f"{history:>9,} {tier:<9} {opened_mb:>8.1f} {scanned * 1000:>9.1f} "
+                      f"{queried * 1000:>11.2f} {looked_up * 1000:>11.3f}")
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: batch mode against line-at-a-time command execution.
+
+Feeds N generated `add` commands (with a `complete` every tenth line)
+through BatchRunner and through the interactive per-line path, and
+reports commands per second. Output goes to the null device, line
+buffered for the per-line path as it would be on a terminal.
+
+Usage:
+    python -m benchmarks.bench_batch [count]
+"""
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.cli.batch import BatchRunner
+from src.cli.console import ConsoleInterface
+from src.services.task_service import TaskService
+
+DEFAULT_COUNT = 100_000
+
+
+def script(count: int):
+    lines = []
+    for i in range(count):
+        if i % 10 == 9:
+            lines.append(f"complete {i}")
+        else:
+            lines.append(f'add "Task {i}" "Description for task {i}"')
+    return lines
+
+
+def interactive(lines) -> float:
+    console = ConsoleInterface(TaskService())
+    start = time.perf_counter()
+    with open(os.devnull, "w", buffering=1) as terminal, redirect_stdout(terminal):
+        for line in lines:
+            console.execute_command(*console.parse_command(line))
+    return time.perf_counter() - start
+
+
+def batch(lines) -> float:
+    console = ConsoleInterface(TaskService())
+    start = time.perf_counter()
+    with open(os.devnull, "w") as output, redirect_stdout(output), redirect_stderr(io.StringIO()):
+        BatchRunner(console).run(lines)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else DEFAULT_COUNT
+    lines = script(count)
+    print(f"{count} commands")
+    print(f"{'mode':<12} {'seconds':>10} {'ops/sec':>12}")
+    for name, run in (("per-line", interactive), ("batch", batch)):
+        seconds = run(lines)
+        print(f"{name:<12} {seconds:>10.3f} {count / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
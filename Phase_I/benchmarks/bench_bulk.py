@@ -0,0 +1,70 @@
+"""
+Benchmark: bulk mutations against one call per task.
+
+Completes, updates and deletes K of N tasks with complete_many,
+update_many and delete_many, and with a loop of single-task calls, on
+the in-memory and SQLite engines. Each single call re-validates, reads
+the clock and (on SQLite) commits on its own; the bulk calls share one
+timestamp and, on SQLite, one transaction.
+
+Usage:
+    python -m benchmarks.bench_bulk [tasks] [batch]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.services.sqlite_task_service import SqliteTaskService
+from src.services.task_service import TaskService
+
+
+def engines(directory: str):
+    yield "memory", TaskService()
+    yield "sqlite", SqliteTaskService(os.path.join(directory, "bench.db"))
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def one_by_one(method, task_ids):
+    for task_id in task_ids:
+        method(task_id)
+
+
+def update_one_by_one(service, task_ids):
+    for task_id in task_ids:
+        service.update_task(task_id, "Renamed")
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    tasks = int(args[0]) if len(args) > 0 else 100_000
+    batch = int(args[1]) if len(args) > 1 else 10_000
+    print(f"{batch:,} of {tasks:,} tasks per operation")
+    print(f"{'engine':<8} {'operation':<10} {'single (ms)':>12} {'bulk (ms)':>10} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, service in engines(directory):
+            service.add_many((f"Task {i}", None) for i in range(2 * tasks))
+            singles = list(range(1, batch + 1))
+            bulks = list(range(tasks + 1, tasks + batch + 1))
+            rows = [
+                ("complete", timed(one_by_one, service.mark_task_complete, singles),
+                 timed(service.complete_many, bulks)),
+                ("update", timed(update_one_by_one, service, singles),
+                 timed(service.update_many, [(task_id, "Renamed", None) for task_id in bulks])),
+                ("delete", timed(one_by_one, service.delete_task, singles),
+                 timed(service.delete_many, bulks)),
+            ]
+            for operation, single, bulk in rows:
+                print(f"{name:<8} {operation:<10} {single * 1000:>12,.1f} {bulk * 1000:>10,.1f} "
+                      f"{single / bulk:>7.1f}x")
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
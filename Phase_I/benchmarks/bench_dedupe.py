@@ -0,0 +1,88 @@
+"""
+Benchmark: content hash index against pairwise duplicate detection.
+
+Fills a store where one task in ten repeats an earlier task's text with
+different case and spacing, then compares duplicate_groups() with the
+pairwise comparison a caller would otherwise run (capped, as it is
+quadratic), reports the cost of add_task with unique=True and with an
+idempotency key against a plain add, and checks that retried keyed adds
+create nothing.
+
+Usage:
+    python -m benchmarks.bench_dedupe [sizes...]
+"""
+import sys
+import time
+
+from src.services.dedupe import normalize
+from src.services.task_service import TaskService
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# Largest store the pairwise scan is timed on; beyond it the time is extrapolated
+PAIRWISE_LIMIT = 3_000
+ADDS = 20_000
+
+
+def texts(size: int):
+    """(title, description) pairs; every tenth repeats an earlier one, reformatted."""
+    for i in range(size):
+        if i % 10 == 9:
+            j = i - 9
+            yield f"  TASK   {j} ", f"notes FOR task {j}"
+        else:
+            yield f"Task {i}", f"Notes for task {i}"
+
+
+def pairwise(tasks) -> int:
+    """Count duplicate pairs by comparing every pair of tasks."""
+    keys = [(normalize(task.title), normalize(task.description)) for task in tasks]
+    found = 0
+    for i in range(len(keys)):
+        for j in range(i + 1, len(keys)):
+            if keys[i] == keys[j]:
+                found += 1
+    return found
+
+
+def add_us(size: int, **options) -> float:
+    """Mean microseconds per add_task on a store of `size` tasks."""
+    service = TaskService(history_limit=0)
+    service.add_many(texts(size))
+    if options.get("unique"):
+        service.content_index  # build the index outside the timed region
+    start = time.perf_counter()
+    for i in range(ADDS):
+        if "key" in options:
+            options["key"] = f"request-{i}"
+        service.add_task(f"New task {i}", "Fresh notes", **options)
+    return (time.perf_counter() - start) / ADDS * 1e6
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (argv or sys.argv[1:])] or DEFAULT_SIZES
+    print(f"{'tasks':>10} {'index ms':>9} {'groups ms':>10} {'pairwise s':>11} "
+          f"{'add µs':>7} {'unique µs':>10} {'keyed µs':>9}")
+    for size in sizes:
+        service = TaskService(history_limit=0)
+        service.add_many(texts(size))
+        start = time.perf_counter()
+        service.content_index
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        groups = service.duplicate_groups()
+        grouped = time.perf_counter() - start
+
+        sample = min(size, PAIRWISE_LIMIT)
+        start = time.perf_counter()
+        pairwise(service.get_all_tasks()[:sample])
+        compared = (time.perf_counter() - start) * (size / sample) ** 2
+        assert len(groups) == size // 10
+
+        retried = service.add_task("Retried", key="once")
+        assert service.add_task("Retried", key="once").id == retried.id
+        print(f"{size:>10} {built * 1000:>9.1f} {grouped * 1000:>10.1f} {compared:>11.1f} "
+              f"{add_us(size):>7.2f} {add_us(size, unique=True):>10.2f} {add_us(size, key=''):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: cost of change notifications on add_task.
+
+Adds N tasks with no event bus, with a synchronous subscriber, with a
+threaded subscriber that keeps up, and with a threaded subscriber that
+sleeps on every batch. Reports adds/sec, how many batches the threaded
+subscribers saw (coalescing) and how many events the slow one had to
+drop (backpressure); the slow subscriber must not slow the writer down.
+
+Usage:
+    python -m benchmarks.bench_events [count]
+"""
+import sys
+import time
+
+from src.services.task_service import TaskService
+
+
+def run(count: int, subscribe=None):
+    service = TaskService()
+    batches = []
+    subscription = subscribe(service, batches) if subscribe else None
+    start = time.perf_counter()
+    for i in range(count):
+        service.add_task(f"Task {i}")
+    rate = count / (time.perf_counter() - start)
+    service.close()
+    dropped = getattr(subscription, "dropped", 0)
+    return rate, len(batches), dropped
+
+
+def sync(service, batches):
+    return service.events.subscribe(lambda batch: batches.append(len(batch)))
+
+
+def threaded(service, batches):
+    return service.events.subscribe_threaded(lambda batch: batches.append(len(batch)))
+
+
+def slow(service, batches):
+    def callback(batch):
+        batches.append(len(batch))
+        time.sleep(0.05)
+    return service.events.subscribe_threaded(callback, max_pending=10_000)
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else 200_000
+    print(f"{count:,} adds")
+    print(f"{'subscriber':<12} {'adds/sec':>10} {'batches':>9} {'dropped':>9}")
+    for name, subscribe in (("none", None), ("sync", sync), ("threaded", threaded), ("slow", slow)):
+        rate, batches, dropped = run(count, subscribe)
+        print(f"{name:<12} {rate:>10,.0f} {batches:>9,} {dropped:>9,}")
+
+
+if __name__ == "__main__":
+    main()
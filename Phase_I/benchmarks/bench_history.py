@@ -0,0 +1,49 @@
+"""
+Benchmark: cost of the undo log on the mutation hot path.
+
+Runs the same add / update / complete / delete workload with the
+operation log disabled (history_limit=0), at its default bound, and
+with a bound large enough to never evict, and reports ops/sec and the
+overhead relative to no log.
+
+Usage:
+    python -m benchmarks.bench_history [ops]
+"""
+import sys
+import time
+
+from src.services.task_service import TaskService
+
+LIMITS = [("off", 0), ("default", 10_000), ("unbounded", 10**9)]
+ROUNDS = 5
+
+
+def workload(service: TaskService, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        service.add_task(f"Task {i}", "Description")
+    for task_id in range(1, count + 1):
+        service.update_task(task_id, f"Edited {task_id}")
+    for task_id in range(1, count + 1):
+        service.mark_task_complete(task_id)
+    for task_id in range(1, count + 1, 2):
+        service.delete_task(task_id)
+    return (3 * count + count // 2) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else 100_000
+    print(f"{count:,} tasks: add, update, complete, delete half")
+    print(f"{'log':<10} {'ops/sec':>12} {'overhead':>9}")
+    best = {name: 0.0 for name, _ in LIMITS}
+    for _ in range(ROUNDS):
+        for name, limit in LIMITS:
+            best[name] = max(best[name], workload(TaskService(history_limit=limit), count))
+    baseline = best["off"]
+    for name, _ in LIMITS:
+        print(f"{name:<10} {best[name]:>12,.0f} {baseline / best[name] - 1:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: HTTP API latency and throughput under concurrent clients.
+
+Starts `python -m src.main --serve` in a subprocess, seeds it with tasks,
+then runs keep-alive clients at 1, 16 and 256 concurrent connections.
+Each client issues a mix of 80% GET /tasks/<id> and 20% POST /tasks and
+records per-request latency. Reports requests/sec, p50 and p99.
+
+Usage:
+    python -m benchmarks.bench_http [--engine memory|sqlite] [--duration SECONDS]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+CONCURRENCY = [1, 16, 256]
+SEED_TASKS = 1000
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def request(reader, writer, method: str, path: str, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n"
+                 .encode() + body)
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(port: int, deadline: float, latencies: list, rng: random.Random):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if rng.random() < 0.8:
+                await request(reader, writer, "GET", f"/tasks/{rng.randint(1, SEED_TASKS)}")
+            else:
+                await request(reader, writer, "POST", "/tasks", {"title": "Load test task"})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_level(port: int, concurrency: int, duration: float) -> dict:
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, deadline, latencies, random.Random(i))
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def seed(port: int):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(SEED_TASKS):
+        await request(reader, writer, "POST", "/tasks", {"title": f"Seed {i}"})
+    writer.close()
+
+
+async def wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def main_async(args):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        command = [sys.executable, "-m", "src.main", "--serve", "--port", str(port),
+                   "--engine", args.engine, "--db", os.path.join(directory, "bench.db")]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        try:
+            await wait_for_port(port)
+            await seed(port)
+            print(f"engine={args.engine}, {args.duration:.0f}s per level")
+            print(f"{'clients':>8} {'req/sec':>10} {'p50 ms':>8} {'p99 ms':>8}")
+            for concurrency in CONCURRENCY:
+                result = await run_level(port, concurrency, args.duration)
+                print(f"{concurrency:>8} {result['rps']:>10,.0f} {result['p50']:>8.2f} {result['p99']:>8.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--engine", choices=("memory", "columnar", "sqlite"), default="memory")
+    parser.add_argument("--duration", type=float, default=3.0)
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
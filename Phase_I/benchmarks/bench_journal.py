@@ -0,0 +1,66 @@
+"""
+Benchmark: journal throughput per fsync mode, and recovery time.
+
+Runs a mix of add/update/complete/delete operations against a journaled
+TaskService in each sync mode and reports operations per second, then
+times a restart from the resulting snapshot and journal.
+
+Usage:
+    python -m benchmarks.bench_journal [operations]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+from src.services.task_service import TaskService
+from src.storage.journal import JournalPersistence
+
+DEFAULT_OPERATIONS = 20_000
+
+
+def workload(service: TaskService, operations: int):
+    """Apply `operations` mutations: mostly adds, with edits and deletes."""
+    for i in range(operations):
+        kind = i % 4
+        if kind in (0, 1):
+            service.add_task(f"Task {i}", f"Description {i}")
+        elif kind == 2:
+            service.mark_task_complete(service.next_id - 1)
+        else:
+            service.delete_task(service.next_id - 2)
+
+
+def run(sync: str, operations: int) -> dict:
+    directory = tempfile.mkdtemp(prefix="todo-journal-")
+    try:
+        service = TaskService(persistence=JournalPersistence(directory, sync=sync))
+        start = time.perf_counter()
+        workload(service, operations)
+        service.close()
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = TaskService(persistence=JournalPersistence(directory, sync=sync))
+        recovery = time.perf_counter() - start
+        restored.close()
+        return {"ops_per_sec": operations / elapsed, "recovery_ms": recovery * 1000,
+                "tasks": len(restored.store)}
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    operations = int(args[0]) if args else DEFAULT_OPERATIONS
+    print(f"{'sync mode':<10} {'ops':>8} {'ops/sec':>12} {'recovery ms':>12} {'tasks':>8}")
+    for sync in ("always", "batch", "none"):
+        # fsync per operation is slow; keep its run short
+        count = min(operations, 2_000) if sync == "always" else operations
+        result = run(sync, count)
+        print(f"{sync:<10} {count:>8} {result['ops_per_sec']:>12.0f} {result['recovery_ms']:>12.1f} "
+              f"{result['tasks']:>8}")
+
+
+if __name__ == "__main__":
+    main()
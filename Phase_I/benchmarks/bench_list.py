@@ -0,0 +1,44 @@
+"""
+Benchmark: console listing cost as the store grows.
+
+Times `list --page 1` (which should stay flat regardless of store size)
+and a full `list` written to an in-memory buffer.
+
+Usage:
+    python -m benchmarks.bench_list [sizes...]
+"""
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+
+from src.cli.console import ConsoleInterface
+from src.services.task_service import TaskService
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def run_command(console: ConsoleInterface, line: str) -> float:
+    """Run one console command with stdout captured; return seconds."""
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        console.execute_command(*console.parse_command(line))
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (argv or sys.argv[1:])] or DEFAULT_SIZES
+    print(f"{'tasks':>10} {'first page ms':>14} {'full list ms':>14}")
+    for size in sizes:
+        service = TaskService()
+        for i in range(size):
+            service.add_task(f"Task {i}", f"Description {i}")
+        console = ConsoleInterface(service)
+        first_page = run_command(console, "list --page 1 --limit 20")
+        full = run_command(console, "list")
+        print(f"{size:>10} {first_page * 1000:>14.3f} {full * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: per-operation latency of TaskService point operations.
+
+Fills a TaskService with N tasks and times get_task_by_id, update_task,
+mark_task_complete and delete_task against random IDs. With the ID index
+the per-operation latency should stay flat as N grows from 1k to 1M.
+
+Usage:
+    python -m benchmarks.bench_lookup [sizes...]
+"""
+import random
+import sys
+import time
+
+from src.services.task_service import TaskService
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+OPERATIONS = 10_000
+
+
+def build_service(size: int) -> TaskService:
+    """Create a service holding `size` tasks."""
+    service = TaskService()
+    for i in range(size):
+        service.add_task(f"Task {i}", f"Description {i}")
+    return service
+
+
+def time_operation(func, ids) -> float:
+    """Return the mean latency of func(task_id) in microseconds."""
+    start = time.perf_counter()
+    for task_id in ids:
+        func(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def run(size: int) -> dict:
+    """Time each point operation on a store of `size` tasks."""
+    service = build_service(size)
+    rng = random.Random(size)
+    ids = [rng.randint(1, size) for _ in range(OPERATIONS)]
+    delete_ids = rng.sample(range(1, size + 1), min(OPERATIONS, size))
+
+    return {
+        "get": time_operation(service.get_task_by_id, ids),
+        "update": time_operation(lambda i: service.update_task(i, "Renamed"), ids),
+        "complete": time_operation(service.mark_task_complete, ids),
+        "delete": time_operation(service.delete_task, delete_ids),
+    }
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (argv or sys.argv[1:])] or DEFAULT_SIZES
+    print(f"{'tasks':>10} {'get us':>10} {'update us':>10} {'complete us':>12} {'delete us':>10}")
+    for size in sizes:
+        result = run(size)
+        print(f"{size:>10} {result['get']:>10.3f} {result['update']:>10.3f} "
+              f"{result['complete']:>12.3f} {result['delete']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: bytes per task for each in-memory layout.
+
+Compares the original unslotted Task dataclass kept in an ID dict, the slotted
+Task in a DictTaskStore, and the ColumnarTaskStore. Memory is measured
+with tracemalloc while the store is being filled.
+
+Usage:
+    python -m benchmarks.bench_memory [count]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from src.services.task_service import TaskService
+from src.storage import ColumnarTaskStore, DictTaskStore
+
+DEFAULT_COUNT = 200_000
+
+
+@dataclass
+class LegacyTask:
+    """The Task layout before slots: per-instance __dict__ and datetimes."""
+    id: int
+    title: str
+    description: Optional[str] = None
+    completed: bool = False
+    created_at: datetime = None
+    updated_at: datetime = None
+
+
+def fill_legacy(count: int):
+    tasks = {}
+    for i in range(count):
+        now = datetime.now()
+        tasks[i + 1] = LegacyTask(i + 1, f"Task number {i}", f"Description for task {i}",
+                                  created_at=now, updated_at=now)
+    return tasks
+
+
+def fill_service(store, count: int):
+    service = TaskService(store)
+    for i in range(count):
+        service.add_task(f"Task number {i}", f"Description for task {i}")
+    return service
+
+
+def measure(build, count: int) -> float:
+    """Return the bytes allocated per task by build(count)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / count
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else DEFAULT_COUNT
+    layouts = [
+        ("dataclass (dict)", fill_legacy),
+        ("slotted (DictTaskStore)", lambda n: fill_service(DictTaskStore(), n)),
+        ("columnar (ColumnarTaskStore)", lambda n: fill_service(ColumnarTaskStore(), n)),
+    ]
+    print(f"{count} tasks")
+    print(f"{'layout':<30} {'bytes/task':>12}")
+    for name, build in layouts:
+        print(f"{name:<30} {measure(build, count):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: cost of metrics and the sampled profiler on the hot path.
+
+Runs the same add / lookup / update / complete workload on a plain
+service (metrics off, which is exactly the code path of a build without
+metrics), an instrumented one, and a plain one under the sampled
+profiler, and reports ops/sec and the overhead relative to off.
+
+Usage:
+    python -m benchmarks.bench_metrics [ops]
+"""
+import sys
+import time
+
+from src.cli.profiler import SampledProfiler
+from src.services.metrics import Metrics
+from src.services.task_service import TaskService
+
+MODES = ("off", "metrics", "profiler")
+ROUNDS = 5
+
+
+def workload(service: TaskService, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        service.add_task(f"Task {i}", "Description")
+    for task_id in range(1, count + 1):
+        service.get_task_by_id(task_id)
+    for task_id in range(1, count + 1):
+        service.update_task(task_id, f"Edited {task_id}")
+    for task_id in range(1, count + 1):
+        service.mark_task_complete(task_id)
+    return 4 * count / (time.perf_counter() - start)
+
+
+def run(mode: str, count: int) -> float:
+    service = TaskService()
+    if mode == "metrics":
+        Metrics().instrument(service)
+    if mode != "profiler":
+        return workload(service, count)
+    profiler = SampledProfiler()
+    profiler.start()
+    try:
+        return workload(service, count)
+    finally:
+        profiler.stop()
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else 100_000
+    print(f"{count:,} tasks: add, get, update, complete")
+    print(f"{'mode':<10} {'ops/sec':>12} {'overhead':>9}")
+    best = {mode: 0.0 for mode in MODES}
+    for _ in range(ROUNDS):
+        for mode in MODES:
+            best[mode] = max(best[mode], run(mode, count))
+    for mode in MODES:
+        print(f"{mode:<10} {best[mode]:>12,.0f} {best['off'] / best[mode] - 1:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
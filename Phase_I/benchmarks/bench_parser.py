@@ -0,0 +1,73 @@
+"""
+Benchmark: command parsing and dispatch cost per line.
+
+Compares the original parser (split, then an uncompiled re.findall over
+the whole line for add/update) with the single-pass tokenizer, and times
+parse + dispatch through the command registry with no-op handlers so the
+service cost is excluded.
+
+Usage:
+    python -m benchmarks.bench_parser [lines]
+"""
+import re
+import sys
+import time
+
+from src.cli.console import ConsoleInterface
+from src.cli.parser import parse_line
+from src.services.task_service import TaskService
+
+DEFAULT_LINES = 200_000
+SAMPLE = [
+    'add "Buy groceries" "Milk, eggs, bread"',
+    'update 12 "Buy groceries and fruits" "Milk, eggs, bread, apples"',
+    'complete 42',
+    'delete 7',
+    'list --page 2 --limit 20',
+]
+
+
+def legacy_parse(user_input: str) -> tuple:
+    """The parser as it was before the single-pass tokenizer."""
+    parts = user_input.strip().split()
+    if not parts:
+        return "", []
+    command = parts[0].lower()
+    args = parts[1:] if len(parts) > 1 else []
+    if command in ["add", "update"]:
+        pattern = r'"([^"]*)"|\'([^\']*)\'|(\S+)'
+        matches = re.findall(pattern, user_input)
+        all_parts = [next(filter(None, match), "") for match in matches]
+        command = all_parts[0].lower()
+        args = all_parts[1:] if len(all_parts) > 1 else []
+    return command, args
+
+
+def per_line_us(func, lines) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        func(line)
+    return (time.perf_counter() - start) / len(lines) * 1e6
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else DEFAULT_LINES
+    lines = (SAMPLE * (count // len(SAMPLE) + 1))[:count]
+
+    console = ConsoleInterface(TaskService())
+    for name in list(console.commands):
+        console.register_command(name, lambda console, args: True)
+
+    def dispatch(line):
+        console.execute_command(*parse_line(line))
+
+    print(f"{count} lines")
+    print(f"{'stage':<28} {'us/line':>10}")
+    print(f"{'legacy parse':<28} {per_line_us(legacy_parse, lines):>10.3f}")
+    print(f"{'single-pass parse':<28} {per_line_us(parse_line, lines):>10.3f}")
+    print(f"{'parse + registry dispatch':<28} {per_line_us(dispatch, lines):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: indexed queries against a full scan.
+
+Fills a store where every third task is completed and a small recent
+slice has been updated, then compares TaskService.query with filtering
+get_all_tasks() by hand.
+
+Usage:
+    python -m benchmarks.bench_query [sizes...]
+"""
+import sys
+import time
+from datetime import datetime
+
+from src.services.task_service import TaskService
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+REPEAT = 50
+
+
+def timed_ms(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (argv or sys.argv[1:])] or DEFAULT_SIZES
+    print(f"{'tasks':>10} {'query':<26} {'indexed ms':>11} {'scan ms':>10}")
+    for size in sizes:
+        service = TaskService()
+        for i in range(size):
+            service.add_task(f"Task {i}")
+        for task_id in range(1, size + 1, 3):
+            service.mark_task_complete(task_id)
+        since = datetime.now()
+        for task_id in range(size - 100, size + 1):
+            service.update_task(task_id, "Recently edited")
+        service.status_index  # build the indexes outside the timed region
+
+        cases = [
+            ("pending, first 20",
+             lambda: service.query(completed=False, limit=20),
+             lambda: [t for t in service.get_all_tasks() if not t.completed][:20]),
+            ("updated since T",
+             lambda: service.query(updated_since=since, order_by="updated_at"),
+             lambda: sorted((t for t in service.get_all_tasks() if t.updated_at >= since),
+                            key=lambda t: t.updated_at)),
+            ("completed, newest 20",
+             lambda: service.query(completed=True, descending=True, limit=20),
+             lambda: [t for t in reversed(service.get_all_tasks()) if t.completed][:20]),
+        ]
+        for name, indexed, scan in cases:
+            assert [t.id for t in indexed()] == [t.id for t in scan()]
+            print(f"{size:>10} {name:<26} {timed_ms(indexed):>11.3f} {timed_ms(scan):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
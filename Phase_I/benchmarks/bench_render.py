@@ -0,0 +1,57 @@
+"""
+Benchmark: repeated `list` with and without the render cache.
+
+Lists the whole store several times, first clearing the console's
+render cache before each run (every task formatted again, as before
+the cache existed), then keeping it, and finally after editing 1% of
+the tasks so only those are formatted again.
+
+Usage:
+    python -m benchmarks.bench_render [tasks] [repeats]
+"""
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+
+from src.cli.console import ConsoleInterface
+from src.services.task_service import TaskService
+
+
+def list_all(console: ConsoleInterface, repeats: int, clear: bool) -> float:
+    """Run `list` `repeats` times with stdout captured; return mean seconds."""
+    total = 0.0
+    for _ in range(repeats):
+        if clear:
+            console.rendered.clear()
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        with redirect_stdout(buffer):
+            console.display_tasks()
+        total += time.perf_counter() - start
+    return total / repeats
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else 100_000
+    repeats = int(args[1]) if len(args) > 1 else 5
+    service = TaskService()
+    for i in range(count):
+        service.add_task(f"Task {i}", f"Description {i}")
+    console = ConsoleInterface(service)
+
+    uncached = list_all(console, repeats, clear=True)
+    cached = list_all(console, repeats, clear=False)
+    for task_id in range(1, count + 1, 100):
+        service.update_task(task_id, f"Edited {task_id}")
+    edited = list_all(console, 1, clear=False)
+
+    print(f"{count:,} tasks, full list, mean of {repeats}")
+    print(f"{'cache':<14} {'ms':>10} {'speedup':>8}")
+    for name, seconds in [("off", uncached), ("warm", cached), ("1% edited", edited)]:
+        print(f"{name:<14} {seconds * 1000:>10.1f} {uncached / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: scheduling heaps against sorting every open task.
+
+Fills a store with open tasks that have random due dates and priorities,
+then compares next_tasks() and due_tasks() with filtering and sorting
+get_all_tasks() the way a caller would without the scheduler. Also
+reports what keeping the heaps costs each schedule_task call, and how
+long the reminder loop takes to wake for a due date added last.
+
+Usage:
+    python -m benchmarks.bench_scheduler [sizes...]
+"""
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.services.scheduler import NO_DUE_KEY
+from src.services.task_service import TaskService
+
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+REPEAT = 20
+RESCHEDULES = 20_000
+LIMIT = 20
+WINDOW = timedelta(hours=1)
+
+
+def timed_ms(func, repeat: int = REPEAT) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def fill(service: TaskService, size: int, rng: random.Random, now: datetime):
+    """Add `size` open tasks, four in five with a due date within the next 30 days."""
+    for i in range(size):
+        due = now + timedelta(minutes=rng.randrange(1, 30 * 24 * 60)) if rng.random() < 0.8 else None
+        service.add_task(f"Task {i}", due_at=due, priority=rng.randrange(10))
+
+
+def scan_next(service: TaskService):
+    """The first page by priority without the scheduler."""
+    pending = [task for task in service.get_all_tasks() if not task.completed]
+    pending.sort(key=lambda task: (-task.priority, task.due_at or NO_DUE_KEY, task.id))
+    return pending[:LIMIT]
+
+
+def scan_due(service: TaskService, moment: datetime):
+    """Tasks due before `moment` without the scheduler."""
+    due = [task for task in service.get_all_tasks()
+           if not task.completed and task.due_at is not None and task.due_at < moment]
+    due.sort(key=lambda task: (task.due_at, task.id))
+    return due
+
+
+def reschedule_us(service: TaskService, size: int, rng: random.Random, now: datetime) -> float:
+    """Mean microseconds per schedule_task call."""
+    start = time.perf_counter()
+    for _ in range(RESCHEDULES):
+        service.schedule_task(rng.randrange(1, size + 1), due_at=now + timedelta(minutes=rng.randrange(1, 60 * 24)),
+                              priority=rng.randrange(10))
+    return (time.perf_counter() - start) / RESCHEDULES * 1e6
+
+
+def wake_ms(service: TaskService) -> float:
+    """Milliseconds from a due date passing to its reminder firing."""
+    fired = threading.Event()
+    service.start_reminders(lambda reminders: fired.set())
+    due = datetime.now() + timedelta(milliseconds=100)
+    service.add_task("Reminder probe", due_at=due)
+    fired.wait(5)
+    woke = datetime.now()
+    service.stop_reminders()
+    return (woke - due).total_seconds() * 1000
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (argv or sys.argv[1:])] or DEFAULT_SIZES
+    print(f"{'tasks':>10} {'next ms':>9} {'scan ms':>9} {'due ms':>8} {'scan ms':>9} "
+          f"{'plain µs':>9} {'+heaps µs':>10} {'wake ms':>8}")
+    for size in sizes:
+        rng = random.Random(size)
+        now = datetime.now()
+        service = TaskService(history_limit=0)
+        fill(service, size, rng, now)
+        plain = reschedule_us(service, size, rng, now)
+        service.scheduler  # build the heaps outside the timed region
+        maintained = reschedule_us(service, size, rng, now)
+
+        moment = now + WINDOW
+        assert [task.id for task in service.next_tasks(LIMIT)] == [task.id for task in scan_next(service)]
+        assert [task.id for task in service.due_tasks(WINDOW, now)] == [task.id for task in scan_due(service, moment)]
+        print(f"{size:>10} {timed_ms(lambda: service.next_tasks(LIMIT)):>9.3f} "
+              f"{timed_ms(lambda: scan_next(service), 3):>9.1f} "
+              f"{timed_ms(lambda: service.due_tasks(WINDOW, now)):>8.3f} "
+              f"{timed_ms(lambda: scan_due(service, moment), 3):>9.1f} "
+              f"{plain:>9.2f} {maintained:>10.2f} {wake_ms(service):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
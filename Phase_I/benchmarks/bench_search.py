@@ -0,0 +1,61 @@
+"""
+Benchmark: inverted-index search against a linear scan.
+
+Generates tasks from a fixed vocabulary, builds the search index once,
+then times exact, multi-word and prefix queries alongside a substring
+scan over every title and description.
+
+Usage:
+    python -m benchmarks.bench_search [count]
+"""
+import random
+import sys
+import time
+
+from src.services.task_service import TaskService
+
+DEFAULT_COUNT = 500_000
+STEMS = ("plan", "buy", "call", "write", "fix", "review", "book", "clean", "send", "pay", "order", "check")
+WORDS = ([f"{stem}{suffix}" for stem in STEMS for suffix in ("", "s", "ing", "ed", "er")]
+         + [f"topic{i}" for i in range(2000)])
+QUERIES = ["topic1234", "review topic42", "topic12", "pay invoice", "cleaning"]
+REPEAT = 20
+
+
+def build(count: int) -> TaskService:
+    rng = random.Random(7)
+    service = TaskService()
+    for _ in range(count):
+        service.add_task(" ".join(rng.choices(WORDS, k=4)), " ".join(rng.choices(WORDS, k=10)))
+    return service
+
+
+def scan(service: TaskService, query: str):
+    words = query.lower().split()
+    return [task for task in service.get_all_tasks()
+            if all(word in f"{task.title} {task.description}".lower() for word in words)]
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else DEFAULT_COUNT
+    service = build(count)
+    start = time.perf_counter()
+    service.search_index
+    print(f"{count} tasks, index built in {time.perf_counter() - start:.2f}s")
+    print(f"{'query':<18} {'hits':>7} {'search ms':>10} {'scan ms':>10}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            hits = service.search(query, limit=20)
+        searched = (time.perf_counter() - start) / REPEAT * 1000
+        start = time.perf_counter()
+        scanned = scan(service, query)
+        scan_ms = (time.perf_counter() - start) * 1000
+        # Word and prefix matches are substring matches too
+        assert {task.id for task in hits} <= {task.id for task in scanned}, query
+        print(f"{query:<18} {len(scanned):>7} {searched:>10.3f} {scan_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: aggregate mutation throughput of ShardedTaskService.
+
+For 1, 2, 4 and 8 shard processes:
+1. Bulk adds: add_many in chunks, fanned out to all shards in parallel,
+   with each shard's search index built so inserts do real work.
+2. Point mutations: one complete/update round trip at a time, which
+   measures the per-request IPC cost rather than parallelism.
+
+Bulk throughput scales with the number of free cores; point mutations
+from a single client do not, since each waits for its reply.
+
+Usage:
+    python -m benchmarks.bench_shards [tasks]
+"""
+import os
+import sys
+import time
+
+from src.services.sharded import ShardedTaskService
+
+SHARDS = [1, 2, 4, 8]
+CHUNK = 2_000
+POINT_OPS = 5_000
+
+
+def run(shards: int, tasks: int):
+    service = ShardedTaskService(shards)
+    try:
+        service.search("warm")  # build every shard's search index
+        items = [(f"Task {i} buy groceries and milk", "weekly errand list") for i in range(tasks)]
+
+        start = time.perf_counter()
+        for first in range(0, tasks, CHUNK):
+            service.add_many(items[first:first + CHUNK])
+        bulk = tasks / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for task_id in range(1, POINT_OPS + 1):
+            service.mark_task_complete(task_id)
+        point = POINT_OPS / (time.perf_counter() - start)
+
+        assert len(service.get_all_tasks()) == tasks
+        return bulk, point
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    tasks = int(args[0]) if args else 200_000
+    print(f"{tasks:,} tasks, {os.cpu_count()} CPUs")
+    print(f"{'shards':>7} {'bulk adds/sec':>14} {'point ops/sec':>14}")
+    for shards in SHARDS:
+        bulk, point = run(shards, tasks)
+        print(f"{shards:>7} {bulk:>14,.0f} {point:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: opening a persisted store from a JSON vs a binary snapshot.
+
+Writes N tasks as a JSON Lines snapshot and as a binary snapshot, then
+opens each in a fresh child process and reports the time until the
+service is usable, the first lookup and first page after that, and the
+child's peak RSS. The mapped engine attaches the binary snapshot with
+mmap and decodes tasks on access; the others load every task eagerly.
+
+Usage:
+    python -m benchmarks.bench_snapshot [tasks]
+"""
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from src.services.task_service import TaskService
+from src.storage import ColumnarTaskStore, JournalPersistence, MappedTaskStore
+
+DEFAULT_TASKS = 1_000_000
+
+STORES = {"dict": lambda: None, "columnar": ColumnarTaskStore, "mapped": MappedTaskStore}
+# (snapshot format, store)
+MODES = [("json", "dict"), ("binary", "dict"), ("binary", "columnar"), ("binary", "mapped")]
+
+
+def write_snapshots(root: str, count: int):
+    """Write the same tasks as a snapshot in each format under `root`."""
+    service = TaskService(ColumnarTaskStore(), history_limit=0)
+    service.add_many((f"Task {i}", f"Description of task {i}" if i % 2 else None) for i in range(count))
+    for snapshot_format in ("json", "binary"):
+        persistence = JournalPersistence(os.path.join(root, snapshot_format), sync="none",
+                                         snapshot_format=snapshot_format)
+        persistence.service = service
+        persistence.snapshot()
+        persistence.close()
+
+
+def child(directory: str, snapshot_format: str, store: str, count: int, results):
+    start = time.perf_counter()
+    persistence = JournalPersistence(directory, sync="none", snapshot_format=snapshot_format)
+    service = TaskService(STORES[store](), persistence)
+    opened = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert service.get_task_by_id(count // 2) is not None
+    lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    page = list(service.iter_tasks(count // 2, 20))
+    listed = time.perf_counter() - start
+    assert len(page) == 20
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    service.close()
+    results.put((opened, lookup, listed, peak_mb))
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else DEFAULT_TASKS
+    with tempfile.TemporaryDirectory() as root:
+        write_snapshots(root, count)
+        sizes = {name: os.path.getsize(os.path.join(root, name, file))
+                 for name, file in (("json", JournalPersistence.SNAPSHOT_FILE),
+                                    ("binary", JournalPersistence.BINARY_SNAPSHOT_FILE))}
+        print(f"{count:,} tasks; snapshot size: json {sizes['json'] / 2**20:.1f} MB, "
+              f"binary {sizes['binary'] / 2**20:.1f} MB")
+        print(f"{'load':<20} {'open ms':>10} {'get ms':>8} {'page ms':>8} {'peak RSS MB':>12}")
+        for snapshot_format, store in MODES:
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=child, args=(os.path.join(root, snapshot_format), snapshot_format,
+                                    store, count, results))
+            process.start()
+            opened, lookup, listed, peak_mb = results.get()
+            process.join()
+            name = f"{snapshot_format} -> {store}"
+            print(f"{name:<20} {opened * 1000:>10.1f} {lookup * 1000:>8.3f} {listed * 1000:>8.3f} "
+                  f"{peak_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: SQLite engine against the in-memory TaskService.
+
+Times N inserts one call at a time, N inserts through add_many (SQLite
+only), and random point lookups for each engine.
+
+Usage:
+    python -m benchmarks.bench_sqlite [count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.services.sqlite_task_service import SqliteTaskService
+from src.services.task_service import TaskService
+
+DEFAULT_COUNT = 100_000
+LOOKUPS = 20_000
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def insert_each(service, count: int):
+    for i in range(count):
+        service.add_task(f"Task {i}", f"Description {i}")
+
+
+def lookups(service, ids):
+    for task_id in ids:
+        service.get_task_by_id(task_id)
+
+
+def report(name: str, count: int, insert_seconds: float, lookup_seconds: float):
+    print(f"{name:<22} {count / insert_seconds:>14.0f} {LOOKUPS / lookup_seconds:>14.0f}")
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    count = int(args[0]) if args else DEFAULT_COUNT
+    ids = [random.Random(0).randint(1, count) for _ in range(LOOKUPS)]
+    print(f"{count} tasks, {LOOKUPS} lookups")
+    print(f"{'engine':<22} {'inserts/sec':>14} {'lookups/sec':>14}")
+
+    memory = TaskService()
+    report("memory", count, timed(lambda: insert_each(memory, count)),
+           timed(lambda: lookups(memory, ids)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        single = SqliteTaskService(os.path.join(directory, "single.db"))
+        report("sqlite add_task", count, timed(lambda: insert_each(single, count)),
+               timed(lambda: lookups(single, ids)))
+        single.close()
+
+        bulk = SqliteTaskService(os.path.join(directory, "bulk.db"))
+        items = [(f"Task {i}", f"Description {i}") for i in range(count)]
+        report("sqlite add_many", count, timed(lambda: bulk.add_many(items)),
+               timed(lambda: lookups(bulk, ids)))
+        bulk.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: cold start of the CLI entry point.
+
+Times fresh interpreters running an empty `--batch` script, which is
+the fixed cost of every scripted or one-shot use of the app, next to a
+bare `python -c pass` for reference. Then runs `python -X importtime`
+on the entry point and lists the imports with the largest cumulative
+time, to show where the remaining startup goes.
+
+run_app.py is timed too once its setup is current (see its marker);
+before that it would run the whole environment setup.
+
+Usage:
+    python -m benchmarks.bench_startup [runs] [top]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wall_ms(command, runs: int) -> float:
+    """Median wall-clock milliseconds of `runs` runs of `command`."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def import_times(module_args, top: int):
+    """Return the `top` (cumulative µs, module) pairs from -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + module_args,
+                            cwd=ROOT, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    runs = int(args[0]) if args else 15
+    top = int(args[1]) if len(args) > 1 else 15
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as script:
+        script.write("# nothing to do\n")
+    try:
+        empty_batch = ["--batch", script.name]
+        commands = [
+            ("python -c pass", [sys.executable, "-c", "pass"]),
+            ("python -m src.main --batch", [sys.executable, "-m", "src.main"] + empty_batch),
+        ]
+        sys.path.insert(0, ROOT)
+        import run_app
+        if run_app.setup_is_current():
+            commands.append(("python run_app.py --batch", [sys.executable, "run_app.py"] + empty_batch))
+        else:
+            print("(run_app.py skipped: run it once to complete its setup)")
+
+        print(f"{'command':<30} {'median ms':>10}   ({runs} runs)")
+        for name, command in commands:
+            print(f"{name:<30} {wall_ms(command, runs):>10.1f}")
+
+        print("\nSlowest imports of src.main (cumulative):")
+        for cumulative, name in import_times(["-m", "src.main"] + empty_batch, top):
+            print(f"{cumulative / 1000:>8.1f} ms  {name}")
+    finally:
+        os.remove(script.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: maintained aggregates against counting by hand.
+
+Fills a store where every third task is completed, then compares
+TaskService.summary() with counting the same totals and per-day
+histograms over get_all_tasks(), and reports what keeping the
+aggregates costs each complete/incomplete call.
+
+Usage:
+    python -m benchmarks.bench_summary [sizes...]
+"""
+import sys
+import time
+from collections import Counter
+
+from src.services.task_service import TaskService
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+REPEAT = 20
+TOGGLES = 20_000
+
+
+def timed_ms(func, repeat: int = REPEAT) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def scan(service: TaskService):
+    """Count the summary figures the way a caller would without the aggregates."""
+    tasks = service.get_all_tasks()
+    completed = [task for task in tasks if task.completed]
+    created = Counter(task.created_at.date() for task in tasks)
+    finished = Counter(task.updated_at.date() for task in completed)
+    return len(tasks), len(completed), created, finished
+
+
+def toggle_us(service: TaskService, size: int) -> float:
+    """Mean microseconds per complete/incomplete call."""
+    start = time.perf_counter()
+    for i in range(TOGGLES):
+        task_id = i % size + 1
+        if i % 2:
+            service.mark_task_incomplete(task_id)
+        else:
+            service.mark_task_complete(task_id)
+    return (time.perf_counter() - start) / TOGGLES * 1e6
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (argv or sys.argv[1:])] or DEFAULT_SIZES
+    print(f"{'tasks':>10} {'summary ms':>11} {'scan ms':>10} {'toggle µs':>10} {'+aggregates µs':>15}")
+    for size in sizes:
+        service = TaskService(history_limit=0)
+        service.add_many((f"Task {i}", None) for i in range(size))
+        service.complete_many(range(1, size + 1, 3))
+        plain = toggle_us(service, size)
+        service.aggregates  # count the store outside the timed region
+        maintained = toggle_us(service, size)
+
+        summary = service.summary()
+        total, completed, created, finished = scan(service)
+        assert (summary.total, summary.completed) == (total, completed)
+        assert summary.created_per_day == dict(created) and summary.completed_per_day == dict(finished)
+        print(f"{size:>10} {timed_ms(service.summary):>11.3f} {timed_ms(lambda: scan(service)):>10.1f} "
+              f"{plain:>10.2f} {maintained:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: ThreadSafeTaskService under concurrent readers and writers.
+
+1. Writers: T threads add and complete tasks; checks that no IDs are
+   duplicated and no updates are lost, and reports mutations/sec.
+2. Readers: T threads do point lookups and snapshot listings while one
+   writer keeps mutating; reports aggregate reads/sec so scaling with T
+   is visible. On a free-threaded build reads should scale with cores;
+   with the GIL they plateau.
+
+Usage:
+    python -m benchmarks.bench_threads [seconds]
+"""
+import random
+import sys
+import threading
+import time
+
+from src.services.threadsafe import ThreadSafeTaskService
+
+THREADS = [1, 2, 4, 8]
+TASKS = 100_000
+
+
+def gil_state() -> str:
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_enabled is None:
+        return "GIL build"
+    return "free-threaded, GIL enabled" if is_enabled() else "free-threaded, GIL disabled"
+
+
+def writers(threads: int, per_thread: int) -> float:
+    service = ThreadSafeTaskService()
+    ids = [[] for _ in range(threads)]
+
+    def work(slot):
+        for i in range(per_thread):
+            task = service.add_task(f"Task {slot}-{i}")
+            service.mark_task_complete(task.id)
+            ids[slot].append(task.id)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=work, args=(slot,)) for slot in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_ids = [task_id for chunk in ids for task_id in chunk]
+    assert len(set(all_ids)) == len(all_ids) == threads * per_thread, "duplicate IDs"
+    assert all(task.completed for task in service.get_all_tasks()), "lost update"
+    return 2 * len(all_ids) / elapsed
+
+
+def readers(threads: int, seconds: float) -> float:
+    service = ThreadSafeTaskService()
+    service.add_many((f"Task {i}", None) for i in range(TASKS))
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def read(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            for _ in range(100):
+                service.get_task_by_id(rng.randint(1, TASKS))
+            list(service.iter_tasks(rng.randint(0, TASKS), 20))
+            counts[slot] += 101
+
+    def write():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            service.update_task(rng.randint(1, TASKS), "Edited")
+            time.sleep(0.001)
+
+    pool = [threading.Thread(target=read, args=(slot,)) for slot in range(threads)]
+    pool.append(threading.Thread(target=write))
+    for thread in pool:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in pool:
+        thread.join()
+    return sum(counts) / seconds
+
+
+def main(argv=None):
+    args = argv or sys.argv[1:]
+    seconds = float(args[0]) if args else 2.0
+    print(gil_state())
+    print(f"{'threads':>8} {'mutations/sec':>14} {'reads/sec':>12}")
+    for threads in THREADS:
+        print(f"{threads:>8} {writers(threads, 20_000 // threads):>14,.0f} "
+              f"{readers(threads, seconds):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
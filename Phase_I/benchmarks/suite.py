@@ -0,0 +1,240 @@
+"""
+Benchmark suite: seeded mixed workloads with JSON results and a baseline gate.
+
+For every combination of driver, store size, mix and text size, a child
+process preloads a fresh service, then times each operation of a seeded
+workload (see benchmarks.workload). The `service` driver calls
+TaskService methods directly. The `console` driver runs the same
+operations as parsed commands through ConsoleInterface.execute_command,
+with output discarded. Results report ops/sec, latency percentiles
+overall and per operation, and the child's peak RSS.
+
+With --baseline, results are compared against a saved run. The suite
+exits with status 1 and prints every regression when throughput drops,
+p99 latency rises or peak RSS grows by more than the tolerances. Only
+compare runs made on the same machine.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000,10000,100000] [--mixes balanced]
+        [--drivers service,console] [--text small] [--ops N] [--seed N]
+        [--output results.json] [--baseline baseline.json]
+        [--tolerance 0.15] [--latency-tolerance 0.5] [--memory-tolerance 0.1]
+
+Save a baseline with `--output baseline.json` on a known-good commit.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.workload import MIXES, PAGE_SIZE, TEXT_SIZES, Workload
+from src.cli.console import ConsoleInterface
+from src.services.task_service import TaskService
+
+DRIVERS = ("service", "console")
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Return the p-th percentile of already sorted values (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """Summarise per-operation seconds as microsecond percentiles."""
+    latencies.sort()
+    summary = {f"p{p}_us": round(percentile(latencies, p) * 1e6, 2) for p in PERCENTILES}
+    summary["max_us"] = round(latencies[-1] * 1e6, 2) if latencies else 0.0
+    return summary
+
+
+def service_calls(service: TaskService):
+    """Map each operation kind to a function(task_id, title, description)."""
+    return {
+        "add": lambda task_id, title, description: service.add_task(title, description),
+        "update": service.update_task,
+        "complete": lambda task_id, title, description: service.mark_task_complete(task_id),
+        "incomplete": lambda task_id, title, description: service.mark_task_incomplete(task_id),
+        "delete": lambda task_id, title, description: service.delete_task(task_id),
+        "list": lambda task_id, title, description: list(service.iter_tasks(task_id, PAGE_SIZE)),
+    }
+
+
+def console_args(op: str, task_id: int, title, description) -> List[str]:
+    """Return the parsed arguments of the console command for an operation."""
+    if op == "add":
+        return [title] + ([description] if description else [])
+    if op == "update":
+        return [str(task_id), title] + ([description] if description else [])
+    if op == "list":
+        return ["--after", str(task_id), "--limit", str(PAGE_SIZE)]
+    return [str(task_id)]
+
+
+def run_case(driver: str, size: int, mix: str, text: str, ops: int, seed: int) -> dict:
+    """Run one benchmark case in this process and return its result."""
+    workload = Workload(seed, mix, text)
+    service = TaskService()
+    start = time.perf_counter()
+    service.add_many(workload.preload(size))
+    preload_seconds = time.perf_counter() - start
+    operations = list(workload.operations(ops))
+
+    if driver == "console":
+        console = ConsoleInterface(service)
+        console.quiet = True
+        execute = console.execute_command
+        steps = [(operation[0], execute, (operation[0], console_args(*operation)))
+                 for operation in operations]
+    else:
+        calls = service_calls(service)
+        steps = [(operation[0], calls[operation[0]], operation[1:]) for operation in operations]
+
+    latencies: Dict[str, List[float]] = {}
+    clock = time.perf_counter
+    real_stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            start = clock()
+            for op, function, args in steps:
+                began = clock()
+                function(*args)
+                latencies.setdefault(op, []).append(clock() - began)
+            elapsed = clock() - start
+        finally:
+            sys.stdout = real_stdout
+
+    everything = [seconds for values in latencies.values() for seconds in values]
+    return {
+        "driver": driver, "size": size, "mix": mix, "text": text, "ops": ops,
+        "ops_per_sec": round(ops / elapsed, 1),
+        "latency": latency_summary(everything),
+        "per_operation": {op: dict(count=len(values), **latency_summary(values))
+                          for op, values in sorted(latencies.items())},
+        "preload_seconds": round(preload_seconds, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _child(results, *case):
+    results.put(run_case(*case))
+
+
+def run_isolated(*case) -> dict:
+    """Run one case in a fresh child process, so peak RSS is its own."""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_child, args=(results,) + case)
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def case_key(result: dict) -> str:
+    return f"{result['driver']}/{result['size']}/{result['mix']}/{result['text']}"
+
+
+def compare(results: List[dict], baseline: dict, tolerance: float = 0.15,
+            latency_tolerance: float = 0.5, memory_tolerance: float = 0.1) -> List[str]:
+    """Return a message for every result that regressed against `baseline`."""
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        key = case_key(result)
+        before = previous.get(key)
+        if before is None:
+            continue
+        checks = [
+            ("ops/sec", before["ops_per_sec"], result["ops_per_sec"], -tolerance),
+            ("p99 latency us", before["latency"]["p99_us"], result["latency"]["p99_us"], latency_tolerance),
+            ("peak RSS MB", before["peak_rss_mb"], result["peak_rss_mb"], memory_tolerance),
+        ]
+        for name, old, new, allowed in checks:
+            if not old:
+                continue
+            change = new / old - 1
+            if (allowed < 0 and change < allowed) or (allowed > 0 and change > allowed):
+                regressions.append(f"{key}: {name} {old:,} -> {new:,} ({change:+.1%}, "
+                                   f"allowed {allowed:+.0%})")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the seeded benchmark suite")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated preloaded store sizes (default: 1000,10000,100000)")
+    parser.add_argument("--mixes", default="balanced",
+                        help=f"comma-separated operation mixes: {', '.join(MIXES)} (default: balanced)")
+    parser.add_argument("--drivers", default=",".join(DRIVERS),
+                        help="comma-separated drivers: service, console (default: both)")
+    parser.add_argument("--text", default="small",
+                        help=f"comma-separated text sizes: {', '.join(TEXT_SIZES)} (default: small)")
+    parser.add_argument("--ops", type=int, default=20_000, help="timed operations per case (default: 20000)")
+    parser.add_argument("--seed", type=int, default=1, help="workload seed (default: 1)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed ops/sec drop as a fraction (default: 0.15)")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                        help="allowed p99 latency rise as a fraction (default: 0.5)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1,
+                        help="allowed peak RSS rise as a fraction (default: 0.1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    cases = [(driver, int(size), mix, text, args.ops, args.seed)
+             for driver in args.drivers.split(",")
+             for size in args.sizes.split(",")
+             for mix in args.mixes.split(",")
+             for text in args.text.split(",")]
+    for driver, _, mix, text, _, _ in cases:
+        if driver not in DRIVERS or mix not in MIXES or text not in TEXT_SIZES:
+            print(f"Unknown driver, mix or text size in {driver}/{mix}/{text}", file=sys.stderr)
+            return 2
+
+    print(f"{'case':<40} {'ops/sec':>10} {'p50 us':>8} {'p99 us':>9} {'RSS MB':>8}")
+    results = []
+    for case in cases:
+        result = run_isolated(*case)
+        results.append(result)
+        latency = result["latency"]
+        print(f"{case_key(result):<40} {result['ops_per_sec']:>10,.0f} {latency['p50_us']:>8.1f} "
+              f"{latency['p99_us']:>9.1f} {result['peak_rss_mb']:>8.1f}")
+
+    report = {
+        "seed": args.seed, "ops": args.ops,
+        "python": platform.python_version(), "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance,
+                              args.latency_tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"\nPERFORMANCE REGRESSION against {args.baseline}:", file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Seeded synthetic workloads for the benchmark suite.
+
+A workload is a preload of `size` tasks followed by a stream of
+operations drawn from a named mix. The same seed, size, mix and text
+profile always produce the same tasks and the same operations, so runs
+on different machines or commits measure identical work.
+
+Operations are tuples (op, task_id, title, description):
+- add: title and description are set; task_id is the ID it will get
+- update: changes the title and description of a live task
+- complete / incomplete: toggle the status of a live task
+- delete: removes a live task
+- list: reads one page of PAGE_SIZE tasks after task_id
+"""
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Relative weights of each operation kind
+MIXES: Dict[str, Dict[str, int]] = {
+    "balanced": {"add": 25, "update": 25, "complete": 20, "delete": 10, "list": 20},
+    "write-heavy": {"add": 50, "update": 20, "complete": 15, "delete": 10, "list": 5},
+    "read-heavy": {"add": 5, "update": 5, "complete": 5, "delete": 5, "list": 80},
+    "churn": {"add": 45, "update": 5, "complete": 5, "delete": 45, "list": 0},
+}
+
+# (min, max) title length and (min, max) description length, in characters
+TEXT_SIZES: Dict[str, Tuple[Tuple[int, int], Tuple[int, int]]] = {
+    "small": ((8, 32), (0, 64)),
+    "medium": ((16, 80), (0, 300)),
+    "large": ((100, 200), (500, 2000)),
+}
+
+# Tasks read by one list operation
+PAGE_SIZE = 20
+
+Operation = Tuple[str, int, Optional[str], Optional[str]]
+
+
+class Workload:
+    """Deterministic generator of preload tasks and operations."""
+
+    def __init__(self, seed: int = 1, mix: str = "balanced", text: str = "small"):
+        """Create a generator; `mix` and `text` name entries of MIXES and TEXT_SIZES."""
+        if mix not in MIXES:
+            raise ValueError(f"Unknown mix {mix!r}; choose from {', '.join(MIXES)}")
+        if text not in TEXT_SIZES:
+            raise ValueError(f"Unknown text size {text!r}; choose from {', '.join(TEXT_SIZES)}")
+        self.random = random.Random(seed)
+        self.kinds = [kind for kind, weight in MIXES[mix].items() if weight]
+        self.weights = [MIXES[mix][kind] for kind in self.kinds]
+        (self.title_range, self.description_range) = TEXT_SIZES[text]
+        # A fixed vocabulary keeps the text realistic for the search index
+        self.words = ["".join(self.random.choices("abcdefghijklmnopqrstuvwxyz", k=self.random.randint(2, 10)))
+                      for _ in range(2000)]
+        # Live IDs in a list for O(1) random picks, plus each one's position
+        self.live: List[int] = []
+        self.position: Dict[int, int] = {}
+        self.completed = set()
+        self.next_id = 1
+
+    def text(self, length_range: Tuple[int, int]) -> str:
+        """Return words from the vocabulary, truncated to a random length in range."""
+        length = self.random.randint(*length_range)
+        if not length:
+            return ""
+        parts, total = [], 0
+        while total < length:
+            word = self.random.choice(self.words)
+            parts.append(word)
+            total += len(word) + 1
+        return " ".join(parts)[:length].strip() or self.words[0]
+
+    def _new_task(self) -> Operation:
+        task_id = self.next_id
+        self.next_id += 1
+        self.position[task_id] = len(self.live)
+        self.live.append(task_id)
+        description = self.text(self.description_range)
+        return "add", task_id, self.text(self.title_range), description or None
+
+    def _remove(self, task_id: int):
+        index = self.position.pop(task_id)
+        last = self.live.pop()
+        if last != task_id:
+            self.live[index] = last
+            self.position[last] = index
+        self.completed.discard(task_id)
+
+    def preload(self, size: int) -> List[Tuple[str, Optional[str]]]:
+        """Return (title, description) of `size` tasks that get IDs 1..size."""
+        return [self._new_task()[2:] for _ in range(size)]
+
+    def operations(self, count: int) -> Iterator[Operation]:
+        """Yield `count` operations, keeping track of which tasks exist."""
+        rng = self.random
+        for kind in rng.choices(self.kinds, self.weights, k=count):
+            if kind == "add" or (kind != "list" and not self.live):
+                yield self._new_task()
+            elif kind == "list":
+                yield "list", rng.randrange(self.next_id), None, None
+            else:
+                task_id = self.live[rng.randrange(len(self.live))]
+                if kind == "update":
+                    description = self.text(self.description_range)
+                    yield "update", task_id, self.text(self.title_range), description or None
+                elif kind == "delete":
+                    self._remove(task_id)
+                    yield "delete", task_id, None, None
+                elif task_id in self.completed:
+                    self.completed.discard(task_id)
+                    yield "incomplete", task_id, None, None
+                else:
+                    self.completed.add(task_id)
+                    yield "complete", task_id, None, None
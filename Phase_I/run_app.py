@@ -2,13 +2,40 @@
 """
 Simple runner script for the Phase I Todo Console App
 This script provides a single command way to run the application
+
+The first launch sets up a virtual environment with UV and installs the
+app into it. Setup then records a hash of pyproject.toml, and later
+launches skip straight to the app, in this process, until the hash
+changes. Arguments are passed on to the app, e.g.
+`python run_app.py --batch commands.txt`.
 """
 
 import sys
 import subprocess
 import os
+import hashlib
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent
+VENV_PATH = ROOT / '.venv'
+# Written after a successful setup; holds the hash of what was installed
+SETUP_MARKER = VENV_PATH / '.todo-setup'
+
+
+def setup_fingerprint():
+    """Hash pyproject.toml and the Python version the setup was made for."""
+    digest = hashlib.sha256((ROOT / 'pyproject.toml').read_bytes())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()
+
+
+def setup_is_current():
+    """Check whether a previous setup matches the current pyproject.toml."""
+    try:
+        return SETUP_MARKER.read_text().strip() == setup_fingerprint()
+    except OSError:
+        return False
+
 
 def check_python_version():
     """Check if Python 3.8+ is available (required for basic functionality)."""
@@ -39,8 +66,8 @@ def install_uv():
         return False
 
 
-def setup_and_run():
-    """Setup virtual environment and run the application."""
+def setup():
+    """Setup the virtual environment and install the application into it."""
     print("Setting up the Todo Console App...")
 
     # Check Python version
@@ -54,11 +81,10 @@ def setup_and_run():
             return False
 
     # Create virtual environment if it doesn't exist
-    venv_path = Path('.venv')
-    if not venv_path.exists():
+    if not VENV_PATH.exists():
         print("Creating virtual environment...")
         try:
-            subprocess.run(['uv', 'venv'], check=True)
+            subprocess.run(['uv', 'venv'], check=True, cwd=ROOT)
             print("Virtual environment created successfully!")
         except subprocess.CalledProcessError:
             print("Failed to create virtual environment.")
@@ -67,45 +93,51 @@ def setup_and_run():
     # Install the package in development mode
     print("Installing the application...")
     try:
-        subprocess.run(['uv', 'pip', 'install', '-e', '.'], check=True)
+        subprocess.run(['uv', 'pip', 'install', '-e', '.'], check=True, cwd=ROOT)
         print("Application installed successfully!")
     except subprocess.CalledProcessError:
         print("Failed to install the application.")
         return False
 
+    SETUP_MARKER.write_text(setup_fingerprint() + "\n")
+
     # Determine the activation script path
     if os.name == 'nt':  # Windows
         activate_script = '.venv\\Scripts\\activate'
-        python_cmd = '.venv\\Scripts\\python'
     else:  # Unix/Linux/Mac
         activate_script = '.venv/bin/activate'
-        python_cmd = '.venv/bin/python'
 
     print(f"\nTo run the application manually, activate the virtual environment:")
     print(f"  source {activate_script}  # On Linux/Mac")
     print(f"  {activate_script}  # On Windows")
     print(f"And then run: python -m src.main")
+    return True
 
-    print(f"\nStarting the application now...")
-    try:
-        subprocess.run([python_cmd, '-m', 'src.main'])
-        return True
-    except subprocess.CalledProcessError:
-        print("Failed to start the application.")
-        return False
+
+def run_app(argv):
+    """Run the application in this process and return its exit status."""
+    # The app only uses the standard library, so this interpreter can run
+    # it directly instead of starting another one from the venv
+    sys.path.insert(0, str(ROOT))
+    from src.main import main as app_main
+    return app_main(argv)
 
 
 def main():
     """Main function to run the setup and application."""
-    print("Todo Console App - Phase I Runner")
-    print("=" * 40)
+    argv = sys.argv[1:]
+    if not setup_is_current():
+        print("Todo Console App - Phase I Runner")
+        print("=" * 40)
+
+        if not setup():
+            print("\nSetup failed. Please follow the manual installation steps in the README.")
+            sys.exit(1)
 
-    success = setup_and_run()
+        print(f"\nStarting the application now...")
 
-    if not success:
-        print("\nSetup failed. Please follow the manual installation steps in the README.")
-        sys.exit(1)
+    sys.exit(run_app(argv))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,3 @@
+from .server import TaskAPI, TaskAPIServer
+
+__all__ = ["TaskAPI", "TaskAPIServer"]
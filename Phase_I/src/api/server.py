@@ -0,0 +1,368 @@
+import asyncio
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from ..models.task import MAX_PRIORITY, MIN_PRIORITY, parse_timestamp
+from ..services.dedupe import DuplicateTaskError
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1 << 20
+
+
+class HTTPError(Exception):
+    """An error that maps directly to an HTTP status and message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TaskAPI:
+    """
+    JSON routes over a task service:
+    - GET    /tasks               list (after_id, offset, limit, completed, updated_since)
+    - POST   /tasks               create from {"title", "description", "due_at", "priority"},
+                                  optionally with an "idempotency_key" and "unique": true
+    - GET    /tasks/<id>          fetch one task
+    - PATCH  /tasks/<id>          update title, description, due_at (null clears it) and/or priority
+    - DELETE /tasks/<id>          delete
+    - POST   /tasks/<id>/complete and /tasks/<id>/incomplete
+    - GET    /search?q=...        full-text search, if the engine supports it
+    - GET    /summary             task counts and per-day histograms, if supported
+    - GET    /next?by=...         open tasks by priority or due date, if supported
+    - GET    /due?within=...      open tasks due within that many seconds, if supported
+    - GET    /duplicates          sets of tasks with the same title and description, if supported
+    - GET    /health
+
+    handle() is synchronous and transport-free; TaskAPIServer decides
+    whether it runs on the event loop or in a worker thread.
+    """
+
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+
+    def __init__(self, task_service):
+        """Initialize the API with a task service."""
+        self.task_service = task_service
+
+    def handle(self, method: str, target: str, body: bytes) -> Tuple[int, Optional[dict]]:
+        """Route one request; return (status, JSON payload or None)."""
+        try:
+            return self._route(method, target, body)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as error:
+            # Never drop the connection without an answer
+            print(f"Error handling {method} {target}: {error!r}", file=sys.stderr)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+    def _route(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["health"] and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        if parts == ["search"] and method == "GET":
+            return self._search(query)
+        if parts == ["summary"] and method == "GET":
+            if not hasattr(self.task_service, "summary"):
+                raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Summary is not supported by this storage engine")
+            return HTTPStatus.OK, self.task_service.summary().to_dict()
+        if parts == ["next"] and method == "GET":
+            return self._next(query)
+        if parts == ["due"] and method == "GET":
+            return self._due(query)
+        if parts == ["duplicates"] and method == "GET":
+            if not hasattr(self.task_service, "duplicate_groups"):
+                raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Dedupe is not supported by this storage engine")
+            groups = self.task_service.duplicate_groups()
+            return HTTPStatus.OK, {"groups": [[task.to_dict() for task in group] for group in groups]}
+        if not parts or parts[0] != "tasks" or len(parts) > 3:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Not found")
+
+        if len(parts) == 1:
+            if method == "GET":
+                return self._list(query)
+            if method == "POST":
+                data = self._json(body)
+                options = self._schedule(data)
+                if data.get("idempotency_key") is not None:
+                    if not isinstance(data["idempotency_key"], str):
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "idempotency_key must be a string")
+                    options["key"] = data["idempotency_key"]
+                if data.get("unique"):
+                    options["unique"] = True
+                try:
+                    task = self.task_service.add_task(self._title(data), self._description(data), **options)
+                except DuplicateTaskError as e:
+                    return HTTPStatus.CONFLICT, {"error": str(e), "task": e.task.to_dict()}
+                return HTTPStatus.CREATED, task.to_dict()
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+
+        task_id = self._int(parts[1], "task id")
+        if len(parts) == 3:
+            if method != "POST" or parts[2] not in ("complete", "incomplete"):
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Not found")
+            if parts[2] == "complete":
+                task = self.task_service.mark_task_complete(task_id)
+            else:
+                task = self.task_service.mark_task_incomplete(task_id)
+        elif method == "GET":
+            task = self.task_service.get_task_by_id(task_id)
+        elif method in ("PATCH", "PUT"):
+            data = self._json(body)
+            # Every field is validated before any is applied, so a 400 changes nothing
+            title = data.get("title")
+            if title is not None:
+                title = self._title(data)
+                if not (1 <= len(title) <= 200):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Title must be between 1 and 200 characters")
+            description = self._description(data)
+            schedule = self._schedule(data)
+            if "due_at" in data and data["due_at"] is None:
+                schedule["clear_due"] = True
+            if schedule and not hasattr(self.task_service, "schedule_task"):
+                raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Scheduling is not supported by this storage engine")
+            if not MIN_PRIORITY <= schedule.get("priority", MIN_PRIORITY) <= MAX_PRIORITY:
+                raise HTTPError(HTTPStatus.BAD_REQUEST,
+                                f"Priority must be between {MIN_PRIORITY} and {MAX_PRIORITY}")
+            # One call, so the edit is applied, and undone, as a whole
+            task = self.task_service.update_task(task_id, title, description, **schedule)
+        elif method == "DELETE":
+            if not self.task_service.delete_task(task_id):
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"Task with ID {task_id} not found")
+            return HTTPStatus.NO_CONTENT, None
+        else:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+
+        if task is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Task with ID {task_id} not found")
+        return HTTPStatus.OK, task.to_dict()
+
+    def _list(self, query: dict):
+        limit = min(self._int(query.get("limit", self.DEFAULT_LIMIT), "limit"), self.MAX_LIMIT)
+        offset = self._int(query.get("offset", 0), "offset")
+        filters = {}
+        if "completed" in query:
+            filters["completed"] = query["completed"].lower() in ("1", "true", "yes")
+        if "updated_since" in query:
+            filters["updated_since"] = parse_timestamp(query["updated_since"])
+
+        if filters:
+            tasks = self.task_service.query(**filters, offset=offset, limit=limit)
+        else:
+            after_id = self._int(query.get("after_id", 0), "after_id")
+            tasks = list(self.task_service.iter_tasks(after_id, limit, offset))
+        next_after_id = tasks[-1].id if len(tasks) == limit and not filters else None
+        return HTTPStatus.OK, {"tasks": [task.to_dict() for task in tasks], "next_after_id": next_after_id}
+
+    def _search(self, query: dict):
+        if not hasattr(self.task_service, "search"):
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Search is not supported by this storage engine")
+        if not query.get("q"):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing query parameter q")
+        limit = min(self._int(query.get("limit", 20), "limit"), self.MAX_LIMIT)
+        tasks = self.task_service.search(query["q"], limit)
+        return HTTPStatus.OK, {"tasks": [task.to_dict() for task in tasks]}
+
+    def _next(self, query: dict):
+        if not hasattr(self.task_service, "next_tasks"):
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Scheduling is not supported by this storage engine")
+        limit = min(self._int(query.get("limit", 20), "limit"), self.MAX_LIMIT)
+        tasks = self.task_service.next_tasks(limit, query.get("by", "priority"))
+        return HTTPStatus.OK, {"tasks": [task.to_dict() for task in tasks]}
+
+    def _due(self, query: dict):
+        if not hasattr(self.task_service, "due_tasks"):
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Scheduling is not supported by this storage engine")
+        within = timedelta(seconds=self._int(query.get("within", 86400), "within"))
+        tasks = self.task_service.due_tasks(within)
+        return HTTPStatus.OK, {"tasks": [task.to_dict() for task in tasks]}
+
+    @staticmethod
+    def _schedule(data: dict) -> dict:
+        """Pick due_at (ISO text) and priority out of a request body."""
+        schedule = {}
+        if data.get("due_at") is not None:
+            if not isinstance(data["due_at"], str):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "due_at must be an ISO date/time string")
+            schedule["due_at"] = parse_timestamp(data["due_at"])
+        if data.get("priority") is not None:
+            if not isinstance(data["priority"], int) or isinstance(data["priority"], bool):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "priority must be a number")
+            schedule["priority"] = data["priority"]
+        return schedule
+
+    @staticmethod
+    def _json(body: bytes) -> dict:
+        try:
+            data = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return data
+
+    @staticmethod
+    def _title(data: dict) -> str:
+        title = data.get("title")
+        if not isinstance(title, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "title must be a string")
+        return title
+
+    @staticmethod
+    def _description(data: dict) -> Optional[str]:
+        description = data.get("description")
+        if description is not None and not isinstance(description, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "description must be a string or null")
+        return description
+
+    @staticmethod
+    def _int(value, name: str) -> int:
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be a number")
+        if number < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must not be negative")
+        return number
+
+
+class TaskAPIServer:
+    """
+    Minimal HTTP/1.1 server for TaskAPI built on asyncio streams:
+    - Persistent (keep-alive) connections
+    - Pipelined requests, answered in order on each connection
+    - Optional bounded thread pool for blocking storage engines
+
+    With workers=0 requests run directly on the event loop, which suits
+    the in-memory engines. With workers > 0 each request runs in a pool
+    of that many threads so slow I/O (SQLite, fsync) does not stall other
+    connections; calls into a service that is not thread-safe are then
+    serialised with a lock.
+    """
+
+    def __init__(self, task_service, host: str = "127.0.0.1", port: int = 8000, workers: int = 0):
+        """Initialize the server; call serve_forever() or start() to listen."""
+        self.api = TaskAPI(task_service)
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+        self._service_lock = None if getattr(task_service, "thread_safe", False) else threading.Lock()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> asyncio.AbstractServer:
+        """Start listening; returns the asyncio server."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def serve_forever(self):
+        """Start listening and serve until cancelled."""
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        """Stop accepting connections and release the worker pool."""
+        if self._server is not None:
+            self._server.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+    def _call_locked(self, method: str, target: str, body: bytes):
+        if self._service_lock is None:
+            return self.api.handle(method, target, body)
+        with self._service_lock:
+            return self.api.handle(method, target, body)
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        if self.executor is None:
+            return self.api.handle(method, target, body)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._call_locked, method, target, body)
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader, status: HTTPStatus, message: str) -> bytes:
+        """Read one line; a line longer than the reader's limit is answered with `status`."""
+        try:
+            return await reader.readline()
+        except ValueError:
+            raise HTTPError(status, message)
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Read one request; return None at end of stream."""
+        request_line = await self._read_line(reader, HTTPStatus.REQUEST_URI_TOO_LONG, "Request line too long")
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._read_line(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, body, keep_alive
+
+    @staticmethod
+    def _response(status: int, payload: Optional[dict], keep_alive: bool) -> bytes:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        status = HTTPStatus(status)
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode("latin-1") + body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    writer.write(self._response(e.status, {"error": e.message}, False))
+                    break
+                if request is None:
+                    break
+
+                method, target, body, keep_alive = request
+                status, payload = await self._dispatch(method, target, body)
+                writer.write(self._response(status, payload, keep_alive))
+                # drain() only waits when the client stops reading, which
+                # applies backpressure to clients that pipeline requests
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
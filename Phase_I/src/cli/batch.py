@@ -0,0 +1,153 @@
+import sys
+import time
+from collections import Counter
+from typing import Iterable, List, Optional, TextIO, Tuple
+from .console import ConsoleInterface
+from .parser import parse_id_list
+
+
+class BatchRunner:
+    """
+    Non-interactive command runner for scripts and pipelines:
+    - Streams commands line by line from a file or stdin
+    - No prompt, banner or per-command success messages
+    - Errors go to stderr, prefixed with their line number
+    - Runs of consecutive `add`, `complete`, `incomplete` or `delete`
+      commands are applied with one bulk call
+    - Ends with a summary of counts, errors, elapsed time and ops/sec
+
+    Blank lines and lines starting with '#' are ignored.
+    """
+
+    # Maximum number of commands applied by one bulk call
+    BULK_SIZE = 1000
+    # add options that add_many cannot apply; such adds run one at a time
+    ADD_FLAGS = frozenset({"--due", "--priority", "--no-due", "--key", "--unique"})
+    # Coalescable command -> (bulk service method, past tense for reports)
+    BULK_COMMANDS = {
+        "add": ("add_many", "added"),
+        "complete": ("complete_many", "marked as complete"),
+        "incomplete": ("incomplete_many", "marked as incomplete"),
+        "delete": ("delete_many", "deleted"),
+    }
+
+    def __init__(self, console: ConsoleInterface):
+        """Initialize the runner around an existing console interface."""
+        self.console = console
+        self.counts: Counter = Counter()
+        # The command of the pending run, and (line number, parsed args) for each of its lines
+        self._pending_command: Optional[str] = None
+        self._pending: List[Tuple[int, tuple]] = []
+
+    def run(self, lines: Iterable[str], summary: TextIO = None) -> int:
+        """Execute every command in `lines`; return the number of errors."""
+        console = self.console
+        console.quiet = True
+        errors_before = console.error_count
+        start = time.perf_counter()
+
+        try:
+            for line_number, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                command, args = console.parse_command(line)
+                self.counts[command] += 1
+                item = self._bulk_item(command, args)
+                if item is not None:
+                    if command != self._pending_command:
+                        self._flush()
+                        self._pending_command = command
+                    self._pending.append((line_number, item))
+                    if len(self._pending) >= self.BULK_SIZE:
+                        self._flush()
+                    continue
+
+                self._flush()
+                console.line_number = line_number
+                if not console.execute_command(command, args):
+                    break
+            self._flush()
+        finally:
+            console.line_number = None
+            console.quiet = False
+            sys.stdout.flush()
+
+        errors = console.error_count - errors_before
+        self._report(errors, time.perf_counter() - start, summary or sys.stderr)
+        return errors
+
+    def _bulk_item(self, command: str, args: List[str]) -> Optional[tuple]:
+        """Return the parsed args of a line that can join a bulk run, or None to run it alone."""
+        bulk = self.BULK_COMMANDS.get(command)
+        if bulk is None or not args or not hasattr(self.console.task_service, bulk[0]):
+            return None
+        if command == "add":
+            if not self.ADD_FLAGS.isdisjoint(args):
+                return None
+            return (args[0], args[1] if len(args) > 1 else None)
+        try:
+            return tuple(parse_id_list(args))
+        except ValueError:
+            # Let the console report the bad ID list against this line
+            return None
+
+    def _flush(self):
+        """Apply the pending run of commands with one bulk call."""
+        if not self._pending:
+            return
+
+        command, pending = self._pending_command, self._pending
+        self._pending_command, self._pending = None, []
+        if command == "add":
+            self._flush_adds(pending)
+        else:
+            self._flush_ids(command, pending)
+        self.console.line_number = None
+
+    def _flush_adds(self, pending: List[Tuple[int, tuple]]):
+        try:
+            self.console.task_service.add_many(item for _, item in pending)
+        except ValueError:
+            # Apply one at a time so each invalid line gets its own error
+            for line_number, (title, description) in pending:
+                self.console.line_number = line_number
+                self.console.handle_add([title] if description is None else [title, description])
+
+    def _flush_ids(self, command: str, pending: List[Tuple[int, tuple]]):
+        console = self.console
+        method, done = self.BULK_COMMANDS[command]
+        task_ids = [task_id for _, line_ids in pending for task_id in line_ids]
+        if command == "delete":
+            # Drop cached blocks of deleted tasks
+            for task_id in task_ids:
+                console.rendered.pop(task_id, None)
+        results = getattr(console.task_service, method)(task_ids)
+
+        # Report missing IDs against the line that named them, as the console would
+        start = 0
+        for line_number, line_ids in pending:
+            line_results = results[start:start + len(line_ids)]
+            start += len(line_ids)
+            if all(line_results):
+                continue
+            console.line_number = line_number
+            if len(line_ids) == 1:
+                console.error(f"Task with ID {line_ids[0]} not found")
+            else:
+                console._report_many(list(line_ids), line_results, done)
+
+    def _report(self, errors: int, elapsed: float, stream: TextIO):
+        total = sum(self.counts.values())
+        rate = total / elapsed if elapsed > 0 else 0.0
+        breakdown = ", ".join(f"{command} {count}" for command, count in self.counts.most_common())
+        stream.write(f"Batch complete: {total} commands ({breakdown or 'none'}), {errors} errors, "
+                     f"{elapsed:.3f}s, {rate:,.0f} ops/sec\n")
+
+
+def open_batch_source(path: str) -> TextIO:
+    """Open a batch file, or stdin for '-' (closing the result leaves stdin open)."""
+    if path == "-":
+        return open(sys.stdin.fileno(), encoding=sys.stdin.encoding, closefd=False)
+    return open(path, encoding="utf-8")
@@ -1,6 +1,23 @@
-import re
-from typing import List
+import sys
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.task import parse_timestamp
+from ..services.metrics import Metrics
 from ..services.task_service import TaskService
+from .parser import parse_duration, parse_id_list, parse_line, parse_when
+
+# Command name -> handler(console, args) -> bool (False stops the loop)
+CommandHandler = Callable[["ConsoleInterface", List[str]], bool]
+COMMANDS: Dict[str, CommandHandler] = {}
+
+
+def command(*names: str):
+    """Register the decorated method as the handler for the given command names."""
+    def register(handler: CommandHandler) -> CommandHandler:
+        for name in names:
+            COMMANDS[name] = handler
+        return handler
+    return register
 
 
 class ConsoleInterface:
@@ -13,136 +30,387 @@ class ConsoleInterface:
     - Help system
     """
 
-    def __init__(self, task_service: TaskService):
-        """Initialize the console interface with a task service."""
+    # Default number of tasks per page for `list --page`
+    PAGE_SIZE = 20
+    # Missing IDs listed individually after a bulk command
+    MISSING_SHOWN = 20
+    # Most formatted task blocks kept; the oldest are dropped past this
+    RENDER_CACHE_SIZE = 100_000
+
+    def __init__(self, task_service: TaskService, metrics: Optional[Metrics] = None):
+        """
+        Initialize the console interface with a task service.
+
+        With `metrics`, every command is counted and timed, and the
+        `stats` command reports them.
+        """
         self.task_service = task_service
         self.running = True
+        # Batch mode suppresses success messages and reports errors by line
+        self.quiet = False
+        self.line_number = None
+        self.error_count = 0
+        # Per-instance copy of the registry so extra commands stay local
+        self.commands: Dict[str, CommandHandler] = dict(COMMANDS)
+        self.metrics = metrics
+        if metrics is not None:
+            for name, handler in self.commands.items():
+                self.commands[name] = metrics.instrument_command(name, handler)
+        # Formatted task blocks by ID, with the updated_at they were built
+        # from, oldest first; a changed task misses on updated_at
+        self.rendered: Dict[int, Tuple[datetime, str]] = {}
+
+    def register_command(self, name: str, handler: CommandHandler):
+        """Add or replace a command handler on this console."""
+        name = name.lower()
+        if self.metrics is not None:
+            handler = self.metrics.instrument_command(name, handler)
+        self.commands[name] = handler
+
+    def say(self, message: str):
+        """Print a success or status message unless running quietly."""
+        if not self.quiet:
+            print(message)
+
+    def error(self, message: str):
+        """Report a failed command."""
+        self.error_count += 1
+        if self.line_number is not None:
+            print(f"line {self.line_number}: {message}", file=sys.stderr)
+        else:
+            print(message)
 
     def display_help(self):
         """Display available commands and their usage."""
         help_text = """
 Available Commands:
   add "task title" "optional description"    - Add a new task
-  list                                      - Display all tasks
+       [--due T] [--priority N]              - ... due at T, with priority N (0-9, 9 most urgent)
+       [--unique] [--key K]                  - ... unless a task has the same text, or key K was already used
+  list [--page N] [--limit N] [--after ID]  - Display tasks, optionally one page at a time
+       [--pending|--completed] [--since T] [--created-since T]
+       [--sort id|created|updated] [--desc]  - Filter and order the list (T is an ISO date/time)
+       [--all]                               - Include archived tasks
+  search <words> [--limit N]                - Find tasks by keyword or word prefix
   update <id> "new title" "new description" - Update a task
-  delete <id>                               - Delete a task
-  complete <id>                             - Mark task as complete
-  incomplete <id>                           - Mark task as incomplete
+  delete <ids>                              - Delete tasks
+  complete <ids>                            - Mark tasks as complete
+  incomplete <ids>                          - Mark tasks as incomplete
+       (<ids> is one ID or a list of IDs and ranges, e.g. 1-500,712)
+  undo / redo                               - Revert or reapply the last change
+  history <id>                              - Show a task's recent changes, newest first
+  schedule <id> [--due T|--no-due] [--priority N]
+                                            - Set or clear a task's due date and priority
+  next [--limit N] [--by priority|due]      - Show the open tasks to work on next
+  due [--within D]                          - Show open tasks due within D (e.g. 1h, 2d), overdue included
+  remind on|off                             - Print reminders as open tasks fall due
+       (T is an ISO date/time or a duration from now such as 2h)
+  summary [--days N]                        - Show task counts and the last N days of activity
+  dedupe [--delete]                         - List tasks with the same title and description, or keep only the oldest
+  archive [--older-than DAYS]               - Archive tasks completed DAYS ago (with --archive-after)
+  stats [--prometheus FILE] [--reset]       - Show call counts and latencies (with --metrics)
+  import <file> [--format csv|jsonl]        - Import tasks from a CSV or JSON Lines file
+  export <file> [--format csv|jsonl]        - Export all tasks to a CSV or JSON Lines file
   help                                      - Show this help message
   quit/exit                                 - Exit the application
 
 Examples:
   add "Buy groceries" "Milk, eggs, bread"
+  add "Pay rent" --due 2026-11-01T09:00 --priority 8
   list
+  list --page 2 --limit 20
+  list --pending --since 2026-01-01 --sort updated --desc
+  search groc milk
   update 1 "Buy groceries and fruits" "Milk, eggs, bread, apples"
   delete 1
   complete 1
+  complete 1-500,712
+  undo
+  export tasks.csv
         """
         print(help_text)
 
-    def display_tasks(self):
-        """Display all tasks in a formatted way."""
-        tasks = self.task_service.get_all_tasks()
-
-        if not tasks:
-            print("No tasks found.")
-            return
+    @staticmethod
+    def format_task(task) -> str:
+        """Format one task as a block of display lines."""
+        status = "✓" if task.completed else "○"
+        lines = [f"{status} [{task.id}] {task.title}\n"]
+        if task.description:
+            lines.append(f"      Description: {task.description}\n")
+        if task.due_at is not None:
+            lines.append(f"      Due: {task.due_at.isoformat(' ', 'minutes')}\n")
+        if task.priority:
+            lines.append(f"      Priority: {task.priority}\n")
+        lines.append(f"      Created: {task.created_at.isoformat(' ', 'seconds')}\n")
+        if task.updated_at != task.created_at:
+            lines.append(f"      Updated: {task.updated_at.isoformat(' ', 'seconds')}\n")
+        lines.append("\n")
+        return "".join(lines)
+
+    def render_task(self, task) -> str:
+        """Return a task's display block, reusing the cached one until the task changes."""
+        rendered = self.rendered
+        cached = rendered.get(task.id)
+        if cached is not None and cached[0] == task.updated_at:
+            return cached[1]
+        block = self.format_task(task)
+        if cached is None and len(rendered) >= self.RENDER_CACHE_SIZE:
+            # Drop the oldest entry so archived and long-gone tasks do not stay cached
+            del rendered[next(iter(rendered))]
+        rendered[task.id] = (task.updated_at, block)
+        return block
+
+    def display_tasks(self, after_id: int = 0, limit: int = None, page: int = None, filters: dict = None,
+                      archived: bool = False):
+        """
+        Display tasks in a formatted way.
+
+        Tasks are streamed from the service without materialising the
+        store, and each task's block comes from the render cache unless
+        the task has changed since it was last shown. The listing is then
+        written with a single joined write. With `page`, only that page of
+        `limit` tasks is shown; otherwise every task after `after_id` (up to
+        `limit`) is shown. `filters` are passed to TaskService.query.
+        `archived` includes tasks from the service's archive.
+        """
+        out = sys.stdout
+        offset = 0
+        if page is not None:
+            limit = limit or self.PAGE_SIZE
+            offset = (page - 1) * limit
+        if filters:
+            tasks = self.task_service.query(**filters, offset=offset, limit=limit)
+        elif archived:
+            tasks = self.task_service.iter_tasks(after_id, limit, offset, archived=True)
+        else:
+            tasks = self.task_service.iter_tasks(after_id, limit, offset)
 
-        print("\nYour Tasks:")
-        print("-" * 80)
+        lines = ["\nYour Tasks:\n", "-" * 80, "\n"]
+        render_task = self.render_task
+        task = None
         for task in tasks:
-            status = "✓" if task.completed else "○"
-            description = task.description if task.description else ""
-            print(f"{status} [{task.id}] {task.title}")
-            if description:
-                print(f"      Description: {description}")
-            print(f"      Created: {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            if task.updated_at != task.created_at:
-                print(f"      Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            print()
-        print("-" * 80)
+            lines.append(render_task(task))
+
+        if task is None:
+            out.write("No tasks found.\n")
+            return
+        shown = len(lines) - 3
+        last_id = task.id
+
+        lines.append("-" * 80 + "\n")
+        if limit is not None and shown == limit:
+            if filters:
+                page = page or 1
+                lines.append(f"Page {page}. Next page: repeat with --page {page + 1} --limit {limit}\n")
+            else:
+                command = "list --all" if archived else "list"
+                if page is not None:
+                    lines.append(f"Page {page}. Next page: {command} --page {page + 1} --limit {limit}\n")
+                else:
+                    lines.append(f"Next page: {command} --after {last_id} --limit {limit}\n")
+        out.write("".join(lines))
+        out.flush()
 
     def parse_command(self, user_input: str) -> tuple:
         """Parse user input into command and arguments."""
-        # Remove extra whitespace and split into parts
-        parts = user_input.strip().split()
-        if not parts:
-            return "", []
-
-        command = parts[0].lower()
-        args = parts[1:] if len(parts) > 1 else []
-
-        # Special handling for commands with quoted strings
-        if command in ["add", "update"]:
-            # Use regex to extract quoted strings
-            pattern = r'"([^"]*)"|\'([^\']*)\'|(\S+)'
-            matches = re.findall(pattern, user_input)
-            # Each match is a tuple of (double_quoted, single_quoted, unquoted), get the non-empty one
-            all_parts = [next(filter(None, match)) for match in matches]
-            command = all_parts[0].lower()
-            args = all_parts[1:] if len(all_parts) > 1 else []
-
-        return command, args
+        return parse_line(user_input)
 
     def execute_command(self, command: str, args: List[str]) -> bool:
         """Execute a command with given arguments."""
+        handler = self.commands.get(command)
+        if handler is None:
+            self.error(f"Unknown command: {command}. Type 'help' for available commands.")
+            return True
+
         try:
-            if command == "add":
-                return self.handle_add(args)
-            elif command == "list":
-                self.handle_list()
-                return True
-            elif command == "update":
-                return self.handle_update(args)
-            elif command == "delete":
-                return self.handle_delete(args)
-            elif command == "complete":
-                return self.handle_complete(args)
-            elif command == "incomplete":
-                return self.handle_incomplete(args)
-            elif command == "help":
-                self.display_help()
-                return True
-            elif command in ["quit", "exit"]:
-                return self.handle_exit()
-            else:
-                print(f"Unknown command: {command}. Type 'help' for available commands.")
-                return True
+            return handler(self, args)
         except Exception as e:
-            print(f"Error executing command: {str(e)}")
+            self.error(f"Error executing command: {str(e)}")
             return True  # Continue running even if there's an error
 
+    @command("help")
+    def handle_help(self, args: List[str]) -> bool:
+        """Handle the help command."""
+        self.display_help()
+        return True
+
+    def _schedule_options(self, args: List[str], usage: str):
+        """
+        Split `--due T`, `--no-due` and `--priority N` out of args.
+
+        Returns (other args, options for add_task/schedule_task), or None
+        after reporting an error.
+        """
+        rest, options = [], {}
+        position = 0
+        while position < len(args):
+            flag = args[position]
+            position += 1
+            if flag == "--no-due":
+                options["clear_due"] = True
+                continue
+            if flag not in ("--due", "--priority"):
+                rest.append(flag)
+                continue
+            if position >= len(args):
+                self.error(usage)
+                return None
+            value = args[position]
+            position += 1
+            try:
+                if flag == "--due":
+                    options["due_at"] = parse_when(value)
+                else:
+                    options["priority"] = int(value)
+            except ValueError as e:
+                self.error(str(e) if flag == "--due" else "--priority must be a number")
+                return None
+        return rest, options
+
+    ADD_USAGE = ("Usage: add \"task title\" \"optional description\" [--due T] [--priority N] "
+                 "[--unique] [--key K]")
+
+    @command("add")
     def handle_add(self, args: List[str]) -> bool:
         """Handle the add command."""
-        if len(args) < 1:
-            print("Usage: add \"task title\" \"optional description\"")
+        parsed = self._schedule_options(args, self.ADD_USAGE)
+        if parsed is None:
+            return True
+        args, options = parsed
+        texts = []
+        position = 0
+        while position < len(args):
+            flag = args[position]
+            position += 1
+            if flag == "--unique":
+                options["unique"] = True
+            elif flag == "--key":
+                if position >= len(args):
+                    self.error(self.ADD_USAGE)
+                    return True
+                options["key"] = args[position]
+                position += 1
+            else:
+                texts.append(flag)
+        args = texts
+        if len(args) < 1 or "clear_due" in options:
+            self.error(self.ADD_USAGE)
             return True
 
         title = args[0]
         description = args[1] if len(args) > 1 else None
 
         try:
-            task = self.task_service.add_task(title, description)
-            print(f"Task added successfully! ID: {task.id}, Title: {task.title}")
+            task = self.task_service.add_task(title, description, **options)
+            self.say(f"Task added successfully! ID: {task.id}, Title: {task.title}")
         except ValueError as e:
-            print(f"Error adding task: {str(e)}")
+            self.error(f"Error adding task: {str(e)}")
 
         return True
 
-    def handle_list(self):
+    LIST_USAGE = ("Usage: list [--page N] [--limit N] [--after ID] [--pending|--completed] "
+                  "[--since T] [--created-since T] [--sort id|created|updated] [--desc] [--all]")
+    SORT_FIELDS = {"id": "id", "created": "created_at", "updated": "updated_at"}
+
+    @command("list")
+    def handle_list(self, args: List[str]) -> bool:
         """Handle the list command."""
-        self.display_tasks()
+        numbers = {"--page": None, "--limit": None, "--after": 0}
+        filters = {}
+        archived = False
+        position = 0
+        while position < len(args):
+            flag = args[position]
+            position += 1
+            if flag == "--all":
+                archived = True
+                continue
+            if flag in ("--pending", "--completed"):
+                filters["completed"] = flag == "--completed"
+                continue
+            if flag == "--desc":
+                filters["descending"] = True
+                continue
+            if flag not in numbers and flag not in ("--since", "--created-since", "--sort") \
+                    or position >= len(args):
+                self.error(self.LIST_USAGE)
+                return True
+
+            value = args[position]
+            position += 1
+            if flag == "--sort":
+                if value not in self.SORT_FIELDS:
+                    self.error("--sort must be one of id, created, updated")
+                    return True
+                filters["order_by"] = self.SORT_FIELDS[value]
+            elif flag in ("--since", "--created-since"):
+                try:
+                    moment = parse_timestamp(value)
+                except ValueError:
+                    self.error(f"{flag} must be an ISO date or time, e.g. 2026-01-31T09:00")
+                    return True
+                filters["updated_since" if flag == "--since" else "created_since"] = moment
+            else:
+                try:
+                    numbers[flag] = int(value)
+                except ValueError:
+                    self.error(f"{flag} must be a number")
+                    return True
+
+        if any(value is not None and value < 1 for value in (numbers["--page"], numbers["--limit"])):
+            self.error("--page and --limit must be at least 1")
+            return True
+        if filters and numbers["--after"]:
+            self.error("--after cannot be combined with filters; use --page instead")
+            return True
+        if filters and archived:
+            self.error("--all cannot be combined with filters")
+            return True
+        # Without an archive every task is already listed
+        archived = archived and getattr(self.task_service, "archive", None) is not None
+
+        self.display_tasks(numbers["--after"], numbers["--limit"], numbers["--page"], filters, archived)
+        return True
 
+    @command("search")
+    def handle_search(self, args: List[str]) -> bool:
+        """Handle the search command."""
+        limit = 20
+        if len(args) >= 2 and args[-2] == "--limit":
+            try:
+                limit = int(args[-1])
+            except ValueError:
+                self.error("--limit must be a number")
+                return True
+            args = args[:-2]
+        if not args:
+            self.error("Usage: search <words> [--limit N]")
+            return True
+        if not hasattr(self.task_service, "search"):
+            self.error("Search is not supported by this storage engine")
+            return True
+
+        query = " ".join(args)
+        tasks = self.task_service.search(query, limit)
+        if not tasks:
+            print(f"No tasks match '{query}'.")
+            return True
+
+        sys.stdout.write("".join([f"\nSearch results for '{query}':\n", "-" * 80, "\n"]
+                                 + [self.format_task(task) for task in tasks] + ["-" * 80, "\n"]))
+        return True
+
+    @command("update")
     def handle_update(self, args: List[str]) -> bool:
         """Handle the update command."""
         if len(args) < 2:
-            print("Usage: update <id> \"new title\" \"optional new description\"")
+            self.error("Usage: update <id> \"new title\" \"optional new description\"")
             return True
 
         try:
             task_id = int(args[0])
         except ValueError:
-            print("Task ID must be a number")
+            self.error("Task ID must be a number")
             return True
 
         new_title = args[1]
@@ -150,75 +418,440 @@ Examples:
 
         task = self.task_service.update_task(task_id, new_title, new_description)
         if task:
-            print(f"Task {task_id} updated successfully!")
+            self.say(f"Task {task_id} updated successfully!")
         else:
-            print(f"Task with ID {task_id} not found")
+            self.error(f"Task with ID {task_id} not found")
 
         return True
 
+    def _task_ids(self, command: str, args: List[str]):
+        """Parse the ID list of a bulk-capable command; return the IDs or None."""
+        if len(args) < 1:
+            self.error(f"Usage: {command} <ids>  (one ID, or IDs and ranges such as 1-500,712)")
+            return None
+        try:
+            return parse_id_list(args)
+        except ValueError as e:
+            self.error(str(e))
+            return None
+
+    def _report_many(self, task_ids: List[int], results: list, done: str):
+        """Summarise a bulk command: one success line, one line of missing IDs."""
+        missing = [task_id for task_id, result in zip(task_ids, results) if not result]
+        self.say(f"{len(task_ids) - len(missing)} tasks {done}!")
+        if missing:
+            shown = ", ".join(map(str, missing[:self.MISSING_SHOWN]))
+            more = len(missing) - self.MISSING_SHOWN
+            self.error(f"Tasks not found: {shown}" + (f" and {more} more" if more > 0 else ""))
+
+    @command("delete")
     def handle_delete(self, args: List[str]) -> bool:
         """Handle the delete command."""
-        if len(args) < 1:
-            print("Usage: delete <id>")
+        task_ids = self._task_ids("delete", args)
+        if task_ids is None:
             return True
-
-        try:
-            task_id = int(args[0])
-        except ValueError:
-            print("Task ID must be a number")
+        # Drop cached blocks of deleted tasks
+        for task_id in task_ids:
+            self.rendered.pop(task_id, None)
+        if len(task_ids) > 1:
+            self._report_many(task_ids, self.task_service.delete_many(task_ids), "deleted")
             return True
 
+        task_id = task_ids[0]
         success = self.task_service.delete_task(task_id)
         if success:
-            print(f"Task {task_id} deleted successfully!")
+            self.say(f"Task {task_id} deleted successfully!")
         else:
-            print(f"Task with ID {task_id} not found")
+            self.error(f"Task with ID {task_id} not found")
 
         return True
 
+    @command("complete")
     def handle_complete(self, args: List[str]) -> bool:
         """Handle the complete command."""
-        if len(args) < 1:
-            print("Usage: complete <id>")
+        task_ids = self._task_ids("complete", args)
+        if task_ids is None:
             return True
-
-        try:
-            task_id = int(args[0])
-        except ValueError:
-            print("Task ID must be a number")
+        if len(task_ids) > 1:
+            self._report_many(task_ids, self.task_service.complete_many(task_ids), "marked as complete")
             return True
 
+        task_id = task_ids[0]
         task = self.task_service.mark_task_complete(task_id)
         if task:
-            print(f"Task {task_id} marked as complete!")
+            self.say(f"Task {task_id} marked as complete!")
         else:
-            print(f"Task with ID {task_id} not found")
+            self.error(f"Task with ID {task_id} not found")
 
         return True
 
+    @command("incomplete")
     def handle_incomplete(self, args: List[str]) -> bool:
         """Handle the incomplete command."""
-        if len(args) < 1:
-            print("Usage: incomplete <id>")
+        task_ids = self._task_ids("incomplete", args)
+        if task_ids is None:
+            return True
+        if len(task_ids) > 1:
+            self._report_many(task_ids, self.task_service.incomplete_many(task_ids), "marked as incomplete")
+            return True
+
+        task_id = task_ids[0]
+        task = self.task_service.mark_task_incomplete(task_id)
+        if task:
+            self.say(f"Task {task_id} marked as incomplete!")
+        else:
+            self.error(f"Task with ID {task_id} not found")
+
+        return True
+
+    def _undo_redo(self, command: str, past: str) -> bool:
+        """Run undo or redo on the service and report what changed."""
+        if not hasattr(self.task_service, command):
+            self.error(f"{command.capitalize()} is not supported by this storage engine")
+            return True
+
+        result = getattr(self.task_service, command)()
+        if result is None:
+            self.error(f"Nothing to {command}")
+            return True
+
+        op, task_ids = result
+        target = f"task {task_ids[0]}" if len(task_ids) == 1 else f"{len(task_ids)} tasks"
+        self.say(f"{past} {op} of {target}")
+        return True
+
+    @command("undo")
+    def handle_undo(self, args: List[str]) -> bool:
+        """Handle the undo command."""
+        return self._undo_redo("undo", "Undid")
+
+    @command("redo")
+    def handle_redo(self, args: List[str]) -> bool:
+        """Handle the redo command."""
+        return self._undo_redo("redo", "Redid")
+
+    @command("history")
+    def handle_history(self, args: List[str]) -> bool:
+        """Handle the history command."""
+        if len(args) != 1:
+            self.error("Usage: history <id>")
+            return True
+        if not hasattr(self.task_service, "task_history"):
+            self.error("History is not supported by this storage engine")
             return True
 
         try:
             task_id = int(args[0])
         except ValueError:
-            print("Task ID must be a number")
+            self.error("Task ID must be a number")
             return True
 
-        task = self.task_service.mark_task_incomplete(task_id)
+        lines = []
+        for op, task in self.task_service.task_history(task_id):
+            if task is None:
+                lines.append(f"  {op:<10} (task deleted)\n")
+            else:
+                status = "✓" if task.completed else "○"
+                when = task.updated_at.isoformat(' ', 'seconds')
+                description = f" - {task.description}" if task.description else ""
+                lines.append(f"  {op:<10} {when}  {status} {task.title}{description}\n")
+
+        if not lines:
+            if self.task_service.get_task_by_id(task_id) is None:
+                self.error(f"Task with ID {task_id} not found")
+            else:
+                print(f"No recorded changes for task {task_id}")
+            return True
+
+        sys.stdout.write(f"\nHistory of task {task_id} (newest first):\n" + "".join(lines))
+        return True
+
+    @command("dedupe")
+    def handle_dedupe(self, args: List[str]) -> bool:
+        """Handle the dedupe command."""
+        if args not in ([], ["--delete"]):
+            self.error("Usage: dedupe [--delete]")
+            return True
+        if not hasattr(self.task_service, "duplicate_groups"):
+            self.error("Dedupe is not supported by this storage engine")
+            return True
+
+        groups = self.task_service.duplicate_groups()
+        if not groups:
+            print("No duplicate tasks.")
+            return True
+        lines = ["\nTasks with the same title and description, oldest first:\n"]
+        for group in groups:
+            lines.append(f"  {', '.join(str(task.id) for task in group)}: {group[0].title}\n")
+        sys.stdout.write("".join(lines))
+        if args:
+            extra = [task.id for group in groups for task in group[1:]]
+            for task_id in extra:
+                self.rendered.pop(task_id, None)
+            deleted = sum(self.task_service.delete_many(extra))
+            self.say(f"{deleted} duplicate tasks deleted; the oldest of each set was kept")
+        return True
+
+    SCHEDULE_USAGE = "Usage: schedule <id> [--due T|--no-due] [--priority N]"
+
+    @command("schedule")
+    def handle_schedule(self, args: List[str]) -> bool:
+        """Handle the schedule command."""
+        if not hasattr(self.task_service, "schedule_task"):
+            self.error("Scheduling is not supported by this storage engine")
+            return True
+        parsed = self._schedule_options(args, self.SCHEDULE_USAGE)
+        if parsed is None:
+            return True
+        args, options = parsed
+        if len(args) != 1 or not options or ("clear_due" in options and "due_at" in options):
+            self.error(self.SCHEDULE_USAGE)
+            return True
+        try:
+            task_id = int(args[0])
+        except ValueError:
+            self.error("Task ID must be a number")
+            return True
+
+        try:
+            task = self.task_service.schedule_task(task_id, **options)
+        except ValueError as e:
+            self.error(f"Error scheduling task: {str(e)}")
+            return True
         if task:
-            print(f"Task {task_id} marked as incomplete!")
+            self.say(f"Task {task_id} scheduled successfully!")
+        else:
+            self.error(f"Task with ID {task_id} not found")
+        return True
+
+    def _show_tasks(self, heading: str, tasks: list, empty: str):
+        """Write a list of tasks under a heading."""
+        if not tasks:
+            print(empty)
+            return
+        sys.stdout.write("".join([f"\n{heading}:\n", "-" * 80, "\n"]
+                                 + [self.render_task(task) for task in tasks] + ["-" * 80, "\n"]))
+
+    @command("next")
+    def handle_next(self, args: List[str]) -> bool:
+        """Handle the next command."""
+        if not hasattr(self.task_service, "next_tasks"):
+            self.error("Scheduling is not supported by this storage engine")
+            return True
+        limit, by = 10, "priority"
+        position = 0
+        while position < len(args):
+            flag = args[position]
+            if flag not in ("--limit", "--by") or position + 1 >= len(args):
+                self.error("Usage: next [--limit N] [--by priority|due]")
+                return True
+            value = args[position + 1]
+            position += 2
+            if flag == "--by":
+                if value not in ("priority", "due"):
+                    self.error("--by must be one of priority, due")
+                    return True
+                by = value
+            else:
+                try:
+                    limit = int(value)
+                except ValueError:
+                    limit = 0
+                if limit < 1:
+                    self.error("--limit must be a number of at least 1")
+                    return True
+
+        heading = "Next tasks by priority" if by == "priority" else "Next tasks by due date"
+        self._show_tasks(heading, self.task_service.next_tasks(limit, by), "No open tasks.")
+        return True
+
+    @command("due")
+    def handle_due(self, args: List[str]) -> bool:
+        """Handle the due command."""
+        if not hasattr(self.task_service, "due_tasks"):
+            self.error("Scheduling is not supported by this storage engine")
+            return True
+        within = "1d"
+        if args:
+            if len(args) != 2 or args[0] != "--within":
+                self.error("Usage: due [--within D]  (D is a duration such as 30m, 1h or 2d)")
+                return True
+            within = args[1]
+        try:
+            window = parse_duration(within)
+        except ValueError as e:
+            self.error(str(e))
+            return True
+
+        self._show_tasks(f"Open tasks due within {within}", self.task_service.due_tasks(window),
+                         f"No open tasks due within {within}.")
+        return True
+
+    def _print_reminders(self, reminders):
+        """Print fired reminders; runs on the reminder thread."""
+        lines = []
+        for task_id, due_at in reminders:
+            task = self.task_service.get_task_by_id(task_id)
+            title = task.title if task is not None else "(deleted)"
+            lines.append(f"\n⏰ Task {task_id} is due ({due_at.isoformat(' ', 'minutes')}): {title}")
+        print("".join(lines), flush=True)
+
+    @command("remind")
+    def handle_remind(self, args: List[str]) -> bool:
+        """Handle the remind command."""
+        if args not in (["on"], ["off"]):
+            self.error("Usage: remind on|off")
+            return True
+        if not hasattr(self.task_service, "start_reminders"):
+            self.error("Reminders are not supported by this storage engine")
+            return True
+        if args == ["on"]:
+            self.task_service.start_reminders(self._print_reminders)
+            self.say("Reminders on")
         else:
-            print(f"Task with ID {task_id} not found")
+            self.task_service.stop_reminders()
+            self.say("Reminders off")
+        return True
 
+    @command("summary")
+    def handle_summary(self, args: List[str]) -> bool:
+        """Handle the summary command."""
+        if not hasattr(self.task_service, "summary"):
+            self.error("Summary is not supported by this storage engine")
+            return True
+        days = 7
+        if args:
+            if len(args) != 2 or args[0] != "--days":
+                self.error("Usage: summary [--days N]")
+                return True
+            try:
+                days = int(args[1])
+            except ValueError:
+                days = 0
+            if days < 1:
+                self.error("--days must be a number of at least 1")
+                return True
+
+        summary = self.task_service.summary()
+        lines = [f"\nTasks: {summary.total} total, {summary.open} open, {summary.completed} completed "
+                 f"({summary.completion_rate:.0%} done)\n"]
+        if summary.archived:
+            lines.append(f"Archived: {summary.archived}\n")
+        lines.append(f"\n{'day':<12} {'created':>8} {'completed':>10}\n")
+        for day, created, completed in summary.recent(days):
+            lines.append(f"{day.isoformat():<12} {created:>8} {completed:>10}\n")
+        sys.stdout.write("".join(lines))
         return True
 
-    def handle_exit(self) -> bool:
+    @command("archive")
+    def handle_archive(self, args: List[str]) -> bool:
+        """Handle the archive command."""
+        if getattr(self.task_service, "archive", None) is None:
+            self.error("Archiving is not enabled; start the app with --archive-after DAYS")
+            return True
+        older_than = None
+        if args:
+            if len(args) != 2 or args[0] != "--older-than":
+                self.error("Usage: archive [--older-than DAYS]")
+                return True
+            try:
+                days = float(args[1])
+            except ValueError:
+                days = -1
+            if days < 0:
+                self.error("--older-than must be a number of days")
+                return True
+            older_than = timedelta(days=days)
+
+        count = self.task_service.archive_completed(older_than)
+        self.say(f"Archived {count} tasks")
+        return True
+
+    def _transfer_args(self, command: str, args: List[str]):
+        """Parse `<file> [--format csv|jsonl]`; return (path, format) or None."""
+        if len(args) == 1:
+            return args[0], None
+        if len(args) == 3 and args[1] == "--format":
+            return args[0], args[2]
+        self.error(f"Usage: {command} <file> [--format csv|jsonl]")
+        return None
+
+    @command("import")
+    def handle_import(self, args: List[str]) -> bool:
+        """Handle the import command."""
+        parsed = self._transfer_args("import", args)
+        if parsed is None:
+            return True
+
+        try:
+            report = self.task_service.import_tasks(*parsed)
+        except (OSError, ValueError) as e:
+            self.error(f"Error importing tasks: {str(e)}")
+            return True
+
+        self.say(f"Imported {report.imported} tasks ({report.rejected} rejected)")
+        for message in report.errors:
+            self.error(message)
+        if report.rejected > len(report.errors):
+            self.error(f"... and {report.rejected - len(report.errors)} more rejected rows")
+        return True
+
+    @command("export")
+    def handle_export(self, args: List[str]) -> bool:
+        """Handle the export command."""
+        parsed = self._transfer_args("export", args)
+        if parsed is None:
+            return True
+
+        try:
+            count = self.task_service.export_tasks(*parsed)
+        except (OSError, ValueError) as e:
+            self.error(f"Error exporting tasks: {str(e)}")
+            return True
+
+        self.say(f"Exported {count} tasks to {parsed[0]}")
+        return True
+
+    @command("stats")
+    def handle_stats(self, args: List[str]) -> bool:
+        """Handle the stats command."""
+        if self.metrics is None:
+            self.error("Metrics are not enabled; start the app with --metrics")
+            return True
+        if args[:1] == ["--prometheus"] and len(args) == 2:
+            try:
+                self.metrics.write_prometheus(args[1])
+            except OSError as e:
+                self.error(f"Error writing metrics: {str(e)}")
+                return True
+            self.say(f"Metrics written to {args[1]}")
+            return True
+        if args == ["--reset"]:
+            self.metrics.reset()
+            self.say("Metrics reset")
+            return True
+        if args:
+            self.error("Usage: stats [--prometheus FILE] [--reset]")
+            return True
+
+        # Slowest in total first: that is where the time goes
+        rows = sorted(self.metrics, key=lambda row: row[2].total, reverse=True)
+        if not rows:
+            print("No calls recorded yet.")
+            return True
+        lines = [f"\n{'layer':<8} {'operation':<22} {'calls':>9} {'errors':>7} "
+                 f"{'total ms':>10} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9}\n"]
+        for layer, operation, stats in rows:
+            lines.append(f"{layer:<8} {operation:<22} {stats.count:>9} {stats.errors:>7} "
+                         f"{stats.total * 1e3:>10.1f} {stats.total / stats.count * 1e6:>9.1f} "
+                         f"{stats.quantile(0.5) * 1e6:>9.1f} {stats.quantile(0.99) * 1e6:>9.1f}\n")
+        sys.stdout.write("".join(lines))
+        return True
+
+    @command("quit", "exit")
+    def handle_exit(self, args: List[str] = None) -> bool:
         """Handle the exit command."""
-        print("Goodbye!")
+        self.say("Goodbye!")
         self.running = False
         return False
 
@@ -243,4 +876,4 @@ Examples:
                 break
             except EOFError:
                 print("\nGoodbye!")
-                break
\ No newline at end of file
+                break
@@ -0,0 +1,109 @@
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from ..models.task import parse_timestamp
+
+# One alternation, compiled once: a double-quoted string, a single-quoted
+# string, or a bare word. Backslash escapes are allowed inside quotes.
+TOKEN_PATTERN = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+                           r"|'([^'\\]*(?:\\.[^'\\]*)*)'"
+                           r"|(\S+)")
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+# A duration such as 90m, 1h30m or 2d: one or more number-and-unit parts
+DURATION_PATTERN = re.compile(r"(?:\d+[smhdw])+")
+DURATION_PART = re.compile(r"(\d+)([smhdw])")
+DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+# Upper bound on the IDs one command may name, so `1-999999999` fails fast
+MAX_IDS = 1_000_000
+
+
+def tokenize(line: str) -> List[str]:
+    """
+    Split a command line into arguments in a single pass.
+
+    Quoted strings become one argument with their quotes removed, and a
+    backslash inside quotes makes the next character literal, so
+    `add "Say \\"hi\\""` yields ['add', 'Say "hi"']. Empty quotes produce an
+    empty argument. Lines without quotes take a plain str.split() fast path.
+    """
+    if '"' not in line and "'" not in line:
+        return line.split()
+
+    matches = TOKEN_PATTERN.findall(line)
+    if "\\" not in line:
+        # A bare word is never empty, so an all-empty match is empty quotes
+        return [bare or double or single for double, single, bare in matches]
+
+    tokens = []
+    for double, single, bare in matches:
+        if bare:
+            tokens.append(bare)
+        else:
+            tokens.append(ESCAPE_PATTERN.sub(r"\1", double or single))
+    return tokens
+
+
+def parse_line(line: str) -> Tuple[str, List[str]]:
+    """Return (lowercase command, arguments) for a command line."""
+    tokens = tokenize(line)
+    if not tokens:
+        return "", []
+    return tokens[0].lower(), tokens[1:]
+
+
+def parse_id_list(args: List[str]) -> List[int]:
+    """
+    Parse task IDs and ranges such as `1-500,712` or `3 7 9-12`.
+
+    Commas and separate arguments are equivalent, ranges are inclusive,
+    and repeated IDs are kept once, in the order first given. Raises
+    ValueError for anything that is not a number or an ascending range.
+    """
+    task_ids: List[int] = []
+    for part in ",".join(args).split(","):
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        try:
+            start = int(first)
+            stop = int(last) if dash else start
+        except ValueError:
+            raise ValueError(f"Task ID must be a number or a range such as 1-500, not '{part}'") from None
+        if dash:
+            if start > stop:
+                raise ValueError(f"Range {part} must be ascending")
+            if stop - start >= MAX_IDS:
+                raise ValueError(f"Range {part} is too large")
+            task_ids.extend(range(start, stop + 1))
+        else:
+            task_ids.append(start)
+        if len(task_ids) > MAX_IDS:
+            raise ValueError(f"At most {MAX_IDS:,} IDs per command")
+    if not task_ids:
+        raise ValueError("No task IDs given")
+    return list(dict.fromkeys(task_ids))
+
+
+def parse_duration(text: str) -> timedelta:
+    """Parse a duration such as `30m`, `1h30m`, `2d` or `1w`; raise ValueError otherwise."""
+    text = text.strip().lower()
+    if not DURATION_PATTERN.fullmatch(text):
+        raise ValueError(f"Duration must look like 30m, 1h30m, 2d or 1w, not '{text}'")
+    return sum((timedelta(**{DURATION_UNITS[unit]: int(amount)})
+                for amount, unit in DURATION_PART.findall(text)), timedelta())
+
+
+def parse_when(text: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a point in time: an ISO date or time (`2026-01-31T09:00`) or a
+    duration from now (`2h`), as naive local time. Raise ValueError otherwise.
+    """
+    if DURATION_PATTERN.fullmatch(text.strip().lower()):
+        return (now or datetime.now()) + parse_duration(text)
+    try:
+        return parse_timestamp(text)
+    except ValueError:
+        raise ValueError(f"Time must be an ISO date or time (2026-01-31T09:00) "
+                         f"or a duration from now (2h), not '{text}'") from None
@@ -1,18 +1,166 @@
+import argparse
+import os
+import sys
 from .services.task_service import TaskService
 from .cli.console import ConsoleInterface
+from .storage.persistence import SYNC_MODES
 
+ENGINES = ("memory", "columnar", "mapped", "sqlite")
 
-def main():
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Todo Console App")
+    parser.add_argument("--engine", choices=ENGINES, default="memory",
+                        help="task storage engine (default: memory)")
+    parser.add_argument("--db", default="todo.db",
+                        help="database file for the sqlite engine (default: todo.db)")
+    parser.add_argument("--data-dir",
+                        help="directory for the durable task journal of the memory, "
+                             "columnar and mapped engines (default: in-memory only)")
+    parser.add_argument("--sync", choices=SYNC_MODES, default="batch",
+                        help="journal fsync mode (default: batch)")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="partition the memory, columnar or mapped engine across N worker "
+                             "processes (default: 0, a single in-process service)")
+    parser.add_argument("--history", type=int, default=10_000, metavar="N",
+                        help="changed tasks kept for undo and history by the memory, columnar "
+                             "and mapped engines; 0 disables undo (default: 10000)")
+    parser.add_argument("--archive-after", type=float, metavar="DAYS",
+                        help="move tasks completed DAYS ago to compressed segments under "
+                             "--data-dir at startup and with the archive command (memory, "
+                             "columnar and mapped engines)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) without prompting, then exit")
+    parser.add_argument("--serve", action="store_true",
+                        help="serve the HTTP/JSON API instead of the console")
+    parser.add_argument("--host", default="127.0.0.1", help="API bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="API port (default: 8000)")
+    parser.add_argument("--workers", type=int,
+                        help="API worker threads for blocking engines (default: 4 for sqlite, "
+                             "0 otherwise, meaning requests run on the event loop)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="count and time every service call and console command; "
+                             "see the stats command")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="write metrics in the Prometheus text format to FILE at exit "
+                             "(implies --metrics)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="sample the running program and write collapsed stacks "
+                             "(flamegraph input) to FILE at exit")
+    args = parser.parse_args(argv)
+    if args.engine == "mapped" and not args.data_dir:
+        parser.error("--engine mapped needs --data-dir")
+    if args.archive_after is not None:
+        if not args.data_dir:
+            parser.error("--archive-after needs --data-dir")
+        if args.engine == "sqlite" or args.shards or (args.serve and args.workers):
+            parser.error("--archive-after needs a single-process engine without --workers")
+        if args.archive_after < 0:
+            parser.error("--archive-after must be at least 0")
+    return args
+
+
+def create_service(args):
+    """Build the task service selected on the command line."""
+    if args.engine == "sqlite":
+        from .services.sqlite_task_service import SqliteTaskService
+        return SqliteTaskService(args.db)
+
+    if args.shards:
+        from .services.sharded import ShardedTaskService
+        return ShardedTaskService(args.shards, args.engine, args.data_dir, args.sync)
+
+    # Engines are imported only when selected, to keep start-up short
+    store = None
+    snapshot_format = "json"
+    if args.engine == "columnar":
+        from .storage.columnar import ColumnarTaskStore
+        store = ColumnarTaskStore()
+    elif args.engine == "mapped":
+        from .storage.mapped import MappedTaskStore
+        store = MappedTaskStore()
+        snapshot_format = "binary"
+    persistence = None
+    if args.data_dir:
+        from .storage.journal import JournalPersistence
+        persistence = JournalPersistence(args.data_dir, sync=args.sync, snapshot_format=snapshot_format)
+    if store is None and args.serve and args.workers:
+        # Worker threads share the service; reads run without the API lock
+        from .services.threadsafe import ThreadSafeTaskService
+        return ThreadSafeTaskService(store, persistence, args.history)
+    archive = None
+    if args.archive_after is not None:
+        from datetime import timedelta
+        from .storage.archive import TaskArchive
+        archive = TaskArchive(os.path.join(args.data_dir, "archive"), timedelta(days=args.archive_after))
+    service = TaskService(store, persistence, args.history, archive)
+    if archive is not None:
+        service.archive_completed()
+    return service
+
+
+def serve(task_service, args) -> int:
+    """Run the HTTP/JSON API until interrupted."""
+    import asyncio
+    from .api.server import TaskAPIServer
+
+    workers = args.workers if args.workers is not None else (4 if args.engine == "sqlite" else 0)
+    server = TaskAPIServer(task_service, args.host, args.port, workers)
+    print(f"Serving the Todo API on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def main(argv=None):
     """Application entry point."""
+    args = parse_args(argv)
+
+    profiler = None
+    if args.profile:
+        from .cli.profiler import SampledProfiler
+        profiler = SampledProfiler()
+        profiler.start()
+
     # Initialize the task service
-    task_service = TaskService()
+    task_service = create_service(args)
+    metrics = None
+    if args.metrics or args.metrics_file:
+        from .services.metrics import Metrics
+        metrics = Metrics()
+        metrics.instrument(task_service)
 
     # Initialize the console interface
-    console = ConsoleInterface(task_service)
+    console = ConsoleInterface(task_service, metrics)
 
     # Start the application
-    console.run()
+    try:
+        if args.serve:
+            return serve(task_service, args)
+        if args.batch:
+            from .cli.batch import BatchRunner, open_batch_source
+            if hasattr(sys.stdout, "reconfigure"):
+                sys.stdout.reconfigure(line_buffering=False)
+            with open_batch_source(args.batch) as source:
+                errors = BatchRunner(console).run(source)
+            return 1 if errors else 0
+        console.run()
+        return 0
+    finally:
+        task_service.close()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+        if profiler is not None:
+            profiler.stop()
+            profiler.write(args.profile)
+            print(f"Profile: {profiler.sample_count} samples written to {args.profile}",
+                  file=sys.stderr)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
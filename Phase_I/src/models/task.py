@@ -2,8 +2,22 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+MIN_PRIORITY = 0
+MAX_PRIORITY = 9
 
-@dataclass
+
+def parse_timestamp(text: str) -> datetime:
+    """
+    Parse an ISO date or time. Stored timestamps are naive local time, so
+    a value with a UTC offset is converted to that to stay comparable.
+    """
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+@dataclass(slots=True)
 class Task:
     """
     Represents a single todo task with properties:
@@ -13,6 +27,11 @@ class Task:
     - completed: boolean (default: false)
     - created_at: datetime
     - updated_at: datetime
+    - due_at: datetime (optional)
+    - priority: integer (0-9, higher is more urgent; default: 0)
+
+    The class is slotted so a large store does not pay for a per-instance
+    __dict__.
     """
     id: int
     title: str
@@ -20,6 +39,8 @@ class Task:
     completed: bool = False
     created_at: datetime = None
     updated_at: datetime = None
+    due_at: Optional[datetime] = None
+    priority: int = 0
 
     def __post_init__(self):
         """Initialize timestamps if not provided."""
@@ -33,6 +54,11 @@ class Task:
         if not (1 <= len(self.title) <= 200):
             raise ValueError("Title must be between 1 and 200 characters")
 
+    def validate_priority(self):
+        """Validate the priority range."""
+        if not (MIN_PRIORITY <= self.priority <= MAX_PRIORITY):
+            raise ValueError(f"Priority must be between {MIN_PRIORITY} and {MAX_PRIORITY}")
+
     def update(self, title: str = None, description: str = None):
         """Update task details."""
         if title is not None:
@@ -40,4 +66,31 @@ class Task:
             self.validate_title()
         if description is not None:
             self.description = description
-        self.updated_at = datetime.now()
\ No newline at end of file
+        self.updated_at = datetime.now()
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serialisable representation of the task."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "completed": self.completed,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "due_at": self.due_at.isoformat() if self.due_at is not None else None,
+            "priority": self.priority,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Create a task from the output of to_dict()."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data.get("description"),
+            completed=data.get("completed", False),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            due_at=datetime.fromisoformat(data["due_at"]) if data.get("due_at") else None,
+            priority=data.get("priority", 0),
+        )
@@ -0,0 +1,114 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ..models.task import Task
+from .indexes import TaskIndex
+
+
+@dataclass
+class TaskSummary:
+    """Task counts plus tasks created and completed per day."""
+    total: int = 0
+    completed: int = 0
+    created_per_day: Dict[date, int] = field(default_factory=dict)
+    completed_per_day: Dict[date, int] = field(default_factory=dict)
+    archived: int = 0
+
+    @property
+    def open(self) -> int:
+        return self.total - self.completed
+
+    @property
+    def completion_rate(self) -> float:
+        """Share of tasks that are completed, from 0 to 1."""
+        return self.completed / self.total if self.total else 0.0
+
+    def recent(self, days: int, today: Optional[date] = None) -> List[Tuple[date, int, int]]:
+        """Return (day, created, completed) for the last `days` days up to today, oldest first."""
+        today = today or date.today()
+        rows = []
+        for back in range(days - 1, -1, -1):
+            day = today - timedelta(days=back)
+            rows.append((day, self.created_per_day.get(day, 0), self.completed_per_day.get(day, 0)))
+        return rows
+
+    def __add__(self, other: "TaskSummary") -> "TaskSummary":
+        """Combine the summaries of two disjoint sets of tasks."""
+        created = dict(self.created_per_day)
+        for day, count in other.created_per_day.items():
+            created[day] = created.get(day, 0) + count
+        completed = dict(self.completed_per_day)
+        for day, count in other.completed_per_day.items():
+            completed[day] = completed.get(day, 0) + count
+        return TaskSummary(self.total + other.total, self.completed + other.completed,
+                           dict(sorted(created.items())), dict(sorted(completed.items())),
+                           self.archived + other.archived)
+
+    def to_dict(self) -> dict:
+        """Convert the summary to a JSON-ready dictionary."""
+        return {
+            "total": self.total,
+            "open": self.open,
+            "completed": self.completed,
+            "archived": self.archived,
+            "completion_rate": self.completion_rate,
+            "created_per_day": {day.isoformat(): count for day, count in self.created_per_day.items()},
+            "completed_per_day": {day.isoformat(): count for day, count in self.completed_per_day.items()},
+        }
+
+
+class TaskAggregates(TaskIndex):
+    """
+    Running task counts, updated in O(1) per mutation:
+    - total and completed counts (open is the difference)
+    - tasks created per day, by created_at
+    - completed tasks per day, by updated_at
+
+    A completed task is counted on the day it last changed, which is the
+    day it was completed unless it was edited afterwards; reopening it
+    takes it off that day again.
+    """
+
+    fields = frozenset({"completed", "created_at", "updated_at"})
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """Count existing tasks."""
+        self.total = 0
+        self.completed = 0
+        self.created_per_day: Dict[date, int] = {}
+        self.completed_per_day: Dict[date, int] = {}
+        for task in tasks:
+            self.add(task)
+
+    @staticmethod
+    def _bump(counts: Dict[date, int], day: date, delta: int):
+        count = counts.get(day, 0) + delta
+        if count:
+            counts[day] = count
+        else:
+            del counts[day]
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        if changed is None:
+            self.total += 1
+        if changed is None or "created_at" in changed:
+            self._bump(self.created_per_day, task.created_at.date(), 1)
+        if task.completed:
+            if changed is None or "completed" in changed:
+                self.completed += 1
+            self._bump(self.completed_per_day, task.updated_at.date(), 1)
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        if changed is None:
+            self.total -= 1
+        if changed is None or "created_at" in changed:
+            self._bump(self.created_per_day, task.created_at.date(), -1)
+        if task.completed:
+            if changed is None or "completed" in changed:
+                self.completed -= 1
+            self._bump(self.completed_per_day, task.updated_at.date(), -1)
+
+    def summary(self) -> TaskSummary:
+        """Return a copy of the current counts, with days in order."""
+        return TaskSummary(self.total, self.completed, dict(sorted(self.created_per_day.items())),
+                           dict(sorted(self.completed_per_day.items())))
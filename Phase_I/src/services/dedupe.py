@@ -0,0 +1,144 @@
+import time
+from bisect import insort
+from collections import OrderedDict
+from datetime import timedelta
+from hashlib import blake2b
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from ..models.task import Task
+from .indexes import TaskIndex
+
+
+def normalize(text: Optional[str]) -> str:
+    """Fold case and collapse runs of whitespace, so near-identical text compares equal."""
+    return " ".join(text.split()).casefold() if text else ""
+
+
+def content_key(title: str, description: Optional[str] = None) -> bytes:
+    """Return a 16-byte digest of a task's normalised title and description."""
+    text = f"{normalize(title)}\x00{normalize(description)}"
+    return blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class DuplicateTaskError(ValueError):
+    """Raised by add_task(unique=True) when a task with the same content exists."""
+
+    def __init__(self, task: Task):
+        super().__init__(f"Task {task.id} already has this title and description")
+        self.task = task
+
+
+class ContentIndex(TaskIndex):
+    """
+    Hash index from task content to the IDs that share it.
+
+    Tasks are keyed by a digest of their normalised title and description
+    (see normalize), so finding a task's duplicates is one dictionary
+    lookup and memory per task does not grow with the length of its text.
+    A key held by one task maps to its ID; a key shared by several maps
+    to a sorted list of them, and the shared keys are also kept in a set
+    so groups() never walks the unique ones.
+    """
+
+    fields = frozenset({"title", "description"})
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """Index existing tasks."""
+        self._ids: Dict[bytes, Union[int, List[int]]] = {}
+        self._shared: Set[bytes] = set()
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        key = content_key(task.title, task.description)
+        current = self._ids.get(key)
+        if current is None:
+            self._ids[key] = task.id
+        elif isinstance(current, int):
+            self._ids[key] = sorted((current, task.id))
+            self._shared.add(key)
+        else:
+            insort(current, task.id)
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        key = content_key(task.title, task.description)
+        current = self._ids.get(key)
+        if current is None:
+            return
+        if isinstance(current, int):
+            if current == task.id:
+                del self._ids[key]
+            return
+        if task.id in current:
+            current.remove(task.id)
+        if len(current) == 1:
+            self._ids[key] = current[0]
+            self._shared.discard(key)
+
+    def find(self, title: str, description: Optional[str] = None) -> List[int]:
+        """Return the IDs of tasks with this content, oldest first."""
+        current = self._ids.get(content_key(title, description))
+        if current is None:
+            return []
+        return [current] if isinstance(current, int) else list(current)
+
+    def groups(self) -> List[List[int]]:
+        """Return the IDs of each set of duplicates, oldest first, ordered by their oldest task."""
+        return sorted(list(self._ids[key]) for key in self._shared)
+
+    def items(self) -> Iterator[Tuple[bytes, List[int]]]:
+        """Iterate (content key, IDs) for every indexed task content."""
+        for key, current in self._ids.items():
+            yield key, [current] if isinstance(current, int) else list(current)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class IdempotencyKeys:
+    """
+    Bounded map from client idempotency keys to the task each one created.
+
+    A retried add_task with the same key returns the task the first call
+    created instead of adding a copy. Keys expire `ttl` after they were
+    first stored, and once more than `capacity` are held the least
+    recently used are dropped, so memory stays bounded however many
+    clients send keys. Expired keys are dropped from the least recently
+    used end as new ones are stored, and checked again on lookup.
+    """
+
+    def __init__(self, capacity: int = 10_000, ttl: timedelta = timedelta(hours=24),
+                 clock: Callable[[], float] = time.monotonic):
+        """Create an empty map; `clock` returns seconds and is swappable for tests."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.ttl = ttl.total_seconds()
+        self.clock = clock
+        # Key -> (task ID, expiry time), least recently used first
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[int]:
+        """Return the task ID stored for `key`, or None if it is unknown or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, task_id: int):
+        """Remember that `key` created task `task_id`."""
+        now = self.clock()
+        self._entries[key] = (task_id, now + self.ttl)
+        self._entries.move_to_end(key)
+        entries = self._entries
+        while entries and (len(entries) > self.capacity or next(iter(entries.values()))[1] <= now):
+            entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,322 @@
+import sys
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Callable, FrozenSet, Iterable, List, NamedTuple, Optional
+from ..models.task import Task
+from .history import whole_task
+from .indexes import TaskIndex
+
+if TYPE_CHECKING:
+    # asyncio takes longer to import than the rest of the app; only
+    # subscribe_async() needs it, so it is imported there
+    import asyncio
+
+# Event kinds
+CREATED = "created"
+UPDATED = "updated"
+COMPLETED = "completed"
+REOPENED = "reopened"
+DELETED = "deleted"
+# Sent instead of events a queued subscriber could not keep up with
+RESYNC = "resync"
+EVENT_KINDS = (CREATED, UPDATED, COMPLETED, REOPENED, DELETED, RESYNC)
+
+
+class TaskEvent(NamedTuple):
+    """
+    One change to one task; a named tuple, so it is immutable and cheap
+    to create on every mutation.
+
+    `task` is a copy of the task after the change, or None for deleted
+    and resync events. A resync event means earlier events were dropped
+    because the subscriber fell behind; it should rebuild whatever it
+    derives from the tasks (e.g. from get_all_tasks()) and carry on.
+    """
+    kind: str
+    task_id: int
+    task: Optional[Task] = None
+
+
+# A subscriber receives events in batches, oldest first
+Subscriber = Callable[[List[TaskEvent]], object]
+
+
+class Subscription:
+    """
+    A synchronous subscriber: called inline from the mutation, under the
+    caller's thread, with a batch of one event.
+
+    Exceptions raised by the callback are counted in `errors` and
+    reported on stderr; they never fail the mutation.
+    """
+
+    def __init__(self, bus: "EventBus", callback: Subscriber, kinds: Optional[Iterable[str]]):
+        self.bus = bus
+        self.callback = callback
+        self.kinds: Optional[FrozenSet[str]] = frozenset(kinds) if kinds is not None else None
+        self.errors = 0
+
+    def deliver(self, event: TaskEvent):
+        self._call([event])
+
+    def _call(self, batch: List[TaskEvent]):
+        try:
+            self.callback(batch)
+        except Exception as error:
+            self._failed(error)
+
+    def _failed(self, error: Exception):
+        self.errors += 1
+        print(f"Event subscriber {self.callback!r} failed: {error}", file=sys.stderr)
+
+    def close(self):
+        """Stop delivering events to this subscriber."""
+
+
+class QueuedSubscription(Subscription):
+    """
+    Base for subscribers that run apart from the mutation:
+    - Events wait in a bounded queue; delivery takes up to `batch_size`
+      at a time, so a burst of writes arrives as a few large batches
+    - A full queue never blocks the publisher: the queued events are
+      dropped and the next batch starts with one RESYNC event
+    """
+
+    def __init__(self, bus, callback, kinds, batch_size: int, max_pending: int):
+        super().__init__(bus, callback, kinds)
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: deque = deque()
+        self._overflowed = False
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def deliver(self, event: TaskEvent):
+        with self._lock:
+            if self._closed:
+                return
+            if len(self._pending) >= self.max_pending:
+                self.dropped += len(self._pending)
+                self._pending.clear()
+                self._overflowed = True
+            self._pending.append(event)
+            wake = len(self._pending) == 1
+        if wake:
+            self._wake()
+
+    def _take(self) -> List[TaskEvent]:
+        """Remove and return the next batch, or an empty list."""
+        with self._lock:
+            batch = []
+            if self._overflowed:
+                batch.append(TaskEvent(RESYNC, 0))
+                self._overflowed = False
+            pending = self._pending
+            for _ in range(min(len(pending), self.batch_size)):
+                batch.append(pending.popleft())
+            return batch
+
+    def _wake(self):
+        raise NotImplementedError
+
+
+class ThreadedSubscription(QueuedSubscription):
+    """A subscriber called with batches from its own daemon thread."""
+
+    def __init__(self, bus, callback, kinds, batch_size: int, max_pending: int):
+        super().__init__(bus, callback, kinds, batch_size, max_pending)
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="task-events", daemon=True)
+        self._thread.start()
+
+    def _wake(self):
+        self._ready.set()
+
+    def _run(self):
+        while True:
+            self._ready.wait()
+            self._ready.clear()
+            while True:
+                batch = self._take()
+                if not batch:
+                    break
+                self._call(batch)
+            if self._closed:
+                return
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Deliver what is already queued, then stop the thread."""
+        with self._lock:
+            self._closed = True
+        self._ready.set()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+
+class AsyncSubscription(QueuedSubscription):
+    """
+    A subscriber called with batches from a task on an asyncio event loop.
+
+    The callback may be a plain function or a coroutine function.
+    Mutations on other threads hand events over with one
+    call_soon_threadsafe per batch, not per event.
+    """
+
+    def __init__(self, bus, callback, kinds, batch_size: int, max_pending: int,
+                 loop: "asyncio.AbstractEventLoop"):
+        import asyncio
+        super().__init__(bus, callback, kinds, batch_size, max_pending)
+        self.loop = loop
+        self._ready = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    def _wake(self):
+        if self._on_loop():
+            self._ready.set()
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            pass  # the loop has shut down
+
+    def _on_loop(self) -> bool:
+        import asyncio
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    async def _run(self):
+        import asyncio
+        while not self._closed:
+            await self._ready.wait()
+            self._ready.clear()
+            while True:
+                batch = self._take()
+                if not batch:
+                    break
+                try:
+                    result = self.callback(batch)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as error:
+                    self._failed(error)
+
+    def close(self):
+        """Stop delivering; events still queued are dropped."""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._task.cancel)
+
+
+class EventBus(TaskIndex):
+    """
+    In-process change notifications for a TaskService:
+    - Typed events for every mutation: created, updated, completed,
+      reopened and deleted, including bulk calls and undo/redo
+    - Synchronous, threaded and asyncio subscribers
+    - Optional filtering by event kind
+
+    The bus is a TaskIndex over every field, so it sees each change
+    through the same hooks that keep the search and status indexes
+    current. The service only registers it once something subscribes,
+    so mutations pay nothing for it until then, and an event no
+    subscriber asked for is never built.
+    """
+
+    BATCH_SIZE = 1000
+    MAX_PENDING = 100_000
+
+    def __init__(self):
+        """Create a bus with no subscribers."""
+        self.subscriptions: List[Subscription] = []
+        # Kinds any subscriber wants; None means every kind
+        self._wanted: Optional[FrozenSet[str]] = frozenset()
+
+    # Subscribing
+
+    def subscribe(self, callback: Subscriber, kinds: Optional[Iterable[str]] = None) -> Subscription:
+        """
+        Call `callback` inline with each event as it happens.
+
+        The callback runs inside the mutation, so it should be quick;
+        use subscribe_threaded() or subscribe_async() for slow work.
+        """
+        return self._add(Subscription(self, callback, kinds))
+
+    def subscribe_threaded(self, callback: Subscriber, kinds: Optional[Iterable[str]] = None,
+                           batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING) -> ThreadedSubscription:
+        """Call `callback` with batches of events from a dedicated thread."""
+        return self._add(ThreadedSubscription(self, callback, kinds, batch_size, max_pending))
+
+    def subscribe_async(self, callback: Subscriber, kinds: Optional[Iterable[str]] = None,
+                        batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING,
+                        loop: Optional["asyncio.AbstractEventLoop"] = None) -> AsyncSubscription:
+        """
+        Call `callback` with batches of events on an asyncio event loop.
+
+        Call this from the loop (or pass `loop`); events may still be
+        published from any thread.
+        """
+        import asyncio
+        loop = loop or asyncio.get_running_loop()
+        return self._add(AsyncSubscription(self, callback, kinds, batch_size, max_pending, loop))
+
+    def _add(self, subscription):
+        self.subscriptions.append(subscription)
+        self._update_wanted()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering events to a subscriber."""
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            self._update_wanted()
+            subscription.close()
+
+    def _update_wanted(self):
+        wanted = set()
+        for subscription in self.subscriptions:
+            if subscription.kinds is None:
+                self._wanted = None
+                return
+            wanted |= subscription.kinds
+        self._wanted = frozenset(wanted)
+
+    # Publishing
+
+    def publish(self, event: TaskEvent):
+        """Hand an event to every subscriber interested in its kind."""
+        for subscription in self.subscriptions:
+            if subscription.kinds is None or event.kind in subscription.kinds:
+                subscription.deliver(event)
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        wanted = self._wanted
+        if wanted is not None and not wanted:
+            return
+        if changed is None:
+            kind = CREATED
+        elif "completed" in changed:
+            kind = COMPLETED if task.completed else REOPENED
+        else:
+            kind = UPDATED
+        if wanted is not None and kind not in wanted:
+            return
+        # A positional copy is several times cheaper than dataclasses.replace()
+        self.publish(TaskEvent(kind, task.id, Task(*whole_task(task))))
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        # An edit is reported once, by add(); only a removal ends here
+        if changed is None and (self._wanted is None or DELETED in self._wanted):
+            self.publish(TaskEvent(DELETED, task.id))
+
+    def close(self):
+        """Flush threaded subscribers and detach everyone."""
+        subscriptions, self.subscriptions = self.subscriptions, []
+        self._update_wanted()
+        for subscription in subscriptions:
+            subscription.close()
@@ -0,0 +1,134 @@
+from collections import deque
+from itertools import count
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+from ..models.task import Task
+
+# Fields captured before each kind of edit. Entries keep these shared
+# tuples plus a tuple of old values, so an entry holds no per-task dict
+# and no object the garbage collector has to keep scanning.
+TEXT_DELTA = ("title", "description", "updated_at")
+STATUS_DELTA = ("completed", "updated_at")
+SCHEDULE_DELTA = ("due_at", "priority", "updated_at")
+EDIT_DELTA = ("title", "description", "due_at", "priority", "updated_at")
+TASK_DELTA = ("id", "title", "description", "completed", "created_at", "updated_at", "due_at", "priority")
+
+# (task_id, fields, values) says what a task looked like before a call:
+# - fields None: it did not exist (the call created it)
+# - fields TASK_DELTA: values holds every field (the call deleted it)
+# - otherwise: values holds the old values of the fields the call changed
+Entry = Tuple[int, Optional[Tuple[str, ...]], Optional[tuple]]
+Group = Tuple[str, List[Entry]]
+
+
+def whole_task(task: Task) -> tuple:
+    """Return every field of a task, in TASK_DELTA order."""
+    return (task.id, task.title, task.description, task.completed,
+            task.created_at, task.updated_at, task.due_at, task.priority)
+
+
+class OperationLog:
+    """
+    Bounded undo/redo log of inverse deltas:
+    - One entry per task changed, tagged with the service call it came from
+    - Edits keep only the old values of the changed fields
+    - Deletes keep every field of the removed task, as plain values
+    - Undo reverts a whole call at once, so a bulk call undoes as one step
+
+    Entries live in a deque capped at `limit`, so recording a change is
+    one tuple and one append, and the oldest entries fall off the far
+    end. Each entry carries its call's number; the first entry of a
+    bulk call stores it positive and the rest negative, so a call whose
+    first entry has fallen off is known to be incomplete and can no
+    longer be undone. A single call larger than the limit clears the
+    log, since older entries could not be applied in order past it. A
+    limit of 0 disables the log.
+
+    Redo is only offered while nothing new has been recorded since the
+    last undo or redo. Both take a `revert` callback that restores one
+    entry and returns the entry that would restore it back.
+    """
+
+    def __init__(self, limit: int = 10_000):
+        """Create an empty log holding at most `limit` entries."""
+        self.limit = limit
+        # (call number, op, task_id, fields, values), oldest first
+        self._undo: Deque[tuple] = deque(maxlen=limit or 1)
+        self._redo: List[Group] = []
+        self._calls = count(1)
+        # Newest call number when the redo stack was last pushed or popped
+        self._redo_base = 0
+        if not limit:
+            self.record = self.record_many = self._ignore
+
+    @staticmethod
+    def _ignore(*args):
+        pass
+
+    def record(self, op: str, task_id: int, fields: Optional[Tuple[str, ...]], values: Optional[tuple]):
+        """Log the inverse of a call that changed one task."""
+        self._undo.append((next(self._calls), op, task_id, fields, values))
+
+    def record_many(self, op: str, entries: List[Entry]):
+        """Log the inverses of a call that changed several tasks."""
+        if len(entries) > self.limit:
+            self.clear()
+        elif entries:
+            self._push(op, entries)
+
+    def _push(self, op: str, entries: List[Entry]):
+        call = next(self._calls)
+        (task_id, fields, values), rest = entries[0], entries[1:]
+        self._undo.append((call, op, task_id, fields, values))
+        self._undo.extend([(-call, op, task_id, fields, values) for task_id, fields, values in rest])
+
+    def _newest_call(self) -> int:
+        return abs(self._undo[-1][0]) if self._undo else 0
+
+    def _pop_call(self) -> Optional[Group]:
+        """Remove and return the newest call's entries, newest first."""
+        undo = self._undo
+        while undo:
+            call, op = undo[-1][:2]
+            call = abs(call)
+            entries = []
+            while undo and abs(undo[-1][0]) == call:
+                first, _, task_id, fields, values = undo.pop()
+                entries.append((task_id, fields, values))
+            if first > 0:
+                return op, entries
+            # The call's first entries were evicted; it can no longer be undone
+        return None
+
+    def undo(self, revert: Callable[[Entry], Entry]) -> Optional[Group]:
+        """Revert the newest call; return it, or None if there is nothing to undo."""
+        if self._redo and self._newest_call() != self._redo_base:
+            self._redo.clear()
+        group = self._pop_call()
+        if group is None:
+            return None
+        op, entries = group
+        self._redo.append((op, [revert(entry) for entry in entries]))
+        self._redo_base = self._newest_call()
+        return group
+
+    def redo(self, revert: Callable[[Entry], Entry]) -> Optional[Group]:
+        """Reapply the most recently undone call; return it, or None."""
+        if not self._redo or self._newest_call() != self._redo_base:
+            self._redo.clear()
+            return None
+        op, entries = self._redo.pop()
+        self._push(op, [revert(entry) for entry in reversed(entries)])
+        self._redo_base = self._newest_call()
+        return op, entries
+
+    def entries(self) -> Iterator[tuple]:
+        """Iterate logged (op, task_id, fields, values) entries, newest first."""
+        return (entry[1:] for entry in reversed(self._undo))
+
+    def clear(self):
+        """Forget all undo and redo history."""
+        self._undo.clear()
+        self._redo.clear()
+
+    def __len__(self) -> int:
+        return len(self._undo)
@@ -0,0 +1,168 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import FrozenSet, Iterable, Iterator, Optional
+from ..models.task import Task
+
+ALL_FIELDS = frozenset({"title", "description", "completed", "created_at", "updated_at",
+                        "due_at", "priority"})
+
+
+class SortedKeyList:
+    """
+    Sorted list of comparable keys split into bounded buckets.
+
+    Inserts and removals touch one bucket of at most 2 * LOAD keys instead
+    of shifting one large list, so they stay fast at millions of keys.
+    Range scans locate their start with two bisects and then walk buckets
+    in order, giving O(log n + k) range queries.
+    """
+
+    LOAD = 512
+
+    def __init__(self, iterable: Iterable = ()):
+        """Build the list from any iterable of keys."""
+        keys = sorted(iterable)
+        self._lists = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._lists]
+        self._length = len(keys)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, key) -> bool:
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            return False
+        bucket = self._lists[position]
+        index = bisect_left(bucket, key)
+        return index < len(bucket) and bucket[index] == key
+
+    def add(self, key):
+        """Insert a key."""
+        if not self._maxes:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._length = 1
+            return
+
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            position -= 1
+            self._lists[position].append(key)
+            self._maxes[position] = key
+        else:
+            insort(self._lists[position], key)
+
+        bucket = self._lists[position]
+        if len(bucket) > 2 * self.LOAD:
+            upper = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._maxes[position] = bucket[-1]
+            self._lists.insert(position + 1, upper)
+            self._maxes.insert(position + 1, upper[-1])
+        self._length += 1
+
+    def discard(self, key) -> bool:
+        """Remove a key if present; return whether it was found."""
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            return False
+        bucket = self._lists[position]
+        index = bisect_left(bucket, key)
+        if index == len(bucket) or bucket[index] != key:
+            return False
+
+        del bucket[index]
+        if not bucket:
+            del self._lists[position]
+            del self._maxes[position]
+        elif index == len(bucket):
+            self._maxes[position] = bucket[-1]
+        self._length -= 1
+        return True
+
+    def _locate(self, key, right: bool):
+        """Return the (bucket, index) bisect position of key."""
+        maxes = bisect_right(self._maxes, key) if right else bisect_left(self._maxes, key)
+        if maxes == len(self._maxes):
+            return len(self._lists), 0
+        bucket = self._lists[maxes]
+        return maxes, bisect_right(bucket, key) if right else bisect_left(bucket, key)
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True), reverse: bool = False) -> Iterator:
+        """
+        Iterate keys between minimum and maximum in sorted order.
+
+        A bound of None is open. `inclusive` says whether each bound is
+        itself included.
+        """
+        start = (0, 0) if minimum is None else self._locate(minimum, right=not inclusive[0])
+        end = (len(self._lists), 0) if maximum is None else self._locate(maximum, right=inclusive[1])
+        if start >= end:
+            return
+
+        buckets = range(start[0], min(end[0], len(self._lists) - 1) + 1)
+        for position in (reversed(buckets) if reverse else buckets):
+            bucket = self._lists[position]
+            low = start[1] if position == start[0] else 0
+            high = end[1] if position == end[0] else len(bucket)
+            keys = bucket[low:high]
+            yield from (reversed(keys) if reverse else keys)
+
+
+class TaskIndex:
+    """
+    Base class for indexes that TaskService keeps in step with the store.
+
+    `fields` names the task fields the index depends on. Before a mutation
+    touching any of them the service calls discard() with the old task
+    state, and afterwards add() with the new state; `changed` is the set
+    of fields being modified, or None when the whole task is inserted or
+    deleted.
+    """
+
+    fields: FrozenSet[str] = ALL_FIELDS
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        """Index a task's current state."""
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        """Remove a task's current state from the index."""
+
+
+class StatusTimeIndex(TaskIndex):
+    """
+    Secondary indexes over completion status and timestamps:
+    - pending / completed: sorted task IDs for each status
+    - created: sorted (created_at, id) keys
+    - updated: sorted (updated_at, id) keys
+    """
+
+    fields = frozenset({"completed", "created_at", "updated_at"})
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """Build the indexes from existing tasks in one sort per index."""
+        pending, completed, created, updated = [], [], [], []
+        for task in tasks:
+            (completed if task.completed else pending).append(task.id)
+            created.append((task.created_at, task.id))
+            updated.append((task.updated_at, task.id))
+        self.pending = SortedKeyList(pending)
+        self.completed = SortedKeyList(completed)
+        self.created = SortedKeyList(created)
+        self.updated = SortedKeyList(updated)
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        if changed is None or "completed" in changed:
+            (self.completed if task.completed else self.pending).add(task.id)
+        if changed is None or "created_at" in changed:
+            self.created.add((task.created_at, task.id))
+        if changed is None or "updated_at" in changed:
+            self.updated.add((task.updated_at, task.id))
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        if changed is None or "completed" in changed:
+            (self.completed if task.completed else self.pending).discard(task.id)
+        if changed is None or "created_at" in changed:
+            self.created.discard((task.created_at, task.id))
+        if changed is None or "updated_at" in changed:
+            self.updated.discard((task.updated_at, task.id))
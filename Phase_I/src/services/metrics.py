@@ -0,0 +1,159 @@
+import os
+import time
+from bisect import bisect_left
+from types import FunctionType
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Upper bounds, in seconds, of the latency histogram buckets; one more
+# bucket counts everything slower
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                   0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class OperationStats:
+    """Call count, error count and latency histogram of one operation."""
+
+    __slots__ = ("buckets", "total", "errors")
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.errors = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets)
+
+    def observe(self, seconds: float):
+        """Record one call that took `seconds`."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile latency in seconds, interpolating within
+        the bucket it falls in (as Prometheus' histogram_quantile does).
+        """
+        count = self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        lower = 0.0
+        for upper, in_bucket in zip(LATENCY_BUCKETS, self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                return lower + (upper - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+            lower = upper
+        return LATENCY_BUCKETS[-1]
+
+
+class Metrics:
+    """
+    Opt-in per-operation counters and latency histograms:
+    - instrument() times every public method of a task service
+    - instrument_command() times a console command handler
+    - to_prometheus() renders everything in the Prometheus text format
+
+    Instrumentation replaces the methods on the one instance it is given
+    with timing wrappers, so nothing is measured, and nothing costs
+    anything, unless metrics were asked for. Methods returning lazy
+    iterators are timed until the iterator is returned, not consumed.
+    """
+
+    def __init__(self):
+        """Create an empty registry."""
+        # (layer, operation) -> stats, in first-seen order
+        self.operations: Dict[Tuple[str, str], OperationStats] = {}
+
+    def stats(self, layer: str, operation: str) -> OperationStats:
+        """Return the stats of an operation, creating them on first use."""
+        key = (layer, operation)
+        stats = self.operations.get(key)
+        if stats is None:
+            stats = self.operations[key] = OperationStats()
+        return stats
+
+    def timed(self, layer: str, operation: str, function: Callable) -> Callable:
+        """Wrap `function` so each call is counted and timed."""
+        stats = self.stats(layer, operation)
+        # The wrapper runs on every call, so it inlines observe() and
+        # keeps everything it touches in closure variables
+        buckets = stats.buckets
+        clock = time.perf_counter
+
+        def timed_call(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                stats.errors += 1
+                raise
+            finally:
+                elapsed = clock() - start
+                buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+                stats.total += elapsed
+
+        timed_call.__wrapped__ = function
+        timed_call.__doc__ = function.__doc__
+        return timed_call
+
+    def instrument(self, service, layer: str = "service"):
+        """Time every public method of `service`; return the service."""
+        cls = type(service)
+        for name in dir(cls):
+            if not name.startswith("_") and isinstance(getattr(cls, name), FunctionType):
+                setattr(service, name, self.timed(layer, name, getattr(service, name)))
+        return service
+
+    def instrument_command(self, name: str, handler: Callable) -> Callable:
+        """Return a console command handler that is counted and timed."""
+        return self.timed("command", name, handler)
+
+    def reset(self):
+        """Zero every counter, keeping the instrumentation in place."""
+        for stats in self.operations.values():
+            stats.__init__()
+
+    def __iter__(self) -> Iterator[Tuple[str, str, OperationStats]]:
+        """Iterate (layer, operation, stats) for operations called at least once."""
+        for (layer, operation), stats in self.operations.items():
+            if stats.count:
+                yield layer, operation, stats
+
+    # Export
+
+    def to_prometheus(self) -> str:
+        """Render the counters and histograms in the Prometheus text format."""
+        lines = [
+            "# HELP todo_operation_seconds Latency of task service calls and console commands.",
+            "# TYPE todo_operation_seconds histogram",
+        ]
+        errors = [
+            "# HELP todo_operation_errors_total Calls that raised an exception.",
+            "# TYPE todo_operation_errors_total counter",
+        ]
+        for layer, operation, stats in self:
+            labels = f'layer="{layer}",operation="{operation}"'
+            count = stats.count
+            cumulative = 0
+            for bound, in_bucket in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += in_bucket
+                lines.append(f'todo_operation_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'todo_operation_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"todo_operation_seconds_sum{{{labels}}} {stats.total!r}")
+            lines.append(f"todo_operation_seconds_count{{{labels}}} {count}")
+            errors.append(f"todo_operation_errors_total{{{labels}}} {stats.errors}")
+        return "\n".join(lines + errors) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Write the Prometheus text export to `path`, replacing it atomically
+        so a scraper (e.g. node_exporter's textfile collector) never reads
+        a partial file.
+        """
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary_path, path)
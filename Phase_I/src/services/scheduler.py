@@ -0,0 +1,224 @@
+import sys
+import threading
+from datetime import datetime
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ..models.task import Task
+from .indexes import TaskIndex
+
+ORDERS = ("priority", "due")
+# Sort key for open tasks without a due date: after every dated task
+NO_DUE_KEY = datetime.max
+# A heap is rebuilt without stale entries once they outnumber live ones
+# by this many
+COMPACT_SLACK = 1024
+
+# (task ID, due date) for each task a reminder fires for
+Reminder = Tuple[int, datetime]
+
+
+class TaskScheduler(TaskIndex):
+    """
+    Priority queues over open (not completed) tasks:
+    - by due date: (due_at, id) for open tasks with a due date
+    - by priority: (-priority, due_at, id) for every open task
+    - alarms: (due_at, id) for due dates not yet reminded of
+
+    The heaps use lazy deletion: a change pushes a fresh entry and bumps
+    the task's sequence number, and entries with an old number are
+    dropped when they reach the top. A heap is rebuilt once most of it
+    is stale. Each change costs O(log n), and reading the first k tasks
+    costs O(k log n).
+
+    State is guarded by one condition variable, so a ReminderLoop thread
+    can sleep until the earliest alarm and be woken when an earlier one
+    is added.
+    """
+
+    fields = frozenset({"completed", "due_at", "priority"})
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """Queue the open tasks among `tasks`."""
+        self.condition = threading.Condition()
+        self._sequence = 0
+        # Task ID -> sequence number of its live heap entries
+        self._live: Dict[int, int] = {}
+        # Task ID -> due date of open tasks that have one
+        self._due: Dict[int, datetime] = {}
+        # Task ID -> due date a reminder already fired for
+        self._reminded: Dict[int, datetime] = {}
+        self._by_due: List[tuple] = []
+        self._by_priority: List[tuple] = []
+        self._alarms: List[tuple] = []
+        for task in tasks:
+            if not task.completed:
+                self._push(task, heap=False)
+        heapify(self._by_due)
+        heapify(self._by_priority)
+        heapify(self._alarms)
+
+    def _push(self, task: Task, heap: bool = True):
+        """Record an open task's current due date and priority."""
+        push = heappush if heap else list.append
+        self._sequence += 1
+        sequence = self._live[task.id] = self._sequence
+        due = task.due_at
+        push(self._by_priority, (-task.priority, NO_DUE_KEY if due is None else due, task.id, sequence))
+        if due is None:
+            self._due.pop(task.id, None)
+            return
+        push(self._by_due, (due, task.id, sequence))
+        if self._due.get(task.id) != due:
+            self._due[task.id] = due
+            alarm = (due, task.id)
+            push(self._alarms, alarm)
+            if heap and self._alarms[0] == alarm:
+                self.condition.notify_all()
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        if task.completed:
+            return
+        with self.condition:
+            self._push(task)
+            if len(self._by_priority) > 2 * len(self._live) + COMPACT_SLACK:
+                self._compact()
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        if task.completed:
+            return
+        with self.condition:
+            self._live.pop(task.id, None)
+            if changed is None or "completed" in changed:
+                # Closed or deleted: reopening it arms its reminder again
+                self._due.pop(task.id, None)
+                self._reminded.pop(task.id, None)
+
+    def _compact(self):
+        live = self._live
+        self._by_due = [entry for entry in self._by_due if live.get(entry[1]) == entry[2]]
+        self._by_priority = [entry for entry in self._by_priority if live.get(entry[2]) == entry[3]]
+        self._alarms = [entry for entry in self._alarms if self._armed(entry)]
+        heapify(self._by_due)
+        heapify(self._by_priority)
+        heapify(self._alarms)
+
+    def _armed(self, alarm: tuple) -> bool:
+        due, task_id = alarm
+        return (task_id in self._live and self._due.get(task_id) == due
+                and self._reminded.get(task_id) != due)
+
+    # Reading
+
+    @staticmethod
+    def _take(heap: List[tuple], valid: Callable[[tuple], bool], limit: Optional[int],
+              before: Optional[tuple] = None) -> List[tuple]:
+        """Pop up to `limit` valid entries (below `before`), drop stale ones, and push the valid back."""
+        taken = []
+        while heap and (limit is None or len(taken) < limit) and (before is None or heap[0] < before):
+            entry = heappop(heap)
+            if valid(entry):
+                taken.append(entry)
+        for entry in taken:
+            heappush(heap, entry)
+        return taken
+
+    def first(self, limit: int = 20, by: str = "priority") -> List[int]:
+        """
+        Return the IDs of the first `limit` open tasks.
+
+        By priority: highest first, then earliest due date, then ID. By
+        due: earliest due date first; tasks without one are left out.
+        """
+        if by not in ORDERS:
+            raise ValueError(f"by must be one of {', '.join(ORDERS)}")
+        live = self._live
+        with self.condition:
+            if by == "priority":
+                taken = self._take(self._by_priority, lambda entry: live.get(entry[2]) == entry[3], limit)
+                return [entry[2] for entry in taken]
+            taken = self._take(self._by_due, lambda entry: live.get(entry[1]) == entry[2], limit)
+            return [entry[1] for entry in taken]
+
+    def due_before(self, moment: datetime) -> List[int]:
+        """Return the IDs of open tasks due before `moment`, earliest first."""
+        live = self._live
+        with self.condition:
+            taken = self._take(self._by_due, lambda entry: live.get(entry[1]) == entry[2], None, (moment,))
+            return [entry[1] for entry in taken]
+
+    # Reminders
+
+    def next_alarm(self) -> Optional[datetime]:
+        """Return the earliest due date not yet reminded of, or None."""
+        with self.condition:
+            alarms = self._alarms
+            while alarms and not self._armed(alarms[0]):
+                heappop(alarms)
+            return alarms[0][0] if alarms else None
+
+    def pop_alarms(self, now: datetime) -> List[Reminder]:
+        """Mark every due date up to `now` as reminded of and return them, earliest first."""
+        fired = []
+        with self.condition:
+            alarms = self._alarms
+            while alarms and alarms[0][0] <= now:
+                alarm = heappop(alarms)
+                if self._armed(alarm):
+                    due, task_id = alarm
+                    self._reminded[task_id] = due
+                    fired.append((task_id, due))
+        return fired
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+
+class ReminderLoop:
+    """
+    Background thread that calls `callback(reminders)` as open tasks fall
+    due, with a list of (task ID, due date) pairs, earliest first.
+
+    The thread sleeps until the scheduler's earliest alarm and is woken
+    early when an earlier one is added, so it does no work between due
+    dates however many tasks are pending. Each due date is reminded of
+    once; tasks already overdue when the loop starts fire straight away.
+    The callback runs on the loop's thread.
+    """
+
+    # Upper bound on one sleep, so a changed system clock is noticed
+    MAX_WAIT = 60.0
+
+    def __init__(self, scheduler: TaskScheduler, callback: Callable[[List[Reminder]], object]):
+        """Start reminding."""
+        self.scheduler = scheduler
+        self.callback = callback
+        self.fired = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="task-reminders", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        scheduler = self.scheduler
+        while True:
+            with scheduler.condition:
+                if self._stopped:
+                    return
+                wake = scheduler.next_alarm()
+                now = datetime.now()
+                if wake is None or wake > now:
+                    timeout = self.MAX_WAIT if wake is None else min((wake - now).total_seconds(), self.MAX_WAIT)
+                    scheduler.condition.wait(timeout)
+                    continue
+                reminders = scheduler.pop_alarms(now)
+            self.fired += len(reminders)
+            try:
+                self.callback(reminders)
+            except Exception as error:
+                print(f"Reminder callback {self.callback!r} failed: {error}", file=sys.stderr)
+
+    def stop(self):
+        """Stop the thread and wait for it to finish."""
+        with self.scheduler.condition:
+            self._stopped = True
+            self.scheduler.condition.notify_all()
+        self._thread.join()
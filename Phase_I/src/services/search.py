@@ -0,0 +1,135 @@
+import re
+from heapq import nlargest
+from math import log
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ..models.task import Task
+from .indexes import SortedKeyList, TaskIndex
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# A title match counts for more than a description match
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+# Score multiplier for a token that only matches a query term as a prefix
+PREFIX_WEIGHT = 0.5
+# Largest code point, used to bound prefix range scans
+MAX_CHAR = "\U0010ffff"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class InvertedIndex(TaskIndex):
+    """
+    Full-text index over task titles and descriptions:
+    - postings: token -> {task id: weight}
+    - vocabulary: sorted tokens, for prefix matching by range scan
+
+    A task's weight for a token is the number of times it appears, with
+    title hits counting double. Tokens are recomputed from the old task
+    state on discard, so no per-task token list is stored.
+    """
+
+    fields = frozenset({"title", "description"})
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """Build the index from existing tasks."""
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.documents = 0
+        for task in tasks:
+            for token, weight in self._weights(task).items():
+                self.postings.setdefault(token, {})[task.id] = weight
+            self.documents += 1
+        self.vocabulary = SortedKeyList(self.postings)
+
+    @staticmethod
+    def _weights(task: Task) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for token in tokenize(task.title):
+            weights[token] = weights.get(token, 0.0) + TITLE_WEIGHT
+        for token in tokenize(task.description):
+            weights[token] = weights.get(token, 0.0) + DESCRIPTION_WEIGHT
+        return weights
+
+    def add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        for token, weight in self._weights(task).items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                self.vocabulary.add(token)
+            postings[task.id] = weight
+        if changed is None:
+            self.documents += 1
+
+    def discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        for token in self._weights(task):
+            postings = self.postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(task.id, None)
+            if not postings:
+                del self.postings[token]
+                self.vocabulary.discard(token)
+        if changed is None:
+            self.documents -= 1
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Return (token, score factor) for every token matching a query term."""
+        expansions = []
+        for token in self.vocabulary.irange(term, term + MAX_CHAR):
+            idf = log(1 + self.documents / len(self.postings[token]))
+            expansions.append((token, idf if token == term else idf * PREFIX_WEIGHT))
+        return expansions
+
+    def _term_scores(self, expansions: List[Tuple[str, float]]) -> Dict[int, float]:
+        """Score every task matching one expanded query term."""
+        scores: Dict[int, float] = {}
+        for token, factor in expansions:
+            for task_id, weight in self.postings[token].items():
+                score = weight * factor
+                if score > scores.get(task_id, 0.0):
+                    scores[task_id] = score
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[int, float]]:
+        """
+        Return (task id, score) pairs for tasks matching every query term.
+
+        Each term matches tokens it equals or is a prefix of. Results are
+        ordered by descending score, then ascending ID.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        # Start from the term with the fewest postings, then narrow the
+        # candidates by probing the other terms' postings for each of them
+        expanded = sorted(
+            ((sum(len(self.postings[token]) for token, _ in expansions), expansions)
+             for expansions in map(self._expand, terms)),
+            key=lambda item: item[0])
+        totals = self._term_scores(expanded[0][1])
+        for size, expansions in expanded[1:]:
+            if not totals:
+                break
+            if len(totals) * len(expansions) >= size:
+                scores = self._term_scores(expansions)
+                totals = {task_id: total + scores[task_id]
+                          for task_id, total in totals.items() if task_id in scores}
+                continue
+            narrowed = {}
+            for task_id, total in totals.items():
+                best = 0.0
+                for token, factor in expansions:
+                    weight = self.postings[token].get(task_id)
+                    if weight is not None and weight * factor > best:
+                        best = weight * factor
+                if best:
+                    narrowed[task_id] = total + best
+            totals = narrowed
+
+        ranking = ((score, -task_id) for task_id, score in totals.items())
+        best = nlargest(limit, ranking) if limit is not None else sorted(ranking, reverse=True)
+        return [(-negative_id, score) for score, negative_id in best]
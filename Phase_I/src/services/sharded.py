@@ -0,0 +1,438 @@
+import multiprocessing
+import os
+from datetime import datetime, timedelta
+from heapq import merge
+from itertools import islice
+from operator import attrgetter
+from collections.abc import Iterator as AnyIterator
+from typing import Iterable, Iterator, List, Optional, Tuple
+from ..models.task import Task
+from .aggregates import TaskSummary
+from .dedupe import DuplicateTaskError, IdempotencyKeys
+from .scheduler import NO_DUE_KEY, ORDERS
+from .task_service import ORDER_FIELDS
+
+SHARD_ENGINES = ("memory", "columnar", "mapped")
+
+
+def _create_shard_service(engine: str, directory: Optional[str], sync: str):
+    """Build the TaskService a shard process runs."""
+    from ..storage.columnar import ColumnarTaskStore
+    from ..storage.journal import JournalPersistence
+    from ..storage.mapped import MappedTaskStore
+    from .task_service import TaskService
+
+    store = None
+    if engine == "columnar":
+        store = ColumnarTaskStore()
+    elif engine == "mapped":
+        store = MappedTaskStore()
+    snapshot_format = "binary" if engine == "mapped" else "json"
+    persistence = JournalPersistence(directory, sync=sync, snapshot_format=snapshot_format) if directory else None
+    return TaskService(store, persistence)
+
+
+def _add_with_ids(service, items: List[Tuple[int, str, Optional[str]]], now: datetime) -> int:
+    """Store (id, title, description) items under the IDs the parent allocated."""
+    tasks = [Task(id=task_id, title=title, description=description,
+                  created_at=now, updated_at=now)
+             for task_id, title, description in items]
+    service.import_many(tasks, keep_ids=True)
+    return len(tasks)
+
+
+def _scored_search(service, query: str, limit: Optional[int]):
+    """Search one shard, keeping scores so the parent can merge by relevance."""
+    store = service.store
+    return [(score, store.get(task_id)) for task_id, score in service.search_index.search(query, limit)]
+
+
+def _content_keys(service) -> List[Tuple[bytes, List[int]]]:
+    """Every (content key, IDs) pair of one shard, so the parent can group across shards."""
+    return list(service.content_index.items())
+
+
+def _priority_order(task: Task) -> tuple:
+    """Merge key for next_tasks(by="priority"), matching TaskScheduler's heap order."""
+    return -task.priority, NO_DUE_KEY if task.due_at is None else task.due_at, task.id
+
+
+# Calls a shard understands besides the public TaskService methods
+SHARD_CALLS = {
+    "next_id": lambda service: service.next_id,
+    "add_with_ids": _add_with_ids,
+    "scored_search": _scored_search,
+    "content_keys": _content_keys,
+    "get_many": lambda service, task_ids: [service.get_task_by_id(task_id) for task_id in task_ids],
+}
+
+
+def _shard_main(connection, engine: str, directory: Optional[str], sync: str):
+    """Shard process loop: run each (name, args, kwargs) request and reply."""
+    service = _create_shard_service(engine, directory, sync)
+    try:
+        while True:
+            name, args, kwargs = connection.recv()
+            if name == "close":
+                break
+            try:
+                call = SHARD_CALLS.get(name)
+                if call is not None:
+                    result = call(service, *args, **kwargs)
+                else:
+                    result = getattr(service, name)(*args, **kwargs)
+                if isinstance(result, AnyIterator):
+                    result = list(result)
+                connection.send((True, result))
+            except Exception as error:
+                connection.send((False, error))
+    finally:
+        service.close()
+        connection.send((True, None))
+        connection.close()
+
+
+class ShardedTaskService:
+    """
+    TaskService partitioned by ID across worker processes:
+    - Each shard process runs its own TaskService (memory or columnar store)
+    - The parent allocates IDs, so they stay globally unique and increasing
+    - Point operations go to the owning shard only
+    - Listings, queries and search fan out and merge the shards' ordered results
+
+    Task N lives on shard (N - 1) % shards. Requests that touch several
+    shards are sent to all of them before any reply is read, so the
+    shards work in parallel. With a data directory each shard journals
+    to its own shard-K subdirectory; reopen it with the same number of
+    shards.
+
+    Search relevance is computed per shard, so word rarity is judged
+    within each shard rather than across all tasks.
+
+    The service is meant to be driven from one thread; the API server
+    serialises requests to it.
+    """
+
+    def __init__(self, shards: int = 4, engine: str = "memory",
+                 data_dir: Optional[str] = None, sync: str = "batch"):
+        """Start `shards` worker processes and recover the next ID from them."""
+        if shards < 1:
+            raise ValueError("At least one shard is required")
+        if engine not in SHARD_ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(SHARD_ENGINES)}")
+
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        for shard in range(shards):
+            directory = os.path.join(data_dir, f"shard-{shard}") if data_dir else None
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_shard_main, name=f"task-shard-{shard}",
+                                      args=(child_end, engine, directory, sync), daemon=True)
+            process.start()
+            child_end.close()
+            self.connections.append(parent_end)
+            self.processes.append(process)
+
+        self.next_id = max(self._broadcast("next_id"))
+        self.idempotency_keys = IdempotencyKeys()
+
+    # Shard messaging
+
+    @property
+    def shards(self) -> int:
+        return len(self.connections)
+
+    def _shard_of(self, task_id: int) -> int:
+        return (task_id - 1) % len(self.connections)
+
+    def _receive(self, shard: int):
+        ok, result = self.connections[shard].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call(self, shard: int, name: str, *args, **kwargs):
+        """Run one request on one shard and return its result."""
+        self.connections[shard].send((name, args, kwargs))
+        return self._receive(shard)
+
+    def _scatter(self, requests) -> List:
+        """
+        Send (shard, name, args, kwargs) requests, then gather the replies.
+
+        Every reply is read before an error is raised, so the pipes stay
+        in step with the shards.
+        """
+        requests = list(requests)
+        for shard, name, args, kwargs in requests:
+            self.connections[shard].send((name, args, kwargs))
+        results, failure = [], None
+        for shard, *_ in requests:
+            try:
+                results.append(self._receive(shard))
+            except Exception as error:
+                failure = failure or error
+                results.append(None)
+        if failure is not None:
+            raise failure
+        return results
+
+    def _broadcast(self, name: str, *args, **kwargs) -> List:
+        """Run the same request on every shard."""
+        return self._scatter((shard, name, args, kwargs) for shard in range(self.shards))
+
+    # Operations
+
+    def add_task(self, title: str, description: Optional[str] = None,
+                 due_at: Optional[datetime] = None, priority: int = 0,
+                 key: Optional[str] = None, unique: bool = False) -> Task:
+        """
+        Add a new task on the shard that owns the next ID.
+
+        Idempotency keys are remembered by the parent; `unique` asks every
+        shard for a duplicate first. See TaskService.add_task.
+        """
+        if key is not None:
+            task_id = self.idempotency_keys.get(key)
+            if task_id is not None:
+                task = self.get_task_by_id(task_id)
+                if task is not None:
+                    return task
+        if unique:
+            existing = self.find_duplicates(title, description)
+            if existing:
+                raise DuplicateTaskError(existing[0])
+
+        task = Task(id=self.next_id, title=title, description=description, due_at=due_at, priority=priority)
+        self._call(self._shard_of(task.id), "import_many", [task], keep_ids=True)
+        self.next_id += 1
+        if key is not None:
+            self.idempotency_keys.put(key, task.id)
+        return task
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> List[Task]:
+        """
+        Add (title, description) pairs, spread over the shards in parallel.
+
+        Every title is validated before anything is sent, so either all
+        tasks are added or none are, and they share one creation timestamp.
+        """
+        items = list(items)
+        for position, (title, _) in enumerate(items):
+            if not (1 <= len(title) <= 200):
+                raise ValueError(f"Item {position + 1}: Title must be between 1 and 200 characters")
+
+        now = datetime.now()
+        first_id = self.next_id
+        per_shard = [[] for _ in range(self.shards)]
+        for offset, (title, description) in enumerate(items):
+            task_id = first_id + offset
+            per_shard[self._shard_of(task_id)].append((task_id, title, description))
+        self._scatter((shard, "add_with_ids", (chunk, now), {})
+                      for shard, chunk in enumerate(per_shard) if chunk)
+        self.next_id += len(items)
+        return [Task(id=first_id + offset, title=title, description=description,
+                     created_at=now, updated_at=now)
+                for offset, (title, description) in enumerate(items)]
+
+    def import_many(self, tasks: Iterable[Task]) -> List[Task]:
+        """Store fully built tasks under new IDs, spread over the shards."""
+        tasks = list(tasks)
+        for task in tasks:
+            task.validate_title()
+
+        per_shard = [[] for _ in range(self.shards)]
+        for offset, task in enumerate(tasks):
+            task.id = self.next_id + offset
+            per_shard[self._shard_of(task.id)].append(task)
+        self._scatter((shard, "import_many", (chunk,), {"keep_ids": True})
+                      for shard, chunk in enumerate(per_shard) if chunk)
+        self.next_id += len(tasks)
+        return tasks
+
+    def import_tasks(self, path: str, format: Optional[str] = None, chunk_size: int = 5000):
+        """Import tasks from a CSV or JSON Lines file in bounded chunks."""
+        from . import transfer
+        return transfer.import_tasks(self, path, format, chunk_size)
+
+    def export_tasks(self, path: str, format: Optional[str] = None) -> int:
+        """Export all tasks to a CSV or JSON Lines file; return the count."""
+        from . import transfer
+        return transfer.export_tasks(self, path, format)
+
+    def get_all_tasks(self) -> List[Task]:
+        """Get all tasks from every shard, in creation order."""
+        return list(merge(*self._broadcast("get_all_tasks"), key=lambda task: task.id))
+
+    def iter_tasks(self, after_id: int = 0, limit: Optional[int] = None, offset: int = 0) -> Iterator[Task]:
+        """Iterate tasks after a cursor in creation order; see TaskService.iter_tasks."""
+        stop = None if limit is None else offset + limit
+        pages = self._broadcast("iter_tasks", after_id, stop)
+        return islice(merge(*pages, key=lambda task: task.id), offset, stop)
+
+    def query(self, completed: Optional[bool] = None,
+              created_since: Optional[datetime] = None, created_until: Optional[datetime] = None,
+              updated_since: Optional[datetime] = None, updated_until: Optional[datetime] = None,
+              order_by: str = "id", descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> List[Task]:
+        """
+        Find tasks by status and timestamp ranges; see TaskService.query.
+
+        Each shard returns its first offset + limit matches in result
+        order and the parent merges them, so a limited query moves at most
+        shards * (offset + limit) tasks between processes.
+        """
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"order_by must be one of {', '.join(ORDER_FIELDS)}")
+
+        stop = None if limit is None else offset + limit
+        pages = self._broadcast("query", completed=completed,
+                                created_since=created_since, created_until=created_until,
+                                updated_since=updated_since, updated_until=updated_until,
+                                order_by=order_by, descending=descending, limit=stop)
+        key = attrgetter("id") if order_by == "id" else attrgetter(order_by, "id")
+        return list(islice(merge(*pages, key=key, reverse=descending), offset, stop))
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Task]:
+        """Find tasks containing every query word, best matches first across all shards."""
+        hits = [hit for page in self._broadcast("scored_search", query, limit) for hit in page]
+        hits.sort(key=lambda hit: (-hit[0], hit[1].id))
+        return [task for _, task in hits[:limit]]
+
+    def next_tasks(self, limit: int = 20, by: str = "priority") -> List[Task]:
+        """Return the first open tasks to work on across all shards; see TaskService.next_tasks."""
+        if by not in ORDERS:
+            raise ValueError(f"by must be one of {', '.join(ORDERS)}")
+        pages = self._broadcast("next_tasks", limit, by)
+        key = _priority_order if by == "priority" else attrgetter("due_at", "id")
+        return list(islice(merge(*pages, key=key), limit))
+
+    def due_tasks(self, within: timedelta, now: Optional[datetime] = None) -> List[Task]:
+        """Return open tasks due within `within` from now on any shard, earliest first."""
+        pages = self._broadcast("due_tasks", within, now or datetime.now())
+        return list(merge(*pages, key=attrgetter("due_at", "id")))
+
+    def summary(self):
+        """Return task counts and per-day histograms summed over the shards; see TaskService.summary."""
+        return sum(self._broadcast("summary"), TaskSummary())
+
+    def find_duplicates(self, title: str, description: Optional[str] = None) -> List[Task]:
+        """Return tasks with this normalised content from every shard, oldest first."""
+        return list(merge(*self._broadcast("find_duplicates", title, description), key=lambda task: task.id))
+
+    def duplicate_groups(self) -> List[List[Task]]:
+        """
+        Return each set of tasks sharing a normalised title and
+        description across all shards, oldest task first.
+
+        Copies may sit on different shards, so every shard sends its
+        content keys (16 bytes per distinct content) and the parent
+        groups them; only the duplicated tasks themselves are fetched.
+        """
+        ids = {}
+        for page in self._broadcast("content_keys"):
+            for key, task_ids in page:
+                ids.setdefault(key, []).extend(task_ids)
+        groups = sorted(sorted(task_ids) for task_ids in ids.values() if len(task_ids) > 1)
+        wanted = [task_id for group in groups for task_id in group]
+        tasks = iter(self._route_many("get_many", wanted, wanted))
+        return [[next(tasks) for _ in group] for group in groups]
+
+    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        """Get a task by its ID from its shard."""
+        if task_id < 1:
+            return None
+        return self._call(self._shard_of(task_id), "get_task_by_id", task_id)
+
+    def update_task(self, task_id: int, title: str = None, description: str = None,
+                    due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                    clear_due: bool = False) -> Optional[Task]:
+        """Update an existing task, and optionally its schedule, on its shard."""
+        if task_id < 1:
+            return None
+        return self._call(self._shard_of(task_id), "update_task", task_id, title, description,
+                          due_at, priority, clear_due)
+
+    def schedule_task(self, task_id: int, due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                      clear_due: bool = False) -> Optional[Task]:
+        """Set a task's due date and/or priority on its shard."""
+        if task_id < 1:
+            return None
+        return self._call(self._shard_of(task_id), "schedule_task", task_id, due_at, priority, clear_due)
+
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task from its shard."""
+        if task_id < 1:
+            return False
+        return self._call(self._shard_of(task_id), "delete_task", task_id)
+
+    def mark_task_complete(self, task_id: int) -> Optional[Task]:
+        """Mark a task as complete on its shard."""
+        if task_id < 1:
+            return None
+        return self._call(self._shard_of(task_id), "mark_task_complete", task_id)
+
+    def mark_task_incomplete(self, task_id: int) -> Optional[Task]:
+        """Mark a task as incomplete on its shard."""
+        if task_id < 1:
+            return None
+        return self._call(self._shard_of(task_id), "mark_task_incomplete", task_id)
+
+    # Bulk operations: one request per shard, all shards working in parallel
+
+    def _route_many(self, name: str, items: List, task_ids: List[int]) -> List:
+        """Send each shard its share of items and put the replies back in input order."""
+        positions = [[] for _ in range(self.shards)]
+        chunks = [[] for _ in range(self.shards)]
+        for position, (item, task_id) in enumerate(zip(items, task_ids)):
+            shard = self._shard_of(task_id) if task_id >= 1 else 0
+            positions[shard].append(position)
+            chunks[shard].append(item)
+        shards = [shard for shard in range(self.shards) if chunks[shard]]
+        replies = self._scatter((shard, name, (chunks[shard],), {}) for shard in shards)
+        results = [None] * len(items)
+        for shard, reply in zip(shards, replies):
+            for position, result in zip(positions[shard], reply):
+                results[position] = result
+        return results
+
+    def update_many(self, updates: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> List[Optional[Task]]:
+        """
+        Apply (task_id, title, description) updates; see TaskService.update_many.
+
+        Titles are validated before anything is sent, so an invalid one
+        leaves every shard untouched. Each shard stamps its share with one
+        timestamp of its own.
+        """
+        updates = list(updates)
+        for position, (_, title, _) in enumerate(updates):
+            if title is not None and not (1 <= len(title) <= 200):
+                raise ValueError(f"Item {position + 1}: Title must be between 1 and 200 characters")
+        return self._route_many("update_many", updates, [task_id for task_id, _, _ in updates])
+
+    def delete_many(self, task_ids: Iterable[int]) -> List[bool]:
+        """Delete tasks by ID; return whether each one existed."""
+        task_ids = list(task_ids)
+        return self._route_many("delete_many", task_ids, task_ids)
+
+    def complete_many(self, task_ids: Iterable[int]) -> List[Optional[Task]]:
+        """Mark tasks as complete; return each task, or None where the ID does not exist."""
+        task_ids = list(task_ids)
+        return self._route_many("complete_many", task_ids, task_ids)
+
+    def incomplete_many(self, task_ids: Iterable[int]) -> List[Optional[Task]]:
+        """Mark tasks as incomplete; return each task, or None where the ID does not exist."""
+        task_ids = list(task_ids)
+        return self._route_many("incomplete_many", task_ids, task_ids)
+
+    def close(self):
+        """Close every shard's service and stop the worker processes."""
+        if not self.connections:
+            return
+        self._broadcast("close")
+        for connection in self.connections:
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections, self.processes = [], []
@@ -0,0 +1,521 @@
+import sqlite3
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..models.task import Task
+from ..storage.columnar import from_micros, to_micros
+from .aggregates import TaskSummary
+from .dedupe import DuplicateTaskError, IdempotencyKeys, content_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    due_at INTEGER,
+    priority INTEGER NOT NULL DEFAULT 0,
+    content_key BLOB
+);
+CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (completed, id);
+CREATE INDEX IF NOT EXISTS tasks_created ON tasks (created_at, id);
+CREATE INDEX IF NOT EXISTS tasks_updated ON tasks (updated_at, id);
+"""
+# Columns added after the first schema, with their definitions; databases
+# created before them are altered on open
+ADDED_COLUMNS = {"due_at": "INTEGER", "priority": "INTEGER NOT NULL DEFAULT 0", "content_key": "BLOB"}
+# Indexes over added columns, created once the columns exist
+ADDED_INDEXES = """
+CREATE INDEX IF NOT EXISTS tasks_due ON tasks (completed, due_at, id) WHERE due_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (completed, priority DESC, due_at IS NULL, due_at, id);
+CREATE INDEX IF NOT EXISTS tasks_content ON tasks (content_key, id);
+"""
+# Per-day counts behind summary(), kept in the same transaction as each
+# write: tasks created per day by created_at, and completed tasks per day
+# by updated_at (see TaskAggregates). Created for older databases from one
+# count of their tasks; timestamps are naive microseconds since the epoch,
+# so 'unixepoch' gives their own date.
+DAY_COUNTS = """
+CREATE TABLE task_days (
+    kind TEXT NOT NULL,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, day)
+) WITHOUT ROWID;
+INSERT INTO task_days SELECT 'created', date(created_at / 1000000, 'unixepoch'), COUNT(*) FROM tasks
+    GROUP BY 2;
+INSERT INTO task_days SELECT 'completed', date(updated_at / 1000000, 'unixepoch'), COUNT(*) FROM tasks
+    WHERE completed = 1 GROUP BY 2;
+"""
+
+# Statements are module constants so sqlite3's statement cache, which is
+# keyed by SQL text, compiles each of them once per connection.
+COLUMNS = "id, title, description, completed, created_at, updated_at, due_at, priority"
+INSERT_TASK = f"INSERT INTO tasks ({COLUMNS}, content_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+SELECT_TASK = f"SELECT {COLUMNS} FROM tasks WHERE id = ?"
+SELECT_ALL = f"SELECT {COLUMNS} FROM tasks ORDER BY id"
+SELECT_PAGE = f"SELECT {COLUMNS} FROM tasks WHERE id > ? ORDER BY id LIMIT ? OFFSET ?"
+UPDATE_TEXT = "UPDATE tasks SET title = ?, description = ?, updated_at = ?, content_key = ? WHERE id = ?"
+UPDATE_COMPLETED = "UPDATE tasks SET completed = ?, updated_at = ? WHERE id = ?"
+UPDATE_SCHEDULE = "UPDATE tasks SET due_at = ?, priority = ?, updated_at = ? WHERE id = ?"
+UPDATE_EDIT = ("UPDATE tasks SET title = ?, description = ?, due_at = ?, priority = ?, updated_at = ?, "
+               "content_key = ? WHERE id = ?")
+DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+# Open tasks without a due date sort after dated ones, as in TaskScheduler
+NEXT_BY_PRIORITY = (f"SELECT {COLUMNS} FROM tasks WHERE completed = 0 "
+                    "ORDER BY priority DESC, due_at IS NULL, due_at, id LIMIT ?")
+NEXT_BY_DUE = (f"SELECT {COLUMNS} FROM tasks WHERE completed = 0 AND due_at IS NOT NULL "
+               "ORDER BY due_at, id LIMIT ?")
+DUE_BEFORE = (f"SELECT {COLUMNS} FROM tasks WHERE completed = 0 AND due_at IS NOT NULL AND due_at < ? "
+              "ORDER BY due_at, id")
+# content_key is a digest of the normalised title and description (see dedupe.content_key)
+SELECT_BY_CONTENT = f"SELECT {COLUMNS} FROM tasks WHERE content_key = ? ORDER BY id"
+SELECT_DUPLICATES = (f"SELECT {COLUMNS}, content_key FROM tasks WHERE content_key IN "
+                     "(SELECT content_key FROM tasks GROUP BY content_key HAVING COUNT(*) > 1) "
+                     "ORDER BY content_key, id")
+SELECT_UNKEYED = "SELECT id, title, description FROM tasks WHERE content_key IS NULL"
+UPDATE_CONTENT_KEY = "UPDATE tasks SET content_key = ? WHERE id = ?"
+SELECT_SEQUENCE = "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+SELECT_DAY_COUNTS_TABLE = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_days'"
+# Days whose tasks were all deleted or reopened are left at zero
+SELECT_DAY_COUNTS = "SELECT kind, day, count FROM task_days WHERE count > 0 ORDER BY kind, day"
+BUMP_DAY_COUNT = "INSERT INTO task_days VALUES (?, ?, ?) ON CONFLICT DO UPDATE SET count = count + excluded.count"
+
+# IDs per "WHERE id IN (...)" lookup, below SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+class SqliteTaskService:
+    """
+    TaskService backed by SQLite:
+    - Same public API as the in-memory TaskService
+    - WAL journal mode with synchronous=NORMAL
+    - Primary key on id and an index on (completed, id)
+    - Bulk add/update/complete/delete methods that run in a single transaction
+
+    Each single-task call commits on its own; use the *_many methods for
+    large loads.
+    """
+
+    def __init__(self, path: str = "todo.db"):
+        """Open (or create) the SQLite database at `path`."""
+        self.path = path
+        # The connection may be used from an API worker thread; callers
+        # serialise access (see TaskAPIServer), so thread checks are off.
+        self.connection = sqlite3.connect(path, isolation_level=None, cached_statements=64,
+                                          check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        for column, definition in ADDED_COLUMNS.items():
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE tasks ADD COLUMN {column} {definition}")
+        unkeyed = [(content_key(title, description), task_id)
+                   for task_id, title, description in self.connection.execute(SELECT_UNKEYED)]
+        if unkeyed:
+            with self._transaction():
+                self.connection.executemany(UPDATE_CONTENT_KEY, unkeyed)
+        self.connection.executescript(ADDED_INDEXES)
+        if self.connection.execute(SELECT_DAY_COUNTS_TABLE).fetchone() is None:
+            # Count existing tasks once; every write keeps the counts from here on
+            self.connection.executescript(f"BEGIN; {DAY_COUNTS} COMMIT;")
+
+        row = self.connection.execute(SELECT_SEQUENCE).fetchone()
+        self.next_id = (row[0] if row else 0) + 1
+        self.idempotency_keys = IdempotencyKeys()
+
+    @staticmethod
+    def _to_task(row) -> Task:
+        return Task(
+            id=row[0],
+            title=row[1],
+            description=row[2],
+            completed=bool(row[3]),
+            created_at=from_micros(row[4]),
+            updated_at=from_micros(row[5]),
+            due_at=from_micros(row[6]) if row[6] is not None else None,
+            priority=row[7],
+        )
+
+    @staticmethod
+    def _to_row(task: Task) -> tuple:
+        return (task.id, task.title, task.description, int(task.completed),
+                to_micros(task.created_at), to_micros(task.updated_at),
+                to_micros(task.due_at) if task.due_at is not None else None, task.priority)
+
+    @classmethod
+    def _insert_row(cls, task: Task) -> tuple:
+        return cls._to_row(task) + (content_key(task.title, task.description),)
+
+    @staticmethod
+    def _days(tasks: Iterable[Task]) -> Counter:
+        """Count the tasks under each (kind, day) of task_days."""
+        days: Counter = Counter()
+        for task in tasks:
+            days["created", task.created_at.date()] += 1
+            if task.completed:
+                days["completed", task.updated_at.date()] += 1
+        return days
+
+    def _shift_days(self, before: Counter, after: Counter):
+        """Move task_days from counting `before` to counting `after`; call inside the write's transaction."""
+        after.subtract(before)
+        self.connection.executemany(BUMP_DAY_COUNT, ((kind, day.isoformat(), count)
+                                                     for (kind, day), count in after.items() if count))
+
+    def _new_task(self, title: str, description: Optional[str], now: datetime,
+                  due_at: Optional[datetime] = None, priority: int = 0) -> Task:
+        """Validate and build the next task without storing it."""
+        if not (1 <= len(title) <= 200):
+            raise ValueError("Title must be between 1 and 200 characters")
+        task = Task(id=self.next_id, title=title, description=description,
+                    created_at=now, updated_at=now, due_at=due_at, priority=priority)
+        task.validate_priority()
+        self.next_id += 1
+        return task
+
+    def add_task(self, title: str, description: Optional[str] = None,
+                 due_at: Optional[datetime] = None, priority: int = 0,
+                 key: Optional[str] = None, unique: bool = False) -> Task:
+        """Add a new task to the database; see TaskService.add_task for `key` and `unique`."""
+        if key is not None:
+            task_id = self.idempotency_keys.get(key)
+            if task_id is not None:
+                task = self.get_task_by_id(task_id)
+                if task is not None:
+                    return task
+        if unique:
+            existing = self.find_duplicates(title, description)
+            if existing:
+                raise DuplicateTaskError(existing[0])
+
+        task = self._new_task(title, description, datetime.now(), due_at, priority)
+        with self._transaction():
+            self.connection.execute(INSERT_TASK, self._insert_row(task))
+            self._shift_days(Counter(), self._days([task]))
+        if key is not None:
+            self.idempotency_keys.put(key, task.id)
+        return task
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> List[Task]:
+        """
+        Add (title, description) pairs in one transaction.
+
+        All titles are validated before anything is written, and every
+        task shares one creation timestamp.
+        """
+        items = list(items)
+        for title, _ in items:
+            if not (1 <= len(title) <= 200):
+                raise ValueError("Title must be between 1 and 200 characters")
+
+        now = datetime.now()
+        first_id = self.next_id
+        tasks = [self._new_task(title, description, now) for title, description in items]
+        try:
+            with self._transaction():
+                self.connection.executemany(INSERT_TASK, map(self._insert_row, tasks))
+                self._shift_days(Counter(), Counter({("created", now.date()): len(tasks)}))
+        except sqlite3.Error:
+            self.next_id = first_id
+            raise
+        return tasks
+
+    def import_many(self, tasks: Iterable[Task]) -> List[Task]:
+        """Store fully built tasks under new IDs in one transaction."""
+        tasks = list(tasks)
+        for task in tasks:
+            task.validate_title()
+            task.validate_priority()
+
+        first_id = self.next_id
+        for task in tasks:
+            task.id = self.next_id
+            self.next_id += 1
+        try:
+            with self._transaction():
+                self.connection.executemany(INSERT_TASK, map(self._insert_row, tasks))
+                self._shift_days(Counter(), self._days(tasks))
+        except sqlite3.Error:
+            self.next_id = first_id
+            raise
+        return tasks
+
+    def import_tasks(self, path: str, format: Optional[str] = None, chunk_size: int = 5000):
+        """Import tasks from a CSV or JSON Lines file in bounded chunks."""
+        from . import transfer
+        return transfer.import_tasks(self, path, format, chunk_size)
+
+    def export_tasks(self, path: str, format: Optional[str] = None) -> int:
+        """Export all tasks to a CSV or JSON Lines file; return the count."""
+        from . import transfer
+        return transfer.export_tasks(self, path, format)
+
+    def get_all_tasks(self) -> List[Task]:
+        """Get all tasks, in creation order."""
+        return [self._to_task(row) for row in self.connection.execute(SELECT_ALL)]
+
+    def iter_tasks(self, after_id: int = 0, limit: Optional[int] = None, offset: int = 0) -> Iterator[Task]:
+        """Iterate tasks with an ID greater than after_id, streaming from a cursor."""
+        cursor = self.connection.execute(SELECT_PAGE, (after_id, -1 if limit is None else limit, offset))
+        return map(self._to_task, cursor)
+
+    def query(self, completed: Optional[bool] = None,
+              created_since: Optional[datetime] = None, created_until: Optional[datetime] = None,
+              updated_since: Optional[datetime] = None, updated_until: Optional[datetime] = None,
+              order_by: str = "id", descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> List[Task]:
+        """Find tasks by completion status and timestamp ranges, using the table indexes."""
+        if order_by not in ("id", "created_at", "updated_at"):
+            raise ValueError("order_by must be one of id, created_at, updated_at")
+
+        conditions, parameters = [], []
+        for clause, value in (("completed = ?", None if completed is None else int(completed)),
+                              ("created_at >= ?", created_since), ("created_at < ?", created_until),
+                              ("updated_at >= ?", updated_since), ("updated_at < ?", updated_until)):
+            if value is not None:
+                conditions.append(clause)
+                parameters.append(to_micros(value) if isinstance(value, datetime) else value)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "DESC" if descending else "ASC"
+        sql = (f"SELECT {COLUMNS} FROM tasks{where} ORDER BY {order_by} {direction}, id {direction} "
+               f"LIMIT ? OFFSET ?")
+        parameters += [-1 if limit is None else limit, offset]
+        return [self._to_task(row) for row in self.connection.execute(sql, parameters)]
+
+    def summary(self) -> TaskSummary:
+        """
+        Return task counts and tasks created and completed per day.
+
+        Read from the per-day counts each write maintains in task_days,
+        so the cost grows with the number of days, not tasks; see
+        TaskService.summary for what is counted.
+        """
+        days: Dict[str, Dict[date, int]] = {"created": {}, "completed": {}}
+        for kind, day, count in self.connection.execute(SELECT_DAY_COUNTS):
+            days[kind][date.fromisoformat(day)] = count
+        created, finished = days["created"], days["completed"]
+        return TaskSummary(sum(created.values()), sum(finished.values()), created, finished)
+
+    def find_duplicates(self, title: str, description: Optional[str] = None) -> List[Task]:
+        """Return tasks whose normalised title and description match, oldest first, via the content index."""
+        rows = self.connection.execute(SELECT_BY_CONTENT, (content_key(title, description),))
+        return [self._to_task(row) for row in rows]
+
+    def duplicate_groups(self) -> List[List[Task]]:
+        """
+        Return each set of tasks sharing a normalised title and
+        description, oldest task first; see TaskService.duplicate_groups.
+        Shared keys are found by grouping the content index in SQL.
+        """
+        groups: Dict[bytes, List[Task]] = {}
+        for row in self.connection.execute(SELECT_DUPLICATES):
+            groups.setdefault(row[-1], []).append(self._to_task(row))
+        return sorted(groups.values(), key=lambda group: group[0].id)
+
+    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        """Get a task by its ID."""
+        row = self.connection.execute(SELECT_TASK, (task_id,)).fetchone()
+        return self._to_task(row) if row else None
+
+    def update_task(self, task_id: int, title: str = None, description: str = None,
+                    due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                    clear_due: bool = False) -> Optional[Task]:
+        """Update an existing task, and optionally its schedule, in one statement; see TaskService.update_task."""
+        task = self.get_task_by_id(task_id)
+        if task is None:
+            return None
+
+        before = self._days([task])
+        task.update(title, description)
+        key = content_key(task.title, task.description)
+        if not (due_at is not None or priority is not None or clear_due):
+            with self._transaction():
+                self.connection.execute(UPDATE_TEXT, (task.title, task.description, to_micros(task.updated_at),
+                                                      key, task_id))
+                self._shift_days(before, self._days([task]))
+            return task
+
+        if clear_due:
+            task.due_at = None
+        elif due_at is not None:
+            task.due_at = due_at
+        if priority is not None:
+            task.priority = priority
+            task.validate_priority()
+        with self._transaction():
+            self.connection.execute(UPDATE_EDIT, (task.title, task.description) + self._to_row(task)[6:]
+                                    + (to_micros(task.updated_at), key, task_id))
+            self._shift_days(before, self._days([task]))
+        return task
+
+    def schedule_task(self, task_id: int, due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                      clear_due: bool = False) -> Optional[Task]:
+        """Set a task's due date and/or priority; see TaskService.schedule_task."""
+        task = self.get_task_by_id(task_id)
+        if task is None:
+            return None
+
+        before = self._days([task])
+        if clear_due:
+            task.due_at = None
+        elif due_at is not None:
+            task.due_at = due_at
+        if priority is not None:
+            task.priority = priority
+            task.validate_priority()
+        task.updated_at = datetime.now()
+        with self._transaction():
+            self.connection.execute(UPDATE_SCHEDULE, self._to_row(task)[6:] + (to_micros(task.updated_at), task_id))
+            self._shift_days(before, self._days([task]))
+        return task
+
+    def next_tasks(self, limit: int = 20, by: str = "priority") -> List[Task]:
+        """Return the first open tasks to work on, using the schedule indexes; see TaskService.next_tasks."""
+        if by not in ("priority", "due"):
+            raise ValueError("by must be one of priority, due")
+        sql = NEXT_BY_PRIORITY if by == "priority" else NEXT_BY_DUE
+        return [self._to_task(row) for row in self.connection.execute(sql, (limit,))]
+
+    def due_tasks(self, within: timedelta, now: Optional[datetime] = None) -> List[Task]:
+        """Return open tasks due within `within` from now, overdue ones included, earliest first."""
+        moment = to_micros((now or datetime.now()) + within)
+        return [self._to_task(row) for row in self.connection.execute(DUE_BEFORE, (moment,))]
+
+    def _get_many(self, task_ids: Iterable[int]) -> Dict[int, Task]:
+        """Fetch the tasks for many IDs with a few IN lookups; missing IDs are left out."""
+        task_ids = list(dict.fromkeys(task_ids))
+        found: Dict[int, Task] = {}
+        for start in range(0, len(task_ids), LOOKUP_CHUNK):
+            chunk = task_ids[start:start + LOOKUP_CHUNK]
+            sql = f"SELECT {COLUMNS} FROM tasks WHERE id IN ({', '.join('?' * len(chunk))})"
+            for row in self.connection.execute(sql, chunk):
+                found[row[0]] = self._to_task(row)
+        return found
+
+    def update_many(self, updates: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> List[Optional[Task]]:
+        """
+        Apply (task_id, title, description) updates in one transaction.
+
+        Returns the updated task for each entry, or None where the ID does
+        not exist. Nothing is written if any new title is invalid.
+        """
+        updates = list(updates)
+        for position, (_, title, _) in enumerate(updates):
+            if title is not None and not (1 <= len(title) <= 200):
+                raise ValueError(f"Item {position + 1}: Title must be between 1 and 200 characters")
+
+        now = datetime.now()
+        results: List[Optional[Task]] = []
+        rows = []
+        with self._transaction():
+            found = self._get_many(task_id for task_id, _, _ in updates)
+            before = self._days(found.values())
+            for task_id, title, description in updates:
+                task = found.get(task_id)
+                if task is not None:
+                    if title is not None:
+                        task.title = title
+                    if description is not None:
+                        task.description = description
+                    task.updated_at = now
+                    rows.append((task.title, task.description, to_micros(now),
+                                 content_key(task.title, task.description), task_id))
+                results.append(task)
+            self.connection.executemany(UPDATE_TEXT, rows)
+            self._shift_days(before, self._days(found.values()))
+        return results
+
+    def delete_many(self, task_ids: Iterable[int]) -> List[bool]:
+        """Delete tasks by ID in one transaction; return whether each one existed."""
+        task_ids = list(task_ids)
+        with self._transaction():
+            found = self._get_many(task_ids)
+            self.connection.executemany(DELETE_TASK, ((task_id,) for task_id in found))
+            self._shift_days(self._days(found.values()), Counter())
+        remaining = set(found)
+        results = []
+        for task_id in task_ids:
+            results.append(task_id in remaining)
+            remaining.discard(task_id)
+        return results
+
+    def _set_completed_many(self, task_ids: Iterable[int], completed: bool) -> List[Optional[Task]]:
+        task_ids = list(task_ids)
+        now = datetime.now()
+        with self._transaction():
+            found = self._get_many(task_ids)
+            before = self._days(found.values())
+            for task in found.values():
+                task.completed = completed
+                task.updated_at = now
+            self.connection.executemany(UPDATE_COMPLETED, ((int(completed), to_micros(now), task_id)
+                                                           for task_id in found))
+            self._shift_days(before, self._days(found.values()))
+        return [found.get(task_id) for task_id in task_ids]
+
+    def complete_many(self, task_ids: Iterable[int]) -> List[Optional[Task]]:
+        """Mark tasks as complete in one transaction; None where the ID does not exist."""
+        return self._set_completed_many(task_ids, True)
+
+    def incomplete_many(self, task_ids: Iterable[int]) -> List[Optional[Task]]:
+        """Mark tasks as incomplete in one transaction; None where the ID does not exist."""
+        return self._set_completed_many(task_ids, False)
+
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task by its ID."""
+        with self._transaction():
+            task = self.get_task_by_id(task_id)
+            if task is None:
+                return False
+            self.connection.execute(DELETE_TASK, (task_id,))
+            self._shift_days(self._days([task]), Counter())
+        return True
+
+    def _set_completed(self, task_id: int, completed: bool) -> Optional[Task]:
+        task = self.get_task_by_id(task_id)
+        if task is None:
+            return None
+
+        before = self._days([task])
+        task.completed = completed
+        task.updated_at = datetime.now()
+        with self._transaction():
+            self.connection.execute(UPDATE_COMPLETED, (int(completed), to_micros(task.updated_at), task_id))
+            self._shift_days(before, self._days([task]))
+        return task
+
+    def mark_task_complete(self, task_id: int) -> Optional[Task]:
+        """Mark a task as complete."""
+        return self._set_completed(task_id, True)
+
+    def mark_task_incomplete(self, task_id: int) -> Optional[Task]:
+        """Mark a task as incomplete."""
+        return self._set_completed(task_id, False)
+
+    def _transaction(self):
+        """Return a context manager wrapping statements in BEGIN/COMMIT."""
+        return _Transaction(self.connection)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class _Transaction:
+    """BEGIN on enter; COMMIT on success or ROLLBACK on error."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -1,6 +1,29 @@
-from typing import List, Optional
-from datetime import datetime
-from ..models.task import Task
+from dataclasses import replace
+from heapq import merge
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from ..models.task import MAX_PRIORITY, MIN_PRIORITY, Task
+from ..storage.memory import DictTaskStore
+from ..storage.persistence import Persistence
+from .history import EDIT_DELTA, SCHEDULE_DELTA, STATUS_DELTA, TASK_DELTA, TEXT_DELTA, Entry, OperationLog, whole_task
+from .indexes import StatusTimeIndex, TaskIndex
+
+if TYPE_CHECKING:
+    # Index modules are imported when each index is first built, keeping start-up short
+    from .aggregates import TaskAggregates, TaskSummary
+    from .dedupe import ContentIndex, IdempotencyKeys
+    from .events import EventBus
+    from .scheduler import ReminderLoop, Reminder, TaskScheduler
+    from .search import InvertedIndex
+
+# Fields modified by each kind of mutation, used to skip unaffected indexes
+TEXT_FIELDS = frozenset({"title", "description", "updated_at"})
+STATUS_FIELDS = frozenset({"completed", "updated_at"})
+SCHEDULE_FIELDS = frozenset({"due_at", "priority", "updated_at"})
+EDIT_FIELDS = TEXT_FIELDS | SCHEDULE_FIELDS
+
+ORDER_FIELDS = ("id", "created_at", "updated_at")
 
 
 class TaskService:
@@ -12,79 +35,705 @@ class TaskService:
     - Update task
     - Delete task
     - Mark task complete/incomplete
+    - Bulk add, update, complete and delete
+    - Filtered queries over status and timestamps
+    - Full-text search over titles and descriptions
+    - Undo/redo and per-task change history
+    - Change notifications for subscribers
+    - Running counts and per-day histograms
+    - Due dates, priorities, "what next" queues and due reminders
+    - Idempotent adds and duplicate detection by content
+    - Archiving of old completed tasks to a cold tier
     - Validation logic
     """
 
-    def __init__(self):
-        """Initialize the task service with an empty in-memory storage."""
-        self.tasks: List[Task] = []
+    def __init__(self, store=None, persistence: Optional[Persistence] = None,
+                 history_limit: int = 10_000, archive=None):
+        """
+        Initialize the task service with an empty in-memory storage.
+
+        `store` selects the storage layout; it defaults to a DictTaskStore.
+        Pass a ColumnarTaskStore for a memory-lean store of millions of
+        tasks. Tasks read from a columnar store are views, so change them
+        through the service methods rather than in place.
+
+        `persistence` makes the service durable: previously saved tasks are
+        loaded into the store and every mutation is recorded.
+
+        `history_limit` bounds the undo log, counted in changed tasks;
+        0 turns undo and history off.
+
+        `archive` is a TaskArchive to move old completed tasks into; see
+        archive_completed().
+        """
+        self.store = store if store is not None else DictTaskStore()
         self.next_id = 1
+        self.persistence = persistence if persistence is not None else Persistence()
+        self.persistence.load(self)
+
+        self.archive = archive
+        if archive is not None:
+            self.next_id = max(self.next_id, archive.last_id + 1)
+            # A crash while archiving leaves tasks in both tiers; keep the hot copy
+            for task_id in archive.unconfirmed_ids():
+                if task_id in self.store:
+                    archive.remove(task_id)
+            archive.confirm()
+
+        # Secondary indexes are built on first use, then kept up to date
+        self.indexes: List[TaskIndex] = []
+        self._status_index: Optional[StatusTimeIndex] = None
+        self._search_index: Optional["InvertedIndex"] = None
+        self._events: Optional["EventBus"] = None
+        self._aggregates: Optional["TaskAggregates"] = None
+        self._scheduler: Optional["TaskScheduler"] = None
+        self._reminders: Optional["ReminderLoop"] = None
+        self._content_index: Optional["ContentIndex"] = None
+        self._idempotency_keys: Optional["IdempotencyKeys"] = None
+
+        # Inverse deltas of recent mutations, for undo/redo and history
+        self.history = OperationLog(history_limit)
+
+    # Index maintenance
+
+    def add_index(self, index: TaskIndex) -> TaskIndex:
+        """Register an index; it is updated on every later mutation."""
+        self.indexes.append(index)
+        return index
+
+    def _index_add(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        for index in self.indexes:
+            if changed is None or changed & index.fields:
+                index.add(task, changed)
+
+    def _index_discard(self, task: Task, changed: Optional[FrozenSet[str]] = None):
+        for index in self.indexes:
+            if changed is None or changed & index.fields:
+                index.discard(task, changed)
+
+    @property
+    def status_index(self) -> StatusTimeIndex:
+        """Completion and timestamp indexes, built on first access."""
+        if self._status_index is None:
+            self._status_index = self.add_index(StatusTimeIndex(self.store))
+        return self._status_index
+
+    @property
+    def search_index(self) -> "InvertedIndex":
+        """Full-text index, built on first access."""
+        if self._search_index is None:
+            from .search import InvertedIndex
+            self._search_index = self.add_index(InvertedIndex(self.store))
+        return self._search_index
+
+    @property
+    def events(self) -> "EventBus":
+        """Change notification bus; mutations start publishing once it is first used."""
+        if self._events is None:
+            from .events import EventBus
+            self._events = self.add_index(EventBus())
+        return self._events
+
+    @property
+    def aggregates(self) -> "TaskAggregates":
+        """Running counts and per-day histograms, built on first access."""
+        if self._aggregates is None:
+            from .aggregates import TaskAggregates
+            self._aggregates = self.add_index(TaskAggregates(self.store))
+        return self._aggregates
+
+    @property
+    def scheduler(self) -> "TaskScheduler":
+        """Due-date and priority queues over open tasks, built on first access."""
+        if self._scheduler is None:
+            from .scheduler import TaskScheduler
+            self._scheduler = self.add_index(TaskScheduler(self.store))
+        return self._scheduler
+
+    @property
+    def content_index(self) -> "ContentIndex":
+        """Hash index over normalised titles and descriptions, built on first access."""
+        if self._content_index is None:
+            from .dedupe import ContentIndex
+            self._content_index = self.add_index(ContentIndex(self.store))
+        return self._content_index
+
+    @property
+    def idempotency_keys(self) -> "IdempotencyKeys":
+        """Recent add_task idempotency keys, so a retried add returns the first task."""
+        if self._idempotency_keys is None:
+            from .dedupe import IdempotencyKeys
+            self._idempotency_keys = IdempotencyKeys()
+        return self._idempotency_keys
+
+    # Operations
+
+    def add_task(self, title: str, description: Optional[str] = None,
+                 due_at: Optional[datetime] = None, priority: int = 0,
+                 key: Optional[str] = None, unique: bool = False) -> Task:
+        """
+        Add a new task to the in-memory storage.
+
+        With an idempotency `key`, a repeated call with the same key
+        returns the task the first call added, as long as the key is
+        still remembered (see IdempotencyKeys) and the task still exists.
+        With `unique`, DuplicateTaskError is raised instead of adding a
+        task whose normalised title and description match an existing one.
+        """
+        if key is not None:
+            task_id = self.idempotency_keys.get(key)
+            if task_id is not None:
+                task = self.get_task_by_id(task_id)
+                if task is not None:
+                    return task
 
-    def add_task(self, title: str, description: Optional[str] = None) -> Task:
-        """Add a new task to the in-memory storage."""
         # Validate title
         if not (1 <= len(title) <= 200):
             raise ValueError("Title must be between 1 and 200 characters")
+        if unique:
+            existing = self.content_index.find(title, description)
+            if existing:
+                from .dedupe import DuplicateTaskError
+                raise DuplicateTaskError(self.store.get(existing[0]))
 
         # Create a new task
         task = Task(
             id=self.next_id,
             title=title,
-            description=description
+            description=description,
+            due_at=due_at,
+            priority=priority
         )
         task.validate_title()
+        task.validate_priority()
 
         # Add to storage
-        self.tasks.append(task)
+        self.store.add(task)
         self.next_id += 1
+        self._index_add(task)
+        self.persistence.record("add", task)
+        self.history.record("add", task.id, None, None)
+        if key is not None:
+            self.idempotency_keys.put(key, task.id)
 
         return task
 
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> List[Task]:
+        """
+        Add (title, description) pairs in one call.
+
+        Every title is validated before any task is stored, so either all
+        tasks are added or none are, and they share one creation timestamp.
+        """
+        items = list(items)
+        for position, (title, _) in enumerate(items):
+            if not (1 <= len(title) <= 200):
+                raise ValueError(f"Item {position + 1}: Title must be between 1 and 200 characters")
+
+        now = datetime.now()
+        tasks = []
+        for title, description in items:
+            task = Task(id=self.next_id, title=title, description=description,
+                        created_at=now, updated_at=now)
+            self.store.add(task)
+            self.next_id += 1
+            self._index_add(task)
+            self.persistence.record("add", task)
+            tasks.append(task)
+        self.history.record_many("add", [(task.id, None, None) for task in tasks])
+        return tasks
+
+    def import_many(self, tasks: Iterable[Task], keep_ids: bool = False) -> List[Task]:
+        """
+        Store fully built tasks, e.g. from an import, under new IDs.
+
+        Unlike add_many, each task keeps its own completed flag and
+        timestamps; only the ID is assigned here. With keep_ids the tasks
+        keep their IDs too, which must be increasing and above every
+        stored ID; a ShardedTaskService allocates IDs this way.
+        """
+        tasks = list(tasks)
+        for task in tasks:
+            task.validate_title()
+            task.validate_priority()
+
+        for task in tasks:
+            if not keep_ids:
+                task.id = self.next_id
+            self.store.add(task)
+            self.next_id = task.id + 1
+            self._index_add(task)
+            self.persistence.record("add", task)
+        self.history.record_many("import", [(task.id, None, None) for task in tasks])
+        return tasks
+
+    def import_tasks(self, path: str, format: Optional[str] = None, chunk_size: int = 5000):
+        """Import tasks from a CSV or JSON Lines file in bounded chunks."""
+        from . import transfer
+        return transfer.import_tasks(self, path, format, chunk_size)
+
+    def export_tasks(self, path: str, format: Optional[str] = None) -> int:
+        """Export all tasks to a CSV or JSON Lines file; return the count."""
+        from . import transfer
+        return transfer.export_tasks(self, path, format)
+
     def get_all_tasks(self) -> List[Task]:
-        """Get all tasks from storage."""
-        return self.tasks
+        """Get all tasks from storage, in creation order."""
+        return list(self.store)
+
+    def iter_tasks(self, after_id: int = 0, limit: Optional[int] = None, offset: int = 0,
+                   archived: bool = False) -> Iterator[Task]:
+        """
+        Iterate tasks in creation order without materialising the store.
+
+        after_id is a cursor: only tasks with a greater ID are returned,
+        so passing the last ID of one page fetches the next page. offset
+        skips that many tasks first and limit caps the number returned.
+        archived includes archived tasks, read from their segments.
+        """
+        tasks = self.store.iter_from(after_id)
+        if archived and self.archive is not None:
+            store = self.store
+            cold = (task for task in self.archive.iter_from(after_id) if task.id not in store)
+            tasks = merge(tasks, cold, key=lambda task: task.id)
+        stop = None if limit is None else offset + limit
+        return islice(tasks, offset, stop)
+
+    def query(self, completed: Optional[bool] = None,
+              created_since: Optional[datetime] = None, created_until: Optional[datetime] = None,
+              updated_since: Optional[datetime] = None, updated_until: Optional[datetime] = None,
+              order_by: str = "id", descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> List[Task]:
+        """
+        Find tasks by completion status and timestamp ranges.
+
+        `*_since` bounds are inclusive and `*_until` bounds exclusive.
+        Results are ordered by `order_by` (id, created_at or updated_at).
+        When the order matches the index driving the search, only matching
+        tasks are visited, so a limited query costs O(log n + k).
+        """
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"order_by must be one of {', '.join(ORDER_FIELDS)}")
+
+        index = self.status_index
+        created_range = created_since is not None or created_until is not None
+        updated_range = updated_since is not None or updated_until is not None
+
+        def key_range(keys, since, until):
+            return keys.irange(None if since is None else (since,),
+                               None if until is None else (until,),
+                               inclusive=(True, False), reverse=descending)
+
+        def matches(task: Task) -> bool:
+            if completed is not None and task.completed != completed:
+                return False
+            if created_since is not None and task.created_at < created_since:
+                return False
+            if created_until is not None and task.created_at >= created_until:
+                return False
+            if updated_since is not None and task.updated_at < updated_since:
+                return False
+            if updated_until is not None and task.updated_at >= updated_until:
+                return False
+            return True
+
+        # Pick the candidate stream: ideally one already in result order
+        if order_by == "updated_at" or (order_by == "id" and updated_range):
+            ids = (task_id for _, task_id in key_range(index.updated, updated_since, updated_until))
+        elif order_by == "created_at" or (order_by == "id" and created_range):
+            ids = (task_id for _, task_id in key_range(index.created, created_since, created_until))
+        elif completed is not None:
+            ids = (index.completed if completed else index.pending).irange(reverse=descending)
+
+        elif descending:
+            ids = merge(index.pending.irange(reverse=True), index.completed.irange(reverse=True),
+                        reverse=True)
+        else:
+            ids = None
+
+        tasks = self.store.iter_from(0) if ids is None else map(self.store.get, ids)
+        results = filter(matches, tasks)
+
+        if order_by == "id" and (updated_range or created_range):
+            # The time index does not give ID order; sort the matches
+            ordered = sorted(results, key=lambda task: task.id, reverse=descending)
+            return ordered[offset:None if limit is None else offset + limit]
+
+        stop = None if limit is None else offset + limit
+        return list(islice(results, offset, stop))
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Task]:
+        """
+        Find tasks whose title or description contains every query word.
+
+        Words match whole tokens or token prefixes ("gro" finds "groceries").
+        Results are ordered by relevance: title hits and rarer words score
+        higher, and exact matches beat prefix matches.
+        """
+        return [self.store.get(task_id) for task_id, _ in self.search_index.search(query, limit)]
+
+    def summary(self) -> "TaskSummary":
+        """
+        Return task counts and tasks created and completed per day.
+
+        The counts are maintained by every mutation, so after the first
+        call, which counts the store once, this costs O(days) rather than
+        a scan. Archived tasks are only counted in `archived`.
+        """
+        summary = self.aggregates.summary()
+        if self.archive is not None:
+            summary.archived = len(self.archive)
+        return summary
+
+    def find_duplicates(self, title: str, description: Optional[str] = None) -> List[Task]:
+        """Return active tasks whose normalised title and description match, oldest first."""
+        return [self.store.get(task_id) for task_id in self.content_index.find(title, description)]
+
+    def duplicate_groups(self) -> List[List[Task]]:
+        """
+        Return each set of active tasks sharing a normalised title and
+        description, oldest task first. Costs O(duplicates) once the
+        content index is built, which hashes every task once.
+        """
+        store = self.store
+        return [[store.get(task_id) for task_id in group] for group in self.content_index.groups()]
 
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
-        """Get a task by its ID."""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
-
-    def update_task(self, task_id: int, title: str = None, description: str = None) -> Optional[Task]:
-        """Update an existing task."""
-        task = self.get_task_by_id(task_id)
+        """Get a task by its ID, looking in the archive if it is not active."""
+        task = self.store.get(task_id)
+        if task is None and self.archive is not None:
+            return self.archive.get(task_id)
+        return task
+
+    def _get_for_update(self, task_id: int) -> Optional[Task]:
+        """Return the task a mutation should modify and save back."""
+        task = self.store.get(task_id)
+        if task is None and self.archive is not None and task_id in self.archive:
+            return self._promote(task_id)
+        return task
+
+    def update_task(self, task_id: int, title: str = None, description: str = None,
+                    due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                    clear_due: bool = False) -> Optional[Task]:
+        """
+        Update an existing task.
+
+        due_at, priority and clear_due reschedule it in the same call, as
+        schedule_task does, so the whole edit is one change to undo.
+        Everything is validated before anything is applied.
+        """
+        task = self._get_for_update(task_id)
         if task is None:
             return None
+        if title is not None and not (1 <= len(title) <= 200):
+            raise ValueError("Title must be between 1 and 200 characters")
+        if priority is not None and not (MIN_PRIORITY <= priority <= MAX_PRIORITY):
+            raise ValueError(f"Priority must be between {MIN_PRIORITY} and {MAX_PRIORITY}")
 
+        scheduled = due_at is not None or priority is not None or clear_due
+        fields, delta = (EDIT_FIELDS, EDIT_DELTA) if scheduled else (TEXT_FIELDS, TEXT_DELTA)
+        before = tuple(getattr(task, field) for field in delta)
+        self._index_discard(task, fields)
         task.update(title, description)
+        if clear_due:
+            task.due_at = None
+        elif due_at is not None:
+            task.due_at = due_at
+        if priority is not None:
+            task.priority = priority
+        self.store.save(task)
+        self._index_add(task, fields)
+        self.persistence.record("update", task)
+        self.history.record("update", task_id, delta, before)
         return task
 
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by its ID."""
-        task = self.get_task_by_id(task_id)
+        task = self._get_for_update(task_id)
         if task is None:
             return False
 
-        self.tasks.remove(task)
+        self._index_discard(task)
+        self.store.remove(task_id)
+        self.persistence.record_delete(task_id)
+        self.history.record("delete", task_id, TASK_DELTA, whole_task(task))
         return True
 
-    def mark_task_complete(self, task_id: int) -> Optional[Task]:
-        """Mark a task as complete."""
-        task = self.get_task_by_id(task_id)
+    def _set_completed(self, task_id: int, completed: bool) -> Optional[Task]:
+        task = self._get_for_update(task_id)
         if task is None:
             return None
 
-        task.completed = True
+        op = "complete" if completed else "incomplete"
+        before = (task.completed, task.updated_at)
+        self._index_discard(task, STATUS_FIELDS)
+        task.completed = completed
         task.updated_at = datetime.now()
+        self.store.save(task)
+        self._index_add(task, STATUS_FIELDS)
+        self.persistence.record(op, task)
+        self.history.record(op, task_id, STATUS_DELTA, before)
         return task
 
-    def mark_task_incomplete(self, task_id: int) -> Optional[Task]:
-        """Mark a task as incomplete."""
-        task = self.get_task_by_id(task_id)
+    def schedule_task(self, task_id: int, due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                      clear_due: bool = False) -> Optional[Task]:
+        """
+        Set a task's due date and/or priority; None leaves a field as it is.
+
+        clear_due removes the due date instead.
+        """
+        task = self._get_for_update(task_id)
         if task is None:
             return None
+        if priority is not None and not (MIN_PRIORITY <= priority <= MAX_PRIORITY):
+            raise ValueError(f"Priority must be between {MIN_PRIORITY} and {MAX_PRIORITY}")
 
-        task.completed = False
+        before = (task.due_at, task.priority, task.updated_at)
+        self._index_discard(task, SCHEDULE_FIELDS)
+        if clear_due:
+            task.due_at = None
+        elif due_at is not None:
+            task.due_at = due_at
+        if priority is not None:
+            task.priority = priority
         task.updated_at = datetime.now()
-        return task
\ No newline at end of file
+        self.store.save(task)
+        self._index_add(task, SCHEDULE_FIELDS)
+        self.persistence.record("update", task)
+        self.history.record("schedule", task_id, SCHEDULE_DELTA, before)
+        return task
+
+    def mark_task_complete(self, task_id: int) -> Optional[Task]:
+        """Mark a task as complete."""
+        return self._set_completed(task_id, True)
+
+    def mark_task_incomplete(self, task_id: int) -> Optional[Task]:
+        """Mark a task as incomplete."""
+        return self._set_completed(task_id, False)
+
+    # Bulk operations: validate everything first, then apply with one timestamp
+
+    def update_many(self, updates: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> List[Optional[Task]]:
+        """
+        Apply (task_id, title, description) updates in one call.
+
+        Returns the updated task for each entry, or None where the ID does
+        not exist. Nothing is changed if any new title is invalid.
+        """
+        updates = list(updates)
+        for position, (_, title, _) in enumerate(updates):
+            if title is not None and not (1 <= len(title) <= 200):
+                raise ValueError(f"Item {position + 1}: Title must be between 1 and 200 characters")
+
+        now = datetime.now()
+        results: List[Optional[Task]] = []
+        undo: List[Entry] = []
+        for task_id, title, description in updates:
+            task = self._get_for_update(task_id)
+            if task is not None:
+                undo.append((task_id, TEXT_DELTA, (task.title, task.description, task.updated_at)))
+                self._index_discard(task, TEXT_FIELDS)
+                if title is not None:
+                    task.title = title
+                if description is not None:
+                    task.description = description
+                task.updated_at = now
+                self.store.save(task)
+                self._index_add(task, TEXT_FIELDS)
+                self.persistence.record("update", task)
+            results.append(task)
+        self.history.record_many("update", undo)
+        return results
+
+    def delete_many(self, task_ids: Iterable[int]) -> List[bool]:
+        """Delete tasks by ID; return whether each one existed."""
+        results = []
+        undo: List[Entry] = []
+        for task_id in task_ids:
+            task = self._get_for_update(task_id)
+            if task is not None:
+                self._index_discard(task)
+                self.store.remove(task_id)
+                self.persistence.record_delete(task_id)
+                undo.append((task_id, TASK_DELTA, whole_task(task)))
+            results.append(task is not None)
+        self.history.record_many("delete", undo)
+        return results
+
+    def _set_completed_many(self, task_ids: Iterable[int], completed: bool) -> List[Optional[Task]]:
+        now = datetime.now()
+        op = "complete" if completed else "incomplete"
+        results: List[Optional[Task]] = []
+        undo: List[Entry] = []
+        for task_id in task_ids:
+            task = self._get_for_update(task_id)
+            if task is not None:
+                undo.append((task_id, STATUS_DELTA, (task.completed, task.updated_at)))
+                self._index_discard(task, STATUS_FIELDS)
+                task.completed = completed
+                task.updated_at = now
+                self.store.save(task)
+                self._index_add(task, STATUS_FIELDS)
+                self.persistence.record(op, task)
+            results.append(task)
+        self.history.record_many(op, undo)
+        return results
+
+    def complete_many(self, task_ids: Iterable[int]) -> List[Optional[Task]]:
+        """Mark tasks as complete; return each task, or None where the ID does not exist."""
+        return self._set_completed_many(task_ids, True)
+
+    def incomplete_many(self, task_ids: Iterable[int]) -> List[Optional[Task]]:
+        """Mark tasks as incomplete; return each task, or None where the ID does not exist."""
+        return self._set_completed_many(task_ids, False)
+
+    # Scheduling
+
+    def next_tasks(self, limit: int = 20, by: str = "priority") -> List[Task]:
+        """
+        Return the first `limit` open tasks to work on.
+
+        `by` is "priority" (highest first, then earliest due date) or
+        "due" (earliest due date first, only tasks that have one). Costs
+        O(limit log n) once the scheduler is built.
+        """
+        return [self.store.get(task_id) for task_id in self.scheduler.first(limit, by)]
+
+    def due_tasks(self, within: timedelta, now: Optional[datetime] = None) -> List[Task]:
+        """Return open tasks due within `within` from now, overdue ones included, earliest first."""
+        moment = (now or datetime.now()) + within
+        return [self.store.get(task_id) for task_id in self.scheduler.due_before(moment)]
+
+    def start_reminders(self, callback: Callable[[List["Reminder"]], object]) -> "ReminderLoop":
+        """
+        Call `callback` from a background thread as open tasks fall due;
+        see ReminderLoop. close() stops it.
+        """
+        from .scheduler import ReminderLoop
+        self.stop_reminders()
+        self._reminders = ReminderLoop(self.scheduler, callback)
+        return self._reminders
+
+    def stop_reminders(self):
+        """Stop the reminder loop, if one is running."""
+        if self._reminders is not None:
+            self._reminders.stop()
+            self._reminders = None
+
+    # Archive
+
+    def _tier_indexes(self) -> List[TaskIndex]:
+        """Indexes to update when a task changes tier; moves are not published as events."""
+        return [index for index in self.indexes if index is not self._events]
+
+    def archive_completed(self, older_than: Optional[timedelta] = None) -> int:
+        """
+        Move tasks completed and unchanged for `older_than` (default: the
+        archive's age) to the archive; return how many were moved.
+
+        Archived tasks leave the store and its indexes, so listings,
+        queries and search cover active work only. get_task_by_id() and
+        iter_tasks(archived=True) still find them, and any change to one,
+        such as mark_task_incomplete(), brings it back first.
+        """
+        if self.archive is None:
+            raise ValueError("This service has no archive")
+        age = self.archive.age if older_than is None else older_than
+        tasks = self.query(completed=True, updated_until=datetime.now() - age)
+        if not tasks:
+            return 0
+        self.archive.add(tasks)
+        indexes = self._tier_indexes()
+        for task in tasks:
+            for index in indexes:
+                index.discard(task, None)
+            self.store.remove(task.id)
+            self.persistence.record_delete(task.id)
+        self.archive.confirm()
+        return len(tasks)
+
+    def _promote(self, task_id: int) -> Optional[Task]:
+        """Move an archived task back to the store and return it."""
+        task = self.archive.get(task_id)
+        self.store.insert(task)
+        self.persistence.record("restore", task)
+        # Removed last: a crash before this leaves the hot copy, which wins
+        self.archive.remove(task_id)
+        for index in self._tier_indexes():
+            index.add(task, None)
+        return self.store.get(task_id)
+
+    # Undo, redo and history
+
+    def _revert(self, entry: Entry) -> Entry:
+        """Restore one task to its logged state; return the entry that undoes that."""
+        task_id, fields, values = entry
+        if fields is TASK_DELTA:
+            task = Task(*values)
+            self.store.insert(task)
+            self._index_add(task)
+            self.persistence.record("restore", task)
+            return task_id, None, None
+
+        task = self._get_for_update(task_id)
+        if task is None:
+            return entry
+        if fields is None:
+            self._index_discard(task)
+            self.store.remove(task_id)
+            self.persistence.record_delete(task_id)
+            return task_id, TASK_DELTA, whole_task(task)
+
+        changed = frozenset(fields)
+        after = tuple(getattr(task, field) for field in fields)
+        self._index_discard(task, changed)
+        for field, value in zip(fields, values):
+            setattr(task, field, value)
+        self.store.save(task)
+        self._index_add(task, changed)
+        self.persistence.record("update", task)
+        return task_id, fields, after
+
+    def undo(self) -> Optional[Tuple[str, List[int]]]:
+        """
+        Revert the most recent mutation, including a whole bulk call.
+
+        Returns (operation, task IDs) for what was undone, or None when
+        there is nothing left to undo.
+        """
+        group = self.history.undo(self._revert)
+        return None if group is None else (group[0], [entry[0] for entry in group[1]])
+
+    def redo(self) -> Optional[Tuple[str, List[int]]]:
+        """Reapply the most recently undone mutation; see undo()."""
+        group = self.history.redo(self._revert)
+        return None if group is None else (group[0], [entry[0] for entry in group[1]])
+
+    def task_history(self, task_id: int) -> Iterator[Tuple[str, Optional[Task]]]:
+        """
+        Yield (operation, task afterwards) for a task's logged changes, newest first.
+
+        Revisions are rebuilt on demand by applying the logged inverse
+        deltas, newest first, to a copy of the current task; the task
+        afterwards is None for a delete. Only changes still in the
+        bounded log are reported.
+        """
+        current = self.get_task_by_id(task_id)
+        state = None if current is None else replace(current)
+        for op, entry_id, fields, values in self.history.entries():
+            if entry_id != task_id:
+                continue
+            yield op, state
+            if fields is None:
+                state = None
+            elif fields is TASK_DELTA:
+                state = Task(*values)
+            else:
+                state = replace(state, **dict(zip(fields, values)))
+
+    def close(self):
+        """Flush and close the persistence layer and stop event delivery and reminders."""
+        self.stop_reminders()
+        if self._events is not None:
+            self._events.close()
+        self.persistence.close()
@@ -0,0 +1,153 @@
+import threading
+from bisect import bisect_right
+from dataclasses import replace
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from typing import Iterator, List, Optional, Tuple
+from ..models.task import Task
+from ..storage.memory import DictTaskStore
+from .task_service import TaskService
+
+
+class ThreadSafeTaskService(TaskService):
+    """
+    TaskService that can be shared between threads:
+    - All mutations, and ID allocation with them, run under one writer lock
+    - Tasks are copied on write, so a Task a reader holds never changes
+    - Point reads and full listings never take the lock
+
+    Writers replace a task's dict entry with an updated copy instead of
+    editing it in place. A reader therefore sees each task either before
+    or after a write, never half-way through it. get_all_tasks() copies
+    the dict's values in a single C-level call, which is atomic on both
+    GIL and free-threaded builds, then sorts them by ID, and the result
+    is cached until the next write. iter_tasks() pages through that
+    same snapshot. Indexed queries and search share index structures
+    with writers, so they take the writer lock.
+
+    Only the default DictTaskStore supports lock-free reads.
+    """
+
+    thread_safe = True
+
+    def __init__(self, store=None, persistence=None, history_limit: int = 10_000):
+        """Initialize the service; see TaskService.__init__."""
+        if store is not None and not isinstance(store, DictTaskStore):
+            raise ValueError("ThreadSafeTaskService requires a DictTaskStore")
+        self._lock = threading.RLock()
+        self._version = 0
+        self._snapshot: Tuple[int, List[Task], List[int]] = (-1, [], [])
+        super().__init__(store, persistence, history_limit)
+
+    def _get_for_update(self, task_id: int) -> Optional[Task]:
+        task = self.store.get(task_id)
+        return replace(task) if task is not None else None
+
+    def _snapshot_tasks(self) -> Tuple[List[Task], List[int]]:
+        """Return (tasks, ids) as of the latest write, rebuilding if stale."""
+        version, tasks, ids = self._snapshot
+        current = self._version
+        if version != current:
+            tasks = list(self.store.tasks.values())
+            # Restored tasks sit at the end of the dict; the sort is a
+            # single linear pass when nothing was restored
+            tasks.sort(key=attrgetter("id"))
+            ids = [task.id for task in tasks]
+            self._snapshot = (current, tasks, ids)
+        return tasks, ids
+
+    def get_all_tasks(self) -> List[Task]:
+        """Get a consistent snapshot of all tasks without blocking writers."""
+        return list(self._snapshot_tasks()[0])
+
+    def iter_tasks(self, after_id: int = 0, limit: Optional[int] = None, offset: int = 0) -> Iterator[Task]:
+        """Iterate a consistent snapshot of tasks after a cursor."""
+        tasks, ids = self._snapshot_tasks()
+        start = bisect_right(ids, after_id) + offset
+        stop = None if limit is None else start + limit
+        return islice(tasks, start, stop)
+
+    # Writers: run the base implementation under the lock, then publish
+
+    def _write(self, method, *args, **kwargs):
+        with self._lock:
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._version += 1
+
+    def add_task(self, title: str, description: Optional[str] = None,
+                 due_at: Optional[datetime] = None, priority: int = 0,
+                 key: Optional[str] = None, unique: bool = False) -> Task:
+        return self._write(TaskService.add_task, title, description, due_at, priority, key, unique)
+
+    def add_many(self, items) -> List[Task]:
+        return self._write(TaskService.add_many, items)
+
+    def import_many(self, tasks, keep_ids: bool = False) -> List[Task]:
+        return self._write(TaskService.import_many, tasks, keep_ids)
+
+    def update_task(self, task_id: int, title: str = None, description: str = None,
+                    due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                    clear_due: bool = False) -> Optional[Task]:
+        return self._write(TaskService.update_task, task_id, title, description, due_at, priority, clear_due)
+
+    def delete_task(self, task_id: int) -> bool:
+        return self._write(TaskService.delete_task, task_id)
+
+    def _set_completed(self, task_id: int, completed: bool) -> Optional[Task]:
+        return self._write(TaskService._set_completed, task_id, completed)
+
+    def schedule_task(self, task_id: int, due_at: Optional[datetime] = None, priority: Optional[int] = None,
+                      clear_due: bool = False) -> Optional[Task]:
+        return self._write(TaskService.schedule_task, task_id, due_at, priority, clear_due)
+
+    def update_many(self, updates) -> List[Optional[Task]]:
+        return self._write(TaskService.update_many, updates)
+
+    def delete_many(self, task_ids) -> List[bool]:
+        return self._write(TaskService.delete_many, task_ids)
+
+    def _set_completed_many(self, task_ids, completed: bool) -> List[Optional[Task]]:
+        return self._write(TaskService._set_completed_many, task_ids, completed)
+
+    def undo(self):
+        return self._write(TaskService.undo)
+
+    def redo(self):
+        return self._write(TaskService.redo)
+
+    # Index readers share structures with writers
+
+    def query(self, *args, **kwargs) -> List[Task]:
+        with self._lock:
+            return TaskService.query(self, *args, **kwargs)
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Task]:
+        with self._lock:
+            return TaskService.search(self, query, limit)
+
+    def next_tasks(self, limit: int = 20, by: str = "priority") -> List[Task]:
+        with self._lock:
+            return TaskService.next_tasks(self, limit, by)
+
+    def due_tasks(self, within, now=None) -> List[Task]:
+        with self._lock:
+            return TaskService.due_tasks(self, within, now)
+
+    def summary(self):
+        with self._lock:
+            return TaskService.summary(self)
+
+    def find_duplicates(self, title: str, description: Optional[str] = None) -> List[Task]:
+        with self._lock:
+            return TaskService.find_duplicates(self, title, description)
+
+    def duplicate_groups(self) -> List[List[Task]]:
+        with self._lock:
+            return TaskService.duplicate_groups(self)
+
+    def task_history(self, task_id: int):
+        with self._lock:
+            return iter(list(TaskService.task_history(self, task_id)))
@@ -0,0 +1,178 @@
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Iterator, List, Optional, TextIO
+from ..models.task import Task, parse_timestamp
+
+FORMATS = ("csv", "jsonl")
+FIELDS = ["id", "title", "description", "completed", "created_at", "updated_at", "due_at", "priority"]
+TRUE_VALUES = {"1", "true", "yes", "y"}
+FALSE_VALUES = {"", "0", "false", "no", "n"}
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import: counts plus the first few row errors."""
+    imported: int = 0
+    rejected: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    MAX_ERRORS = 20
+
+    def reject(self, row_number: int, message: str):
+        self.rejected += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(f"row {row_number}: {message}")
+
+
+def detect_format(path: str, format: Optional[str] = None) -> str:
+    """Return the explicit format, or infer it from the file extension."""
+    if format is None:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        format = "jsonl" if extension in ("jsonl", "ndjson", "json") else extension
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format '{format}'; use one of {', '.join(FORMATS)}")
+    return format
+
+
+def _parse_completed(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"completed must be true or false, not '{value}'")
+
+
+def _parse_time(value, default: datetime) -> datetime:
+    if value in (None, ""):
+        return default
+    return parse_timestamp(value)
+
+
+def _parse_priority(value) -> int:
+    if value in (None, ""):
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"priority must be a whole number, not '{value}'") from None
+
+
+def row_to_task(row: dict, now: datetime) -> Task:
+    """Validate one imported row and build an unsaved Task (ID 0)."""
+    title = row.get("title") or ""
+    if not isinstance(title, str):
+        raise ValueError("title must be text")
+    if not (1 <= len(title) <= 200):
+        raise ValueError("Title must be between 1 and 200 characters")
+    description = row.get("description") or None
+    if description is not None and not isinstance(description, str):
+        raise ValueError("description must be text")
+
+    created_at = _parse_time(row.get("created_at"), now)
+    updated_at = _parse_time(row.get("updated_at"), created_at)
+    task = Task(
+        id=0,
+        title=title,
+        description=description,
+        completed=_parse_completed(row.get("completed", False)),
+        created_at=created_at,
+        updated_at=updated_at,
+        due_at=_parse_time(row.get("due_at"), None),
+        priority=_parse_priority(row.get("priority")),
+    )
+    task.validate_priority()
+    return task
+
+
+def _read_rows(handle: TextIO, format: str) -> Iterator[tuple]:
+    """Yield (row number, row dict or parse error) pairs from a stream."""
+    if format == "csv":
+        for row_number, row in enumerate(csv.DictReader(handle), 2):
+            yield row_number, row
+        return
+
+    for row_number, line in enumerate(handle, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, ValueError(f"invalid JSON: {e.msg}")
+            continue
+        yield row_number, row if isinstance(row, dict) else ValueError("expected a JSON object")
+
+
+def import_tasks(service, path: str, format: Optional[str] = None, chunk_size: int = 5000) -> ImportReport:
+    """
+    Stream tasks from a CSV or JSON Lines file into a service.
+
+    The file is read and validated chunk_size rows at a time. Each chunk's
+    valid rows are stored with one import_many call, so memory stays
+    bounded however large the file is. Invalid rows are counted and
+    reported without stopping the import. Imported tasks get new IDs but
+    keep their completed flag, timestamps, due date and priority.
+    """
+    format = detect_format(path, format)
+    report = ImportReport()
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = _read_rows(handle, format)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            now = datetime.now()
+            tasks = []
+            for row_number, row in chunk:
+                if isinstance(row, Exception):
+                    report.reject(row_number, str(row))
+                    continue
+                try:
+                    tasks.append(row_to_task(row, now))
+                except (TypeError, ValueError) as e:
+                    report.reject(row_number, str(e))
+
+            if tasks:
+                service.import_many(tasks)
+                report.imported += len(tasks)
+    return report
+
+
+def export_tasks(service, path: str, format: Optional[str] = None) -> int:
+    """
+    Stream every task to a CSV or JSON Lines file; return the count.
+
+    Tasks are read from the service's iterator, archived ones included,
+    and written as they come, with IDs, completed state, timestamps, due
+    dates and priorities preserved.
+    """
+    format = detect_format(path, format)
+    # Archived tasks are exported too, merged in ID order with the active ones
+    if getattr(service, "archive", None) is not None:
+        tasks = service.iter_tasks(archived=True)
+    else:
+        tasks = service.iter_tasks()
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        if format == "csv":
+            writer = csv.writer(handle)
+            writer.writerow(FIELDS)
+            for task in tasks:
+                writer.writerow([task.id, task.title, task.description or "",
+                                 "true" if task.completed else "false",
+                                 task.created_at.isoformat(), task.updated_at.isoformat(),
+                                 task.due_at.isoformat() if task.due_at is not None else "",
+                                 task.priority])
+                count += 1
+        else:
+            for task in tasks:
+                handle.write(json.dumps(task.to_dict(), ensure_ascii=False) + "\n")
+                count += 1
+    return count
@@ -0,0 +1,23 @@
+from importlib import import_module
+
+# Name -> submodule; each engine is imported on first use so start-up only
+# pays for the one it runs
+_EXPORTS = {
+    "DictTaskStore": "memory",
+    "ColumnarTaskStore": "columnar",
+    "MappedSnapshot": "mapped",
+    "MappedTaskStore": "mapped",
+    "Persistence": "persistence",
+    "JournalPersistence": "journal",
+    "TaskArchive": "archive",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
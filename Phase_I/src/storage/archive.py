@@ -0,0 +1,216 @@
+import json
+import os
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import timedelta
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..models.task import Task
+from .mapped import SnapshotView, pack_snapshot
+
+
+class TaskArchive:
+    """
+    Cold tier for completed tasks that are no longer being worked on:
+    - Tasks are stored in immutable segments: a zlib-compressed binary
+      snapshot (see storage.mapped) of up to SEGMENT_SIZE tasks each
+    - Each segment has an uncompressed index of the IDs it still serves,
+      so membership tests never touch the compressed data
+    - Segments are decompressed on first access and kept in a small
+      LRU cache
+
+    Only the ID indexes stay in memory, 8 bytes per archived task.
+    Taking a task back out (see TaskService.archive_completed and its
+    promotion on change) rewrites that segment's ID index; the segment
+    itself never changes and is deleted once it serves no IDs.
+
+    Segments stay unconfirmed until the caller has removed their tasks
+    from the hot tier and calls confirm(). If a crash comes in between,
+    a task is in both tiers; the hot copy is the one to trust, and
+    unconfirmed_ids() lists what to check when the service reopens.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    SEGMENT_SIZE = 4096
+
+    def __init__(self, directory: str, age: timedelta = timedelta(days=30), cached_segments: int = 8):
+        """
+        Open (or create) an archive in `directory`.
+
+        `age` is how long a task must have stayed completed and unchanged
+        before it is archived; `cached_segments` bounds how many
+        decompressed segments are kept in memory.
+        """
+        self.directory = directory
+        self.age = age
+        self.cached_segments = cached_segments
+        os.makedirs(directory, exist_ok=True)
+        self._manifest_path = os.path.join(directory, self.MANIFEST_FILE)
+
+        # Segment name -> sorted IDs it still serves, oldest segment first
+        self.segments: Dict[str, array] = {}
+        self._next_segment = 1
+        # Highest ID ever archived, so a service never hands it out again
+        self.last_id = 0
+        # Segments added since the last confirm()
+        self.unconfirmed: List[str] = []
+        self._cache: "OrderedDict[str, SnapshotView]" = OrderedDict()
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            self._next_segment = manifest["next_segment"]
+            self.last_id = manifest["last_id"]
+            self.unconfirmed = manifest["unconfirmed"]
+            for name in manifest["segments"]:
+                ids = array("q")
+                with open(self._path(name, ".ids"), "rb") as handle:
+                    ids.frombytes(handle.read())
+                self.segments[name] = ids
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.directory, name + suffix)
+
+    @staticmethod
+    def _write_file(path: str, data: bytes):
+        """Replace `path` with `data` atomically and durably."""
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary_path, path)
+
+    def _write_manifest(self):
+        manifest = {"next_segment": self._next_segment, "last_id": self.last_id,
+                    "segments": list(self.segments), "unconfirmed": self.unconfirmed}
+        self._write_file(self._manifest_path, json.dumps(manifest).encode("utf-8"))
+
+    # Writing
+
+    def add(self, tasks: Iterable[Task]) -> int:
+        """Store tasks, which must come in increasing ID order, in new segments; return the count."""
+        added = 0
+        batch: List[Task] = []
+        for task in tasks:
+            batch.append(task)
+            if len(batch) == self.SEGMENT_SIZE:
+                added += self._add_segment(batch)
+                batch = []
+        if batch:
+            added += self._add_segment(batch)
+        if added:
+            self._write_manifest()
+        return added
+
+    def _add_segment(self, tasks: List[Task]) -> int:
+        name = f"segment-{self._next_segment:06d}"
+        self._next_segment += 1
+        ids = array("q", [task.id for task in tasks])
+        self._write_file(self._path(name, ".z"), zlib.compress(pack_snapshot(tasks)))
+        self._write_file(self._path(name, ".ids"), ids.tobytes())
+        self.segments[name] = ids
+        self.unconfirmed.append(name)
+        self.last_id = max(self.last_id, ids[-1])
+        return len(tasks)
+
+    def remove(self, task_id: int) -> bool:
+        """Stop serving a task; return whether it was archived."""
+        found = False
+        for name, ids in list(self.segments.items()):
+            position = bisect_left(ids, task_id)
+            if position == len(ids) or ids[position] != task_id:
+                continue
+            found = True
+            del ids[position]
+            if ids:
+                self._write_file(self._path(name, ".ids"), ids.tobytes())
+            else:
+                del self.segments[name]
+                if name in self.unconfirmed:
+                    self.unconfirmed.remove(name)
+                self._cache.pop(name, None)
+                self._write_manifest()
+                os.remove(self._path(name, ".z"))
+                os.remove(self._path(name, ".ids"))
+        return found
+
+    def confirm(self):
+        """Record that the tasks of every segment added so far are gone from the hot tier."""
+        if self.unconfirmed:
+            self.unconfirmed = []
+            self._write_manifest()
+
+    # Reading
+
+    def unconfirmed_ids(self) -> List[int]:
+        """IDs in segments added since the last confirm()."""
+        return [task_id for name in self.unconfirmed if name in self.segments
+                for task_id in self.segments[name]]
+
+    def _segment_of(self, task_id: int) -> Optional[str]:
+        """Return the newest segment serving task_id, or None."""
+        for name, ids in reversed(self.segments.items()):
+            position = bisect_left(ids, task_id)
+            if position < len(ids) and ids[position] == task_id:
+                return name
+        return None
+
+    def _load(self, name: str) -> SnapshotView:
+        view = self._cache.get(name)
+        if view is not None:
+            self._cache.move_to_end(name)
+            return view
+        with open(self._path(name, ".z"), "rb") as handle:
+            view = SnapshotView(zlib.decompress(handle.read()), name)
+        self._cache[name] = view
+        if len(self._cache) > self.cached_segments:
+            self._cache.popitem(last=False)
+        return view
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Fetch an archived task, decompressing its segment if needed."""
+        name = self._segment_of(task_id)
+        return None if name is None else self._load(name).get(task_id)
+
+    def _live_tasks(self, name: str, ids: array, after_id: int, age: int) -> Iterator[Tuple[int, int, Task]]:
+        """
+        Decode one segment in ID order, yielding (id, age, task) for the
+        IDs it still serves; `age` is 0 for the newest segment.
+        """
+        live = iter(ids[bisect_right(ids, after_id):])
+        wanted = next(live, None)
+        for task in self._load(name).iter_from(after_id):
+            if wanted is None:
+                return
+            if task.id == wanted:
+                yield task.id, age, task
+                wanted = next(live, None)
+
+    def iter_from(self, after_id: int = 0) -> Iterator[Task]:
+        """
+        Iterate archived tasks with an ID greater than after_id, in ID order.
+
+        Each segment with IDs past the cursor is decompressed once and
+        read sequentially; the streams are merged by ID.
+        """
+        streams: List[Iterator[Tuple[int, int, Task]]] = []
+        for age, (name, ids) in enumerate(reversed(self.segments.items())):
+            if ids and ids[-1] > after_id:
+                streams.append(self._live_tasks(name, ids, after_id, age))
+        previous = None
+        for task_id, _, task in merge(*streams, key=lambda entry: entry[:2]):
+            # A task archived twice is served from its newest segment only
+            if task_id != previous:
+                previous = task_id
+                yield task
+
+    def __contains__(self, task_id: int) -> bool:
+        return self._segment_of(task_id) is not None
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.segments.values())
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.iter_from(0)
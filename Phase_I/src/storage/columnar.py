@@ -0,0 +1,294 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+from ..models.task import Task
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# Stored in place of a missing due date in integer timestamp columns
+NO_DUE = -2**63
+
+
+def to_micros(value: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since the epoch."""
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """Convert integer microseconds since the epoch back to a datetime."""
+    return EPOCH + timedelta(microseconds=value)
+
+
+def due_to_micros(value: Optional[datetime]) -> int:
+    """Convert an optional due date to microseconds, NO_DUE for none."""
+    return NO_DUE if value is None else to_micros(value)
+
+
+def due_from_micros(value: int) -> Optional[datetime]:
+    """Convert the output of due_to_micros() back to an optional due date."""
+    return None if value == NO_DUE else from_micros(value)
+
+
+class ColumnarTaskStore:
+    """
+    Memory-lean, column-oriented task storage:
+    - IDs, timestamps, due dates, priorities and string offsets in typed
+      array buffers
+    - Completed and deleted flags as bitsets
+    - Titles and descriptions in one UTF-8 string pool
+
+    Rows are appended in ID order, so lookups bisect the ID column instead
+    of keeping a per-task dict entry. Deletes leave tombstones and edits
+    append new text to the pool; both are reclaimed by compact(), which
+    runs automatically once more than half the store is garbage.
+
+    get() returns a fresh Task view built from the row. Changes to a view
+    are only stored once it is passed back to save().
+    """
+
+    COMPACT_MIN_ROWS = 1024
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._ids = array("q")
+        self._created = array("q")
+        self._updated = array("q")
+        self._due = array("q")  # NO_DUE means no due date
+        self._priority = array("b")
+        self._text_offset = array("Q")
+        self._title_length = array("l")
+        self._description_length = array("l")  # -1 means no description
+        self._completed = bytearray()
+        self._deleted = bytearray()
+        self._pool = bytearray()
+        self._rows = 0
+        self._deleted_rows = 0
+        self._garbage = 0
+
+    # Bitset helpers
+
+    @staticmethod
+    def _get_bit(bits: bytearray, row: int) -> bool:
+        return bool(bits[row >> 3] & (1 << (row & 7)))
+
+    @staticmethod
+    def _set_bit(bits: bytearray, row: int, value: bool):
+        if value:
+            bits[row >> 3] |= 1 << (row & 7)
+        else:
+            bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    # Row helpers
+
+    def _find_row(self, task_id: int) -> int:
+        """Return the row holding task_id, or -1 if it is absent."""
+        row = bisect_left(self._ids, task_id, 0, self._rows)
+        if row < self._rows and self._ids[row] == task_id and not self._get_bit(self._deleted, row):
+            return row
+        return -1
+
+    def _write_text(self, row: int, title: str, description: Optional[str]):
+        """Append a task's text to the pool and point the row at it."""
+        encoded_title = title.encode("utf-8")
+        encoded_description = description.encode("utf-8") if description is not None else b""
+        self._text_offset[row] = len(self._pool)
+        self._title_length[row] = len(encoded_title)
+        self._description_length[row] = len(encoded_description) if description is not None else -1
+        self._pool += encoded_title
+        self._pool += encoded_description
+
+    def _text_size(self, row: int) -> int:
+        return self._title_length[row] + max(self._description_length[row], 0)
+
+    def _view(self, row: int) -> Task:
+        """Build a Task view of a row."""
+        offset = self._text_offset[row]
+        title_end = offset + self._title_length[row]
+        description_length = self._description_length[row]
+        description = None
+        if description_length >= 0:
+            description = self._pool[title_end:title_end + description_length].decode("utf-8")
+        return Task(
+            id=self._ids[row],
+            title=self._pool[offset:title_end].decode("utf-8"),
+            description=description,
+            completed=self._get_bit(self._completed, row),
+            created_at=from_micros(self._created[row]),
+            updated_at=from_micros(self._updated[row]),
+            due_at=due_from_micros(self._due[row]),
+            priority=self._priority[row],
+        )
+
+    # Store interface
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Get a task view by its ID."""
+        row = self._find_row(task_id)
+        if row < 0:
+            return None
+        return self._view(row)
+
+    def add(self, task: Task):
+        """Append a newly created task."""
+        if self._rows and task.id <= self._ids[self._rows - 1]:
+            raise ValueError("Tasks must be added in increasing ID order")
+
+        row = self._rows
+        self._ids.append(task.id)
+        self._created.append(to_micros(task.created_at))
+        self._updated.append(to_micros(task.updated_at))
+        self._due.append(due_to_micros(task.due_at))
+        self._priority.append(task.priority)
+        self._text_offset.append(0)
+        self._title_length.append(0)
+        self._description_length.append(0)
+        if row % 8 == 0:
+            self._completed.append(0)
+            self._deleted.append(0)
+        self._write_text(row, task.title, task.description)
+        self._set_bit(self._completed, row, task.completed)
+        self._rows += 1
+
+    def insert(self, task: Task):
+        """
+        Store a task under an unused ID below the newest one, e.g. to restore it.
+
+        A tombstone left by the task's deletion is revived in place;
+        after compaction the row is inserted in ID order, which shifts
+        every later row and costs O(n).
+        """
+        if not self._rows or task.id > self._ids[self._rows - 1]:
+            self.add(task)
+            return
+        row = bisect_left(self._ids, task.id, 0, self._rows)
+        if self._ids[row] == task.id:
+            if not self._get_bit(self._deleted, row):
+                raise ValueError(f"Task {task.id} already exists")
+            self._set_bit(self._deleted, row, False)
+            self._deleted_rows -= 1
+        else:
+            completed = [self._get_bit(self._completed, r) for r in range(self._rows)]
+            deleted = [self._get_bit(self._deleted, r) for r in range(self._rows)]
+            completed.insert(row, False)
+            deleted.insert(row, False)
+            for column in (self._ids, self._created, self._updated, self._due, self._priority,
+                           self._text_offset, self._title_length, self._description_length):
+                column.insert(row, 0)
+            self._ids[row] = task.id
+            self._rows += 1
+            self._completed = bytearray((self._rows + 7) // 8)
+            self._deleted = bytearray((self._rows + 7) // 8)
+            for r in range(self._rows):
+                if completed[r]:
+                    self._set_bit(self._completed, r, True)
+                if deleted[r]:
+                    self._set_bit(self._deleted, r, True)
+
+        self._write_text(row, task.title, task.description)
+        self._created[row] = to_micros(task.created_at)
+        self._updated[row] = to_micros(task.updated_at)
+        self._due[row] = due_to_micros(task.due_at)
+        self._priority[row] = task.priority
+        self._set_bit(self._completed, row, task.completed)
+
+    def save(self, task: Task):
+        """Write a modified task view back to its row."""
+        row = self._find_row(task.id)
+        if row < 0:
+            raise KeyError(task.id)
+
+        offset = self._text_offset[row]
+        title_end = offset + self._title_length[row]
+        description_length = self._description_length[row]
+        old_description = None
+        if description_length >= 0:
+            old_description = self._pool[title_end:title_end + description_length].decode("utf-8")
+        if task.title != self._pool[offset:title_end].decode("utf-8") or task.description != old_description:
+            self._garbage += self._text_size(row)
+            self._write_text(row, task.title, task.description)
+
+        self._set_bit(self._completed, row, task.completed)
+        self._updated[row] = to_micros(task.updated_at)
+        self._due[row] = due_to_micros(task.due_at)
+        self._priority[row] = task.priority
+        self._maybe_compact()
+
+    def remove(self, task_id: int) -> bool:
+        """Delete a task by marking its row as a tombstone."""
+        row = self._find_row(task_id)
+        if row < 0:
+            return False
+
+        self._set_bit(self._deleted, row, True)
+        self._deleted_rows += 1
+        self._garbage += self._text_size(row)
+        self._maybe_compact()
+        return True
+
+    def iter_from(self, after_id: int = 0) -> Iterator[Task]:
+        """Iterate task views with an ID greater than after_id, in ID order."""
+        row = bisect_right(self._ids, after_id, 0, self._rows)
+        while row < self._rows:
+            task_id = self._ids[row]
+            if not self._get_bit(self._deleted, row):
+                yield self._view(row)
+                if row >= self._rows or self._ids[row] != task_id:
+                    # Compacted while the caller held the iterator
+                    row = bisect_right(self._ids, task_id, 0, self._rows) - 1
+            row += 1
+
+    def __contains__(self, task_id: int) -> bool:
+        return self._find_row(task_id) >= 0
+
+    def __len__(self) -> int:
+        return self._rows - self._deleted_rows
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.iter_from(0)
+
+    # Maintenance
+
+    def _maybe_compact(self):
+        """Compact once tombstones or stale text make up half the store."""
+        if self._rows < self.COMPACT_MIN_ROWS:
+            return
+        if self._deleted_rows * 2 > self._rows or self._garbage * 2 > len(self._pool):
+            self.compact()
+
+    def compact(self):
+        """Drop deleted rows and rewrite the string pool without stale text."""
+        keep = [row for row in range(self._rows) if not self._get_bit(self._deleted, row)]
+        completed = [self._get_bit(self._completed, row) for row in keep]
+
+        pool = bytearray()
+        offsets = array("Q")
+        for row in keep:
+            offset = self._text_offset[row]
+            offsets.append(len(pool))
+            pool += self._pool[offset:offset + self._text_size(row)]
+
+        self._ids = array("q", [self._ids[row] for row in keep])
+        self._created = array("q", [self._created[row] for row in keep])
+        self._updated = array("q", [self._updated[row] for row in keep])
+        self._due = array("q", [self._due[row] for row in keep])
+        self._priority = array("b", [self._priority[row] for row in keep])
+        self._title_length = array("l", [self._title_length[row] for row in keep])
+        self._description_length = array("l", [self._description_length[row] for row in keep])
+        self._text_offset = offsets
+        self._pool = pool
+        self._rows = len(keep)
+        self._deleted_rows = 0
+        self._garbage = 0
+        self._completed = bytearray((self._rows + 7) // 8)
+        self._deleted = bytearray((self._rows + 7) // 8)
+        for row, done in enumerate(completed):
+            if done:
+                self._set_bit(self._completed, row, True)
+
+    def memory_usage(self) -> int:
+        """Return the number of bytes held by the column buffers."""
+        columns = (self._ids, self._created, self._updated, self._due, self._priority,
+                   self._text_offset, self._title_length, self._description_length)
+        return (sum(column.buffer_info()[1] * column.itemsize for column in columns)
+                + len(self._completed) + len(self._deleted) + len(self._pool))
@@ -0,0 +1,250 @@
+import json
+import os
+import threading
+from heapq import merge
+from typing import Dict, Iterator, Optional
+from ..models.task import Task
+from .mapped import MappedSnapshot, write_snapshot
+from .persistence import SYNC_MODES, Persistence
+
+
+class JournalPersistence(Persistence):
+    """
+    Durable append-only journal with snapshot compaction:
+    - Every mutation appends one JSON line to journal.jsonl
+    - Writes are fsynced per operation, per batch (group commit) or never
+    - A snapshot of the live tasks periodically replaces the journal
+    - Snapshots are JSON Lines, or with snapshot_format="binary" a
+      memory-mapped binary file (see storage.mapped)
+
+    Each record carries the full post-image of the task, so replay is a
+    sequence of idempotent upserts and deletes. At startup the snapshot is
+    loaded and only the journal written since then is replayed, keeping
+    recovery proportional to the live data rather than the full history.
+
+    A binary snapshot is attached to a MappedTaskStore without decoding
+    it, so such a store is usable as soon as the journal tail has been
+    replayed. To keep that tail short, closing with a binary snapshot
+    compacts once snapshot_min_records records have accumulated. Other
+    stores load a binary snapshot eagerly, which is still faster than
+    parsing JSON.
+
+    Sync modes:
+    - "always": fsync after every record
+    - "batch": buffer records and fsync once per batch_size records or
+      every batch_interval seconds, whichever comes first
+    - "none": leave flushing to the operating system
+    """
+
+    SYNC_MODES = SYNC_MODES
+    JOURNAL_FILE = "journal.jsonl"
+    SNAPSHOT_FILE = "snapshot.jsonl"
+    BINARY_SNAPSHOT_FILE = "snapshot.bin"
+    SNAPSHOT_FORMATS = ("json", "binary")
+
+    def __init__(self, directory: str, sync: str = "batch", batch_size: int = 256,
+                 batch_interval: float = 0.05, snapshot_min_records: int = 10_000,
+                 snapshot_format: str = "json"):
+        """Open (or create) a journal in `directory`."""
+        if sync not in self.SYNC_MODES:
+            raise ValueError(f"sync must be one of {', '.join(self.SYNC_MODES)}")
+        if snapshot_format not in self.SNAPSHOT_FORMATS:
+            raise ValueError(f"snapshot_format must be one of {', '.join(self.SNAPSHOT_FORMATS)}")
+
+        self.directory = directory
+        self.sync = sync
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.snapshot_min_records = snapshot_min_records
+        self.snapshot_format = snapshot_format
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self.json_snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.binary_snapshot_path = os.path.join(directory, self.BINARY_SNAPSHOT_FILE)
+        self.snapshot_path = self.binary_snapshot_path if snapshot_format == "binary" else self.json_snapshot_path
+
+        self.service = None
+        self.records_since_snapshot = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    # Recovery
+
+    @staticmethod
+    def _read_lines(path: str) -> Iterator[dict]:
+        """Yield decoded JSON lines, stopping at a torn final write."""
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Only the last line can be partially written by a crash
+                    break
+
+    def load(self, service):
+        """Rebuild the service from the snapshot and the journal tail."""
+        # Tasks from a JSON snapshot and the journal; None marks a deletion
+        tasks: Dict[int, Optional[Task]] = {}
+        next_id = 1
+
+        # Whichever format the last snapshot was written in is loaded
+        mapped = None
+        if os.path.exists(self.binary_snapshot_path):
+            mapped = MappedSnapshot(self.binary_snapshot_path)
+            next_id = mapped.next_id
+        for position, data in enumerate(self._read_lines(self.json_snapshot_path)):
+            if position == 0:
+                next_id = data["next_id"]
+            else:
+                tasks[data["id"]] = Task.from_dict(data)
+
+        for record in self._read_lines(self.journal_path):
+            self.records_since_snapshot += 1
+            if record["op"] == "delete":
+                tasks[record["id"]] = None
+                next_id = max(next_id, record["id"] + 1)
+            else:
+                task = Task.from_dict(record["task"])
+                tasks[task.id] = task
+                next_id = max(next_id, task.id + 1)
+
+        store = service.store
+        if mapped is not None and hasattr(store, "attach"):
+            store.attach(mapped)
+            for task_id in sorted(tasks):
+                task = tasks[task_id]
+                if task is None:
+                    store.remove(task_id)
+                elif task_id in store:
+                    store.save(task)
+                else:
+                    store.insert(task)
+        else:
+            changed = [tasks[task_id] for task_id in sorted(tasks) if tasks[task_id] is not None]
+            base = () if mapped is None else (task for task in mapped if task.id not in tasks)
+            for task in merge(base, changed, key=lambda task: task.id):
+                store.add(task)
+            if mapped is not None:
+                mapped.close()
+        service.next_id = next_id
+        self.service = service
+
+        if self.sync == "batch":
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    # Recording
+
+    def record(self, op: str, task: Task):
+        """Append the post-image of a task changed by `op`."""
+        self._append({"op": op, "task": task.to_dict()})
+
+    def record_delete(self, task_id: int):
+        """Append a delete record."""
+        self._append({"op": "delete", "id": task_id})
+
+    def _append(self, record: dict):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self.sync == "batch":
+                self._buffer.append(line)
+                if len(self._buffer) >= self.batch_size:
+                    self._flush_locked()
+            else:
+                self._journal.write(line)
+                if self.sync == "always":
+                    self._journal.flush()
+                    os.fsync(self._journal.fileno())
+            self.records_since_snapshot += 1
+
+        self._maybe_snapshot()
+
+    def _flush_locked(self):
+        """Write buffered records and fsync them as one group commit."""
+        if self._buffer:
+            self._journal.write("".join(self._buffer))
+            self._buffer.clear()
+        self._journal.flush()
+        if self.sync != "none":
+            os.fsync(self._journal.fileno())
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.batch_interval):
+            with self._lock:
+                if self._buffer:
+                    self._flush_locked()
+
+    def flush(self):
+        """Force buffered records to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    # Compaction
+
+    def _maybe_snapshot(self):
+        """Snapshot once the journal is larger than the live data."""
+        if self.service is None:
+            return
+        threshold = max(self.snapshot_min_records, 2 * len(self.service.store))
+        if self.records_since_snapshot >= threshold:
+            self.snapshot()
+
+    def snapshot(self):
+        """Write all live tasks to a new snapshot and truncate the journal."""
+        temporary_path = self.snapshot_path + ".tmp"
+        store = self.service.store
+        with self._lock:
+            self._flush_locked()
+            if self.snapshot_format == "binary":
+                write_snapshot(temporary_path, store, self.service.next_id)
+            else:
+                with open(temporary_path, "w", encoding="utf-8") as handle:
+                    handle.write(json.dumps({"next_id": self.service.next_id}) + "\n")
+                    for task in store:
+                        handle.write(json.dumps(task.to_dict(), separators=(",", ":")) + "\n")
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            os.replace(temporary_path, self.snapshot_path)
+            # A snapshot left in the other format is now stale
+            for path in (self.json_snapshot_path, self.binary_snapshot_path):
+                if path != self.snapshot_path and os.path.exists(path):
+                    os.remove(path)
+            self._fsync_directory()
+            if self.snapshot_format == "binary" and hasattr(store, "attach"):
+                # The new file holds everything, so the overlay can go
+                store.attach(MappedSnapshot(self.snapshot_path))
+
+            # Records in the old journal are already reflected in the snapshot
+            self._journal.close()
+            self._journal = open(self.journal_path, "w", encoding="utf-8")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self.records_since_snapshot = 0
+
+    def _fsync_directory(self):
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def close(self):
+        """Flush outstanding records and close the journal."""
+        if (self.snapshot_format == "binary" and self.service is not None
+                and self.records_since_snapshot >= self.snapshot_min_records):
+            self.snapshot()
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._journal.closed:
+                self._flush_locked()
+                self._journal.close()
@@ -0,0 +1,282 @@
+import mmap
+import os
+import struct
+from heapq import merge
+from typing import Iterable, Iterator, Optional, Set, Tuple
+from ..models.task import Task
+from .columnar import NO_DUE, due_from_micros, due_to_micros, from_micros, to_micros
+from .memory import DictTaskStore
+
+# Binary snapshot layout, all little-endian:
+# - Header: magic, version, record size, record count, next_id,
+#   string heap offset and string heap size
+# - Record table: one fixed-width record per task, in ID order:
+#   id, created_at, updated_at and due_at (microseconds since the epoch,
+#   NO_DUE for no due date), offset of the task's text in the heap,
+#   title length, description length (-1 for none), completed flag and
+#   priority
+# - String heap: each task's UTF-8 title followed by its description
+MAGIC = b"TODOSNAP"
+VERSION = 2
+HEADER = struct.Struct("<8sIIqqqq")
+RECORD = struct.Struct("<qqqqQiiBb6x")
+# Version 1 records, written before due dates and priorities, have no
+# due_at or priority; they are still read
+RECORDS = {1: struct.Struct("<qqqQiiB7x"), 2: RECORD}
+TASK_ID = struct.Struct("<q")
+# Records decoded per read while iterating
+READ_CHUNK = 1024
+
+
+def _pack(tasks: Iterable[Task], next_id: int) -> Tuple[bytes, bytearray, bytearray]:
+    """Return the header, record table and string heap for tasks in ID order."""
+    table = bytearray()
+    heap = bytearray()
+    pack = RECORD.pack
+    count = 0
+    for task in tasks:
+        title = task.title.encode("utf-8")
+        description = task.description.encode("utf-8") if task.description is not None else b""
+        table += pack(task.id, to_micros(task.created_at), to_micros(task.updated_at),
+                      due_to_micros(task.due_at), len(heap), len(title),
+                      len(description) if task.description is not None else -1,
+                      task.completed, task.priority)
+        heap += title
+        heap += description
+        count += 1
+
+    header = HEADER.pack(MAGIC, VERSION, RECORD.size, count, next_id, HEADER.size + len(table), len(heap))
+    return header, table, heap
+
+
+def pack_snapshot(tasks: Iterable[Task], next_id: int = 0) -> bytes:
+    """Return tasks, which must come in increasing ID order, as snapshot bytes."""
+    return b"".join(_pack(tasks, next_id))
+
+
+def write_snapshot(path: str, tasks: Iterable[Task], next_id: int):
+    """
+    Write tasks, which must come in increasing ID order, as a binary
+    snapshot at `path`.
+
+    The table and heap are built in memory and written in one pass, so
+    the caller should write to a temporary path and rename it into place.
+    """
+    with open(path, "wb") as handle:
+        for part in _pack(tasks, next_id):
+            handle.write(part)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+class SnapshotView:
+    """
+    Read-only view of binary snapshot bytes:
+    - Opening reads only the header, whatever the number of tasks
+    - Tasks are decoded from their record and text on access
+    - Lookups bisect the record table, which is in ID order
+    """
+
+    def __init__(self, buffer, name: str = "snapshot"):
+        """View `buffer` (bytes or a mmap); raise ValueError if it is not a snapshot."""
+        self._map = buffer
+        size = len(buffer)
+        if size < HEADER.size:
+            raise ValueError(f"{name} is not a task snapshot")
+        magic, version, record_size, count, next_id, heap_offset, heap_size = HEADER.unpack_from(buffer)
+        record = RECORDS.get(version)
+        if magic != MAGIC or record is None or record_size != record.size:
+            raise ValueError(f"{name} is not a supported task snapshot version")
+        if heap_offset != HEADER.size + count * record.size or heap_offset + heap_size > size:
+            raise ValueError(f"{name} is truncated")
+        self.next_id = next_id
+        self._count = count
+        self._heap = heap_offset
+        self._record = record
+        if version == 1:
+            self._decode = self._decode_v1
+
+    def _decode(self, record: tuple) -> Task:
+        (task_id, created, updated, due, offset, title_length, description_length,
+         completed, priority) = record
+        start = self._heap + offset
+        title_end = start + title_length
+        description = None
+        if description_length >= 0:
+            description = self._map[title_end:title_end + description_length].decode("utf-8")
+        return Task(task_id, self._map[start:title_end].decode("utf-8"), description,
+                    bool(completed), from_micros(created), from_micros(updated),
+                    due_from_micros(due), priority)
+
+    def _decode_v1(self, record: tuple) -> Task:
+        task_id, created, updated, offset, title_length, description_length, completed = record
+        return self._decode((task_id, created, updated, NO_DUE, offset, title_length,
+                             description_length, completed, 0))
+
+    def _id_at(self, row: int) -> int:
+        return TASK_ID.unpack_from(self._map, HEADER.size + row * self._record.size)[0]
+
+    def _bisect(self, task_id: int, right: bool = False) -> int:
+        """Return the first row whose ID is >= task_id (> with `right`)."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            middle_id = self._id_at(middle)
+            if middle_id < task_id or (right and middle_id == task_id):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Decode the task with this ID, or return None."""
+        row = self._bisect(task_id)
+        if row < self._count and self._id_at(row) == task_id:
+            return self._decode(self._record.unpack_from(self._map, HEADER.size + row * self._record.size))
+        return None
+
+    def iter_from(self, after_id: int = 0) -> Iterator[Task]:
+        """Decode tasks with an ID greater than after_id, in ID order."""
+        row = self._bisect(after_id, right=True)
+        while row < self._count:
+            end = min(row + READ_CHUNK, self._count)
+            # A copied chunk, not a memoryview, so close() never finds the map exported
+            size = self._record.size
+            chunk = self._map[HEADER.size + row * size:HEADER.size + end * size]
+            for record in self._record.iter_unpack(chunk):
+                yield self._decode(record)
+            row = end
+
+    @property
+    def last_id(self) -> int:
+        """The highest ID in the snapshot, or 0 if it is empty."""
+        return self._id_at(self._count - 1) if self._count else 0
+
+    def __contains__(self, task_id: int) -> bool:
+        row = self._bisect(task_id)
+        return row < self._count and self._id_at(row) == task_id
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.iter_from(0)
+
+    def close(self):
+        """Release the buffer."""
+
+
+class MappedSnapshot(SnapshotView):
+    """
+    A snapshot file viewed through mmap. Pages are loaded by the
+    operating system as they are touched and are shared by every
+    process that maps the same file.
+    """
+
+    def __init__(self, path: str):
+        """Map the snapshot at `path`; raise ValueError if it is not one."""
+        self.path = path
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a task snapshot")
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            super().__init__(mapped, path)
+        except ValueError:
+            mapped.close()
+            raise
+
+    def close(self):
+        """Unmap the file."""
+        self._map.close()
+
+
+class MappedTaskStore:
+    """
+    Task storage over a memory-mapped binary snapshot:
+    - Tasks in the snapshot are decoded lazily from the mapped file, so a
+      store of millions of tasks is ready as soon as the file is mapped
+    - New and changed tasks live in a DictTaskStore overlay; a changed
+      or deleted snapshot task is hidden from the snapshot
+    - attach() swaps in a newer snapshot and empties the overlay
+
+    JournalPersistence attaches its binary snapshot at load time and
+    again after each compaction. get() returns a fresh Task for snapshot
+    tasks, so change them through save() like ColumnarTaskStore views.
+    """
+
+    def __init__(self, snapshot: Optional[MappedSnapshot] = None):
+        """Initialize a store over `snapshot`, or an empty one."""
+        self.snapshot = snapshot
+        self.overlay = DictTaskStore()
+        # Snapshot IDs overridden by the overlay or deleted
+        self.hidden: Set[int] = set()
+
+    def attach(self, snapshot: MappedSnapshot):
+        """Serve `snapshot`, which must hold everything in this store, as the new base."""
+        self.snapshot = snapshot
+        self.overlay = DictTaskStore()
+        self.hidden = set()
+
+    def _in_snapshot(self, task_id: int) -> bool:
+        return self.snapshot is not None and task_id in self.snapshot
+
+    # Store interface
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Get a task by its ID."""
+        task = self.overlay.get(task_id)
+        if task is not None or task_id in self.hidden or self.snapshot is None:
+            return task
+        return self.snapshot.get(task_id)
+
+    def add(self, task: Task):
+        """Store a newly created task."""
+        if self.snapshot is not None and task.id <= self.snapshot.last_id:
+            raise ValueError("Tasks must be added in increasing ID order")
+        self.overlay.add(task)
+
+    def insert(self, task: Task):
+        """Store a task under an unused ID below the newest one, e.g. to restore it."""
+        if task.id in self:
+            raise ValueError(f"Task {task.id} already exists")
+        self.overlay.insert(task)
+
+    def save(self, task: Task):
+        """Write a changed task; a snapshot task moves to the overlay."""
+        if task.id not in self.overlay.tasks:
+            if task.id in self.hidden or not self._in_snapshot(task.id):
+                raise KeyError(task.id)
+            self.hidden.add(task.id)
+            self.overlay.insert(task)
+            return
+        self.overlay.save(task)
+
+    def remove(self, task_id: int) -> bool:
+        """Remove a task by its ID."""
+        if self.overlay.remove(task_id):
+            return True
+        if task_id in self.hidden or not self._in_snapshot(task_id):
+            return False
+        self.hidden.add(task_id)
+        return True
+
+    def iter_from(self, after_id: int = 0) -> Iterator[Task]:
+        """Iterate tasks with an ID greater than after_id, in ID order."""
+        if self.snapshot is None:
+            return self.overlay.iter_from(after_id)
+        hidden = self.hidden
+        base = (task for task in self.snapshot.iter_from(after_id) if task.id not in hidden)
+        return merge(base, self.overlay.iter_from(after_id), key=lambda task: task.id)
+
+    def __contains__(self, task_id: int) -> bool:
+        if task_id in self.overlay.tasks:
+            return True
+        return task_id not in self.hidden and self._in_snapshot(task_id)
+
+    def __len__(self) -> int:
+        base = len(self.snapshot) if self.snapshot is not None else 0
+        return base - len(self.hidden) + len(self.overlay)
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.iter_from(0)
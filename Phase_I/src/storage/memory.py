@@ -0,0 +1,90 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, Optional
+from ..models.task import Task
+
+
+class DictTaskStore:
+    """
+    Default in-memory task storage:
+    - Tasks keyed by ID in a dict for O(1) get, add, save and remove
+    - A sorted array of IDs for ordered iteration and cursor seeks
+
+    Every task store exposes the same small interface (get, add, insert,
+    save, remove, iter_from, len, iteration) so TaskService can run on any of
+    them.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.tasks: Dict[int, Task] = {}
+        # IDs in ascending order; removed IDs stay until the next compaction
+        self._order = array("q")
+        self._removed = 0
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Get a task by its ID."""
+        return self.tasks.get(task_id)
+
+    def add(self, task: Task):
+        """Store a newly created task."""
+        if self._order and task.id <= self._order[-1]:
+            raise ValueError("Tasks must be added in increasing ID order")
+        self.tasks[task.id] = task
+        self._order.append(task.id)
+
+    def insert(self, task: Task):
+        """Store a task under an unused ID below the newest one, e.g. to restore it."""
+        if not self._order or task.id > self._order[-1]:
+            self.add(task)
+            return
+        if task.id in self.tasks:
+            raise ValueError(f"Task {task.id} already exists")
+
+        self.tasks[task.id] = task
+        position = bisect_left(self._order, task.id)
+        if self._order[position] == task.id:
+            # Its ID is still in the order array from before removal
+            self._removed -= 1
+        else:
+            self._order.insert(position, task.id)
+
+    def save(self, task: Task):
+        """Persist changes made to a task returned by get()."""
+        # Tasks are stored by reference, so there is nothing to write back.
+        self.tasks[task.id] = task
+
+    def remove(self, task_id: int) -> bool:
+        """Remove a task by its ID."""
+        if self.tasks.pop(task_id, None) is None:
+            return False
+
+        self._removed += 1
+        if self._removed * 2 > len(self._order):
+            self._order = array("q", sorted(self.tasks))
+            self._removed = 0
+        return True
+
+    def iter_from(self, after_id: int = 0) -> Iterator[Task]:
+        """Iterate tasks with an ID greater than after_id, in ID order."""
+        order = self._order
+        position = bisect_right(order, after_id)
+        while position < len(order):
+            task_id = order[position]
+            position += 1
+            task = self.tasks.get(task_id)
+            if task is not None:
+                yield task
+                if order is not self._order:
+                    # Compacted while the caller held the iterator
+                    order = self._order
+                    position = bisect_right(order, task_id)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self.tasks
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.iter_from(0)
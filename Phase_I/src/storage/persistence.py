@@ -0,0 +1,29 @@
+from ..models.task import Task
+
+# fsync modes of JournalPersistence, here so the CLI can offer them without importing it
+SYNC_MODES = ("always", "batch", "none")
+
+
+class Persistence:
+    """
+    Base class for TaskService persistence layers:
+    - load() restores tasks and next_id into a service at startup
+    - record() is called after every add/update/complete/incomplete
+    - record_delete() is called after every delete
+    - close() flushes outstanding writes at shutdown
+
+    The base class keeps nothing, which matches the default in-memory
+    behaviour.
+    """
+
+    def load(self, service):
+        """Restore persisted state into the service."""
+
+    def record(self, op: str, task: Task):
+        """Record the new state of a task after operation `op`."""
+
+    def record_delete(self, task_id: int):
+        """Record that a task was deleted."""
+
+    def close(self):
+        """Flush outstanding writes and release resources."""
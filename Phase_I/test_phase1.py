@@ -1,8 +1,25 @@
 """
 Test script for Phase I Todo Console App
 """
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from contextlib import redirect_stderr, redirect_stdout
+from urllib.parse import quote
+
 from src.services.task_service import TaskService
+from src.services.sqlite_task_service import SqliteTaskService
+from src.services.threadsafe import ThreadSafeTaskService
+from src.services.sharded import ShardedTaskService
 from src.cli.console import ConsoleInterface
+from src.cli.batch import BatchRunner, open_batch_source
+from src.services.indexes import SortedKeyList
+from src.api.server import TaskAPI, TaskAPIServer
+from src.storage import ColumnarTaskStore, JournalPersistence, MappedSnapshot, MappedTaskStore, TaskArchive
 
 
 def test_task_operations():
@@ -38,7 +55,8 @@ def test_task_operations():
 
     # Test updating a task
     print("\n4. Testing update_task functionality:")
-    updated_task = task_service.update_task(task2.id, "Complete Phase I project", "Finish the console app implementation")
+    updated_task = task_service.update_task(task2.id, "Complete Phase I project",
+                                            "Finish the console app implementation")
     if updated_task:
         print(f"   Updated task ID {updated_task.id}: {updated_task.title}")
         print(f"   New description: {updated_task.description}")
@@ -103,7 +121,1249 @@ def test_console_commands():
     print("✓ Command parsing tests completed!")
 
 
+def test_id_index():
+    """Test that ID lookups, deletes and ordering use the ID index."""
+    print("\nTesting TaskService ID index...")
+
+    task_service = TaskService()
+    for i in range(5):
+        task_service.add_task(f"Task {i}")
+
+    assert task_service.get_task_by_id(3).title == "Task 2"
+    assert task_service.delete_task(3)
+    assert not task_service.delete_task(3)
+    assert task_service.get_task_by_id(3) is None
+    assert [task.id for task in task_service.get_all_tasks()] == [1, 2, 4, 5]
+
+    task = task_service.add_task("Task 5")
+    assert task.id == 6
+    assert task_service.get_all_tasks()[-1] is task
+
+    print("✓ ID index tests completed!")
+
+
+def test_columnar_store():
+    """Test TaskService operations on the column-backed store."""
+    print("\nTesting ColumnarTaskStore...")
+
+    task_service = TaskService(ColumnarTaskStore())
+    first = task_service.add_task("Buy groceries", "Milk, eggs, bread")
+    task_service.add_task("Write report")
+
+    task_service.update_task(first.id, "Buy fruit", "Apples")
+    task_service.mark_task_complete(first.id)
+    stored = task_service.get_task_by_id(first.id)
+    assert (stored.title, stored.description, stored.completed) == ("Buy fruit", "Apples", True)
+    assert stored.created_at == first.created_at
+    assert task_service.get_task_by_id(2).description is None
+
+    # Deleting most rows triggers compaction; survivors keep their data
+    for i in range(2000):
+        task_service.add_task(f"Bulk {i}")
+    for task_id in range(3, 1900):
+        assert task_service.delete_task(task_id)
+    assert len(task_service.store) == 105
+    assert task_service.get_task_by_id(first.id).title == "Buy fruit"
+    assert task_service.get_task_by_id(1950).title == "Bulk 1947"
+    assert task_service.get_task_by_id(100) is None
+
+    print("✓ ColumnarTaskStore tests completed!")
+
+
+def test_journal_persistence():
+    """Test that a journaled service survives a restart."""
+    print("\nTesting JournalPersistence...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        task_service = TaskService(persistence=JournalPersistence(directory, snapshot_min_records=5))
+        for i in range(6):
+            task_service.add_task(f"Task {i}", "Details")
+        task_service.update_task(2, "Renamed")
+        task_service.mark_task_complete(3)
+        task_service.delete_task(6)
+        task_service.close()
+
+        restored = TaskService(persistence=JournalPersistence(directory))
+        assert [task.id for task in restored.get_all_tasks()] == [1, 2, 3, 4, 5]
+        assert restored.get_task_by_id(2).title == "Renamed"
+        assert restored.get_task_by_id(3).completed
+        assert restored.next_id == 7
+        assert restored.add_task("After restart").id == 7
+        restored.close()
+
+    print("✓ JournalPersistence tests completed!")
+
+
+def test_sqlite_engine():
+    """Test the SQLite engine, including bulk methods and reopening."""
+    print("\nTesting SqliteTaskService...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "todo.db")
+        task_service = SqliteTaskService(path)
+        task = task_service.add_task("Buy groceries", "Milk, eggs, bread")
+        tasks = task_service.add_many([("Task A", None), ("Task B", "Details")])
+        assert [t.id for t in tasks] == [2, 3]
+
+        results = task_service.update_many([(2, "Task A2", None), (99, "Missing", None)])
+        assert results[0].title == "Task A2" and results[1] is None
+        assert task_service.mark_task_complete(task.id).completed
+        assert task_service.delete_task(3)
+        assert not task_service.delete_task(3)
+        task_service.close()
+
+        reopened = SqliteTaskService(path)
+        assert [t.id for t in reopened.get_all_tasks()] == [1, 2]
+        assert reopened.get_task_by_id(1).completed
+        assert reopened.get_task_by_id(2).title == "Task A2"
+        assert reopened.add_task("Next").id == 4
+        reopened.close()
+
+    print("✓ SqliteTaskService tests completed!")
+
+
+def test_paginated_listing():
+    """Test cursor/offset pagination and the paged list command."""
+    print("\nTesting paginated listing...")
+
+    for task_service in (TaskService(), TaskService(ColumnarTaskStore())):
+        for i in range(10):
+            task_service.add_task(f"Task {i}")
+        task_service.delete_task(4)
+
+        assert [t.id for t in task_service.iter_tasks(limit=3)] == [1, 2, 3]
+        assert [t.id for t in task_service.iter_tasks(after_id=3, limit=3)] == [5, 6, 7]
+        assert [t.id for t in task_service.iter_tasks(limit=3, offset=6)] == [8, 9, 10]
+
+        console = ConsoleInterface(task_service)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            console.execute_command(*console.parse_command("list --page 2 --limit 3"))
+        assert "[5] Task 4" in output.getvalue() and "[8]" not in output.getvalue()
+        assert "list --page 3 --limit 3" in output.getvalue()
+
+    print("✓ Paginated listing tests completed!")
+
+
+def test_filtered_queries():
+    """Test indexed queries on completion status and timestamps."""
+    print("\nTesting filtered queries...")
+
+    keys = SortedKeyList([5, 1, 3])
+    keys.add(4)
+    keys.discard(3)
+    assert list(keys.irange(2, 5, inclusive=(True, False))) == [4]
+    assert list(keys.irange(reverse=True)) == [5, 4, 1]
+
+    task_service = TaskService()
+    for i in range(6):
+        task_service.add_task(f"Task {i}")
+    task_service.mark_task_complete(2)
+    task_service.mark_task_complete(5)
+    since = task_service.get_task_by_id(5).updated_at
+
+    assert [t.id for t in task_service.query(completed=False)] == [1, 3, 4, 6]
+    assert [t.id for t in task_service.query(completed=True, descending=True)] == [5, 2]
+
+    # Indexes follow later mutations
+    task_service.mark_task_incomplete(2)
+    task_service.delete_task(4)
+    task_service.update_task(6, "Edited")
+    assert [t.id for t in task_service.query(completed=False, limit=3)] == [1, 2, 3]
+    assert [t.id for t in task_service.query(updated_since=since)] == [2, 5, 6]
+    assert [t.id for t in task_service.query(updated_since=since, order_by="updated_at")] == [5, 2, 6]
+
+    # Console and API times with a UTC offset compare as naive local time
+    aware = since.astimezone().isoformat()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        ConsoleInterface(task_service).execute_command("list", ["--since", aware])
+        ConsoleInterface(task_service).execute_command("list", ["--created-since", aware])
+    assert "[2] Task 1" in output.getvalue() and "[6] Edited" in output.getvalue()
+    status, payload = TaskAPI(task_service).handle("GET", f"/tasks?updated_since={quote(aware)}", b"")
+    assert status == 200 and [task["id"] for task in payload["tasks"]] == [2, 5, 6]
+
+    print("✓ Filtered query tests completed!")
+
+
+def test_search():
+    """Test full-text search and its incremental maintenance."""
+    print("\nTesting search...")
+
+    task_service = TaskService()
+    task_service.add_task("Buy groceries", "Milk, eggs, bread")
+    task_service.add_task("Plan trip", "Book groceries delivery first")
+    task_service.add_task("Call the bank")
+
+    # Title matches rank above description matches; prefixes match too
+    assert [t.id for t in task_service.search("groceries")] == [1, 2]
+    assert [t.id for t in task_service.search("groc")] == [1, 2]
+    assert [t.id for t in task_service.search("groceries milk")] == [1]
+    assert task_service.search("nothing") == []
+
+    task_service.update_task(3, "Call the grocer")
+    task_service.delete_task(1)
+    assert [t.id for t in task_service.search("groc")] == [3, 2]
+    assert task_service.search("milk") == []
+
+    print("✓ Search tests completed!")
+
+
+def test_batch_mode():
+    """Test running a scripted command file in batch mode."""
+    print("\nTesting batch mode...")
+
+    task_service = TaskService()
+    console = ConsoleInterface(task_service)
+    script = [
+        '# setup',
+        'add "Task A" "First"',
+        'add "Task B"',
+        'add ""',
+        'complete 2',
+        'delete 42',
+        'add "Task C"',
+    ]
+    output, errors, summary = io.StringIO(), io.StringIO(), io.StringIO()
+    with redirect_stdout(output), redirect_stderr(errors):
+        error_count = BatchRunner(console).run(script, summary)
+
+    assert error_count == 2
+    assert [t.title for t in task_service.get_all_tasks()] == ["Task A", "Task B", "Task C"]
+    assert task_service.get_task_by_id(2).completed
+    assert output.getvalue() == ""
+    assert "line 4:" in errors.getvalue() and "line 6:" in errors.getvalue()
+    assert "6 commands" in summary.getvalue() and "2 errors" in summary.getvalue()
+    assert not console.quiet
+
+    # Adds with options are not bulk-applied without them
+    with redirect_stdout(output), redirect_stderr(errors):
+        BatchRunner(console).run(['add "Pay rent" --priority 8 --due 2h', 'add "Task D"'], summary)
+    rent = task_service.get_task_by_id(4)
+    assert (rent.title, rent.description, rent.priority) == ("Pay rent", None, 8)
+    assert rent.due_at is not None and task_service.get_task_by_id(5).title == "Task D"
+
+    # Retried keyed adds and --unique adds create one task each
+    script = ['add "Retried" --key k1', 'add "Retried" --key k1', 'add "task d" --unique', 'add "Once" --unique']
+    with redirect_stdout(output), redirect_stderr(errors):
+        assert BatchRunner(console).run(script, summary) == 1
+    assert [(t.title, t.description) for t in task_service.get_all_tasks()[5:]] == [("Retried", None), ("Once", None)]
+
+    # Runs of complete/incomplete/delete are each applied with one bulk call
+    calls = Counter()
+    for name in ("complete_many", "incomplete_many", "delete_many"):
+        def counted(task_ids, name=name, method=getattr(task_service, name)):
+            calls[name] += 1
+            return method(task_ids)
+        setattr(task_service, name, counted)
+    script = ['complete 1', 'complete 3-4,99', 'complete 5', 'incomplete 1', 'incomplete 2',
+              'delete 6', 'delete 6', 'delete x', 'delete 7']
+    errors = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(errors):
+        assert BatchRunner(console).run(script, summary) == 3
+    assert calls == {"complete_many": 1, "incomplete_many": 1, "delete_many": 2}
+    assert [t.id for t in task_service.get_all_tasks() if t.completed] == [3, 4, 5]
+    assert [t.id for t in task_service.get_all_tasks()] == [1, 2, 3, 4, 5]
+    assert errors.getvalue().splitlines() == ["line 2: Tasks not found: 99", "line 7: Task with ID 6 not found",
+                                              "line 8: Task ID must be a number or a range such as 1-500, not 'x'"]
+
+    # Reading commands from stdin leaves stdin open
+    stdin = sys.stdin
+    with tempfile.TemporaryFile("w+") as handle:
+        handle.write('add "From stdin"\n')
+        handle.seek(0)
+        sys.stdin = handle
+        try:
+            with open_batch_source("-") as source, redirect_stdout(output), redirect_stderr(errors):
+                BatchRunner(console).run(source, summary)
+        finally:
+            sys.stdin = stdin
+        assert not handle.closed
+    assert task_service.get_task_by_id(8).title == "From stdin"
+
+    print("✓ Batch mode tests completed!")
+
+
+def test_import_export():
+    """Test CSV and JSON Lines import/export round trips."""
+    print("\nTesting import and export...")
+    from datetime import datetime
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.csv")
+        with open(source, "w", newline="") as handle:
+            handle.write("title,description,completed,created_at\n")
+            handle.write("Imported A,First,true,2025-05-01T08:30:00\n")
+            handle.write(",missing title,false,\n")
+            handle.write("Imported B,,false,\n")
+
+        task_service = TaskService()
+        task_service.add_task("Existing")
+        report = task_service.import_tasks(source, chunk_size=1)
+        assert (report.imported, report.rejected) == (2, 1)
+        assert report.errors[0].startswith("row 3:")
+
+        imported = task_service.get_task_by_id(2)
+        assert imported.title == "Imported A" and imported.completed
+        assert imported.created_at.isoformat() == "2025-05-01T08:30:00"
+        assert task_service.get_task_by_id(3).description is None
+
+        for name in ("tasks.jsonl", "tasks.csv"):
+            path = os.path.join(directory, name)
+            assert task_service.export_tasks(path) == 3
+            copy = TaskService()
+            assert copy.import_tasks(path).imported == 3
+            assert [(t.title, t.completed, t.created_at) for t in copy.get_all_tasks()] == \
+                [(t.title, t.completed, t.created_at) for t in task_service.get_all_tasks()]
+
+        # Offset-aware timestamps are converted to naive local time
+        source = os.path.join(directory, "aware.jsonl")
+        with open(source, "w") as handle:
+            handle.write('{"title": "UTC", "created_at": "2026-01-01T00:00:00+00:00"}\n')
+            handle.write('{"title": "Bad", "created_at": 5}\n')
+        for store in (None, ColumnarTaskStore()):
+            copy = TaskService(store)
+            copy.add_task("Local")
+            report = copy.import_tasks(source)
+            assert (report.imported, report.rejected) == (1, 1)
+            assert copy.get_task_by_id(2).created_at.tzinfo is None
+            assert len(copy.query(created_since=datetime(2025, 1, 1), order_by="created_at")) == 2
+
+        # Titles and descriptions that are not text are rejected rows
+        source = os.path.join(directory, "types.jsonl")
+        with open(source, "w") as handle:
+            handle.write('{"title": "t", "description": 5}\n')
+            handle.write('{"title": ["x"]}\n')
+            handle.write('{"title": "Text", "description": "Fine"}\n')
+        for store in (None, ColumnarTaskStore()):
+            copy = TaskService(store)
+            report = copy.import_tasks(source)
+            assert (report.imported, report.rejected) == (1, 2)
+            assert [error.split(":")[0] for error in report.errors] == ["row 1", "row 2"]
+            assert [task.title for task in copy.search("fine")] == ["Text"]
+
+    print("✓ Import and export tests completed!")
+
+
+def test_parser_and_dispatch():
+    """Test quoting and escapes in the tokenizer, and custom commands."""
+    print("\nTesting parser and command registry...")
+
+    console = ConsoleInterface(TaskService())
+    assert console.parse_command('ADD "Say \\"hi\\"" \'it\\\'s\'') == ("add", ['Say "hi"', "it's"])
+    assert console.parse_command('add "" "x"') == ("add", ["", "x"])
+    assert console.parse_command("  list   --page 2 ") == ("list", ["--page", "2"])
+    assert console.parse_command("") == ("", [])
+
+    calls = []
+    console.register_command("ping", lambda console, args: calls.append(args) or True)
+    assert console.execute_command(*console.parse_command('ping "a b" c'))
+    assert calls == [["a b", "c"]]
+    assert "ping" not in ConsoleInterface(TaskService()).commands
+    assert console.execute_command("quit", []) is False
+
+    print("✓ Parser and command registry tests completed!")
+
+
+def test_http_api():
+    """Test the JSON routes and keep-alive pipelining over a socket."""
+    print("\nTesting HTTP API...")
+
+    api = TaskAPI(TaskService())
+    status, task = api.handle("POST", "/tasks", b'{"title": "Buy milk"}')
+    assert status == 201 and task["id"] == 1
+    assert api.handle("POST", "/tasks/1/complete", b"")[1]["completed"]
+    assert api.handle("PATCH", "/tasks/1", b'{"title": ""}')[0] == 400
+    assert api.handle("GET", "/tasks?completed=true", b"")[1]["tasks"][0]["title"] == "Buy milk"
+    assert api.handle("DELETE", "/tasks/1", b"") == (204, None)
+    assert api.handle("GET", "/tasks/1", b"")[0] == 404
+    assert api.handle("GET", "/tasks/abc", b"")[0] == 400
+
+    # Bad fields are rejected before anything is applied; failures still get a response
+    assert api.handle("POST", "/tasks", b'{"title": "x", "description": 5}')[0] == 400
+    api.handle("POST", "/tasks", b'{"title": "Keep me"}')
+    assert api.handle("PATCH", "/tasks/2", b'{"title": "Changed", "priority": 12}')[0] == 400
+    assert api.handle("GET", "/tasks/2", b"")[1]["title"] == "Keep me"
+
+    # A PATCH of text and schedule is one change, undone as a whole
+    for service in (api.task_service, SqliteTaskService(":memory:")):
+        task_id = service.add_task("Plan").id
+        status, task = TaskAPI(service).handle("PATCH", f"/tasks/{task_id}",
+                                               b'{"title": "Plan trip", "priority": 5, "due_at": "2026-12-01"}')
+        assert status == 200 and (task["title"], task["priority"], task["due_at"]) == \
+            ("Plan trip", 5, "2026-12-01T00:00:00")
+        if hasattr(service, "undo"):
+            assert service.undo() == ("update", [task_id])
+            task = service.get_task_by_id(task_id)
+            assert (task.title, task.priority, task.due_at) == ("Plan", 0, None)
+            assert service.undo() == ("add", [task_id])
+    broken = TaskAPI(None)
+    with redirect_stderr(io.StringIO()):
+        assert broken.handle("GET", "/tasks/1", b"")[0] == 500
+
+    async def pipelined():
+        server = TaskAPIServer(TaskService(), port=0, workers=2)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        body = b'{"title": "Pipelined"}'
+        writer.write(b"POST /tasks HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+                     + b"GET /tasks/1 HTTP/1.1\r\n\r\n"
+                     + b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+        responses = (await reader.read()).split(b"HTTP/1.1 ")[1:]
+        writer.close()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"POST /tasks HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+        responses.append((await reader.read()).split(b"HTTP/1.1 ")[1])
+        writer.close()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /" + b"a" * 100_000 + b" HTTP/1.1\r\n\r\n")
+        responses.append((await reader.read()).split(b"HTTP/1.1 ")[1])
+        writer.close()
+        server.close()
+        return responses
+
+    responses = asyncio.run(pipelined())
+    assert responses.pop().startswith(b"414")
+    assert responses.pop().startswith(b"400")
+    assert [response.split(b" ")[0] for response in responses] == [b"201", b"200", b"200"]
+    assert json.loads(responses[1].split(b"\r\n\r\n", 1)[1])["title"] == "Pipelined"
+
+    print("✓ HTTP API tests completed!")
+
+
+def test_bulk_operations():
+    """Test the bulk mutation methods and ID-range console commands."""
+    print("\nTesting bulk operations...")
+
+    for task_service in (TaskService(), SqliteTaskService(":memory:")):
+        task_service.add_many((f"Task {i}", None) for i in range(1, 11))
+
+        completed = task_service.complete_many([1, 2, 3, 99])
+        assert [task.id if task else None for task in completed] == [1, 2, 3, None]
+        assert len({task.updated_at for task in completed if task}) == 1
+        assert [task.id for task in task_service.query(completed=True)] == [1, 2, 3]
+        assert [bool(task) for task in task_service.incomplete_many([3, 4])] == [True, True]
+
+        # One invalid title rejects the whole batch
+        try:
+            task_service.update_many([(1, "Fine", None), (2, "", None)])
+            assert False, "empty title should be rejected"
+        except ValueError as e:
+            assert str(e).startswith("Item 2:")
+        assert task_service.get_task_by_id(1).title == "Task 1"
+        updated = task_service.update_many([(1, "Renamed", "Note"), (42, "Missing", None)])
+        assert updated[0].title == "Renamed" and updated[1] is None
+
+        assert task_service.delete_many([5, 6, 5, 77]) == [True, True, False, False]
+        assert len(task_service.get_all_tasks()) == 8
+
+        console = ConsoleInterface(task_service)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            console.execute_command("complete", ["7-10,1"])
+            console.execute_command("delete", ["9", "10", "12"])
+            console.execute_command("complete", ["9-3"])
+        assert "5 tasks marked as complete!" in output.getvalue()
+        assert "Tasks not found: 12" in output.getvalue()
+        assert "must be ascending" in output.getvalue()
+        assert [task.id for task in task_service.query(completed=True)] == [1, 2, 7, 8]
+
+    print("✓ Bulk operation tests completed!")
+
+
+def test_undo_history():
+    """Test undo/redo, task history and the bounded operation log."""
+    print("\nTesting undo, redo and history...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        task_service = TaskService(persistence=JournalPersistence(directory, sync="none"))
+        task_service.add_task("Buy milk", "2L")
+        task_service.add_task("Walk the dog")
+        task_service.update_task(1, "Buy oat milk")
+        task_service.complete_many([1, 2])
+        task_service.delete_task(2)
+
+        history = list(task_service.task_history(2))
+        assert [op for op, _ in history] == ["delete", "complete", "add"]
+        assert history[0][1] is None and history[1][1].completed and not history[2][1].completed
+        assert [task.title for _, task in task_service.task_history(1)] == ["Buy oat milk", "Buy oat milk", "Buy milk"]
+
+        assert task_service.undo() == ("delete", [2])
+        assert task_service.get_task_by_id(2).completed
+        assert task_service.undo()[0] == "complete"
+        assert task_service.query(completed=True) == []
+        assert task_service.redo()[0] == "complete"
+        assert [task.id for task in task_service.query(completed=True)] == [1, 2]
+        assert task_service.undo() and task_service.undo() == ("update", [1])
+        assert task_service.get_task_by_id(1).title == "Buy milk"
+        assert task_service.search("oat") == []
+
+        # A new change discards the redo history
+        task_service.add_task("Fresh")
+        assert task_service.redo() is None
+        task_service.close()
+
+        # Restored and reverted tasks survive a restart through the journal
+        reopened = TaskService(persistence=JournalPersistence(directory, sync="none"))
+        assert [(task.id, task.title, task.completed) for task in reopened.get_all_tasks()] == [
+            (1, "Buy milk", False), (2, "Walk the dog", False), (3, "Fresh", False)]
+        reopened.close()
+
+    # Eviction: only the newest changes are kept, and a partly evicted call is not undone
+    task_service = TaskService(history_limit=3)
+    task_service.add_many([("A", None), ("B", None)])
+    task_service.mark_task_complete(1)
+    task_service.mark_task_complete(2)
+    assert task_service.undo() == ("complete", [2])
+    assert task_service.undo() == ("complete", [1])
+    assert task_service.undo() is None
+    assert len(task_service.get_all_tasks()) == 2
+    assert list(TaskService(history_limit=0).task_history(1)) == []
+
+    console = ConsoleInterface(task_service)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        console.execute_command("update", ["1", "Renamed"])
+        console.execute_command("history", ["1"])
+        console.execute_command("undo", [])
+    assert "History of task 1" in output.getvalue() and "update" in output.getvalue()
+    assert "Undid update of task 1" in output.getvalue()
+
+    print("✓ Undo, redo and history tests completed!")
+
+
+def test_event_bus():
+    """Test change events for sync, threaded and asyncio subscribers."""
+    import threading
+    print("\nTesting event bus...")
+
+    task_service = TaskService()
+    seen = []
+    task_service.events.subscribe(lambda batch: seen.extend((event.kind, event.task_id) for event in batch))
+    completions = []
+    task_service.events.subscribe(completions.extend, kinds={"completed"})
+
+    task_service.add_task("Buy milk")
+    task_service.add_many([("Walk", None), ("Read", None)])
+    task_service.update_task(1, "Buy oat milk")
+    task_service.complete_many([1, 2])
+    task_service.mark_task_incomplete(1)
+    task_service.delete_task(3)
+    task_service.undo()
+    assert seen == [("created", 1), ("created", 2), ("created", 3), ("updated", 1),
+                    ("completed", 1), ("completed", 2), ("reopened", 1), ("deleted", 3), ("created", 3)]
+    assert [event.task.title for event in completions] == ["Buy oat milk", "Walk"]
+
+    # Events carry copies, so later edits do not change delivered tasks
+    task_service.update_task(2, "Walk the dog")
+    assert completions[1].task.title == "Walk"
+
+    # A slow threaded subscriber gets batches, and a resync instead of stalling writers
+    release = threading.Event()
+    batches = []
+
+    def slow(batch):
+        release.wait(5)
+        batches.append([event.kind for event in batch])
+
+    subscription = task_service.events.subscribe_threaded(slow, batch_size=50, max_pending=100)
+    task_service.add_task("First")
+    task_service.add_many((f"Task {i}", None) for i in range(250))
+    release.set()
+    task_service.events.unsubscribe(subscription)
+    kinds = [kind for batch in batches for kind in batch]
+    assert "resync" in kinds and kinds[-1] == "created"
+    assert subscription.dropped > 0 and max(len(batch) for batch in batches) <= 51
+
+    async def watch():
+        received = []
+
+        async def callback(batch):
+            received.extend(event.task_id for event in batch)
+
+        subscription = task_service.events.subscribe_async(callback)
+        writer = threading.Thread(target=lambda: task_service.complete_many(range(1, 11)))
+        writer.start()
+        writer.join()
+        await asyncio.sleep(0.05)
+        task_service.events.unsubscribe(subscription)
+        return received
+
+    assert asyncio.run(watch()) == list(range(1, 11))
+    task_service.close()
+
+    print("✓ Event bus tests completed!")
+
+
+def test_thread_safe_service():
+    """Test concurrent writers and lock-free readers on ThreadSafeTaskService."""
+    import threading
+    print("\nTesting thread-safe service...")
+
+    task_service = ThreadSafeTaskService()
+    seen = [[] for _ in range(4)]
+    snapshots_ok = []
+
+    def write(slot):
+        for i in range(250):
+            task = task_service.add_task(f"Task {slot}-{i}")
+            held = task_service.get_task_by_id(task.id)
+            task_service.mark_task_complete(task.id)
+            assert not held.completed  # copy-on-write: readers' objects never change
+            seen[slot].append(task.id)
+
+    def read():
+        for _ in range(50):
+            ids = [task.id for task in task_service.get_all_tasks()]
+            snapshots_ok.append(ids == sorted(set(ids)))
+
+    threads = [threading.Thread(target=write, args=(slot,)) for slot in range(4)]
+    threads += [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [task_id for chunk in seen for task_id in chunk]
+    assert len(set(ids)) == len(ids) == 1000
+    assert all(snapshots_ok)
+    assert len(task_service.query(completed=True)) == 1000
+    assert [task.id for task in task_service.iter_tasks(after_id=998)] == [999, 1000]
+
+    # A restored task is listed in ID order, not at the end
+    task_service = ThreadSafeTaskService()
+    for i in range(5):
+        task_service.add_task(f"Task {i}")
+    task_service.delete_task(2)
+    task_service.undo()
+    assert [task.id for task in task_service.get_all_tasks()] == [1, 2, 3, 4, 5]
+    assert [task.id for task in task_service.iter_tasks(after_id=2)] == [3, 4, 5]
+    assert [task.id for task in task_service.iter_tasks(limit=2)] == [1, 2]
+
+    print("✓ Thread-safe service tests completed!")
+
+
+def test_sharded_service():
+    """Test the multi-process sharded service and its ordered merges."""
+    print("\nTesting sharded service...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        task_service = ShardedTaskService(3, data_dir=directory, sync="none")
+        try:
+            for i in range(1, 8):
+                task_service.add_task(f"Task {i}", "groceries" if i % 2 else None)
+            task_service.add_many([("Bulk A", None), ("Bulk B", None)])
+            assert [task.id for task in task_service.get_all_tasks()] == list(range(1, 10))
+
+            assert task_service.mark_task_complete(5).completed
+            assert task_service.update_task(6, "Renamed").title == "Renamed"
+            assert task_service.delete_task(9)
+            assert task_service.get_task_by_id(9) is None
+            try:
+                task_service.add_task("")
+                assert False, "empty title should be rejected by the shard"
+            except ValueError:
+                pass
+
+            assert [task.id for task in task_service.iter_tasks(after_id=2, limit=3, offset=1)] == [4, 5, 6]
+            assert [task.id for task in task_service.query(completed=False, descending=True, limit=3)] == [8, 7, 6]
+            assert [task.id for task in task_service.query(order_by="updated_at", descending=True, limit=2)] == [6, 5]
+            assert sorted(task.id for task in task_service.search("groc")) == [1, 3, 5, 7]
+            assert [bool(task) for task in task_service.complete_many([3, 9, 4])] == [True, False, True]
+            assert task_service.delete_many([9, 8]) == [False, True]
+        finally:
+            task_service.close()
+
+        # IDs are never reused after reopening, even when the last one was deleted
+        task_service = ShardedTaskService(3, data_dir=directory)
+        try:
+            assert len(task_service.get_all_tasks()) == 7
+            assert task_service.add_task("After restart").id == 10
+        finally:
+            task_service.close()
+
+    print("✓ Sharded service tests completed!")
+
+
+def test_render_cache():
+    """Test that listing reuses formatted tasks until they change or go away."""
+    print("\nTesting render cache...")
+
+    task_service = TaskService()
+    for title in ["Buy milk", "Walk", "Read"]:
+        task_service.add_task(title)
+    console = ConsoleInterface(task_service)
+
+    def listing():
+        output = io.StringIO()
+        with redirect_stdout(output):
+            console.display_tasks()
+        return output.getvalue()
+
+    first = listing()
+    assert sorted(console.rendered) == [1, 2, 3]
+    block = console.rendered[2][1]
+    assert listing() == first
+    assert console.rendered[2][1] is block
+
+    # An edit changes updated_at, so the task is formatted again
+    task_service.update_task(2, "Walk the dog")
+    assert "Walk the dog" in listing()
+    assert console.rendered[2][1] is not block
+
+    # Console deletes evict, and the console does not make the service publish events
+    console.execute_command("delete", ["1"])
+    assert sorted(console.rendered) == [2, 3]
+    assert task_service._events is None
+
+    # The cache is bounded, dropping its oldest blocks first
+    console.RENDER_CACHE_SIZE = 2
+    for title in ["Cook", "Sleep"]:
+        task_service.add_task(title)
+    assert "Sleep" in listing()
+    assert sorted(console.rendered) == [4, 5]
+
+    print("✓ Render cache tests completed!")
+
+
+def test_metrics_and_profiler():
+    """Test opt-in metrics, the stats command and the sampled profiler."""
+    import os
+    import tempfile
+    import time
+    from src.cli.profiler import SampledProfiler
+    from src.services.metrics import Metrics
+    print("\nTesting metrics and profiler...")
+
+    # Without metrics nothing is wrapped and stats explains why
+    task_service = TaskService()
+    assert "add_task" not in vars(task_service)
+    console = ConsoleInterface(task_service)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        console.execute_command("stats", [])
+    assert "not enabled" in output.getvalue()
+
+    metrics = Metrics()
+    task_service = metrics.instrument(TaskService())
+    console = ConsoleInterface(task_service, metrics)
+    task_service.add_task("Buy milk")
+    task_service.add_task("Walk")
+    try:
+        task_service.add_task("")
+    except ValueError:
+        pass
+    add = metrics.stats("service", "add_task")
+    assert add.count == 3 and add.errors == 1 and add.total > 0
+    assert 0 < add.quantile(0.5) <= add.quantile(0.99)
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        console.execute_command("complete", ["1"])
+        console.execute_command("stats", [])
+    assert metrics.stats("command", "complete").count == 1
+    assert metrics.stats("service", "mark_task_complete").count == 1
+    assert "add_task" in output.getvalue() and "complete" in output.getvalue()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "todo.prom")
+        with redirect_stdout(io.StringIO()):
+            console.execute_command("stats", ["--prometheus", path])
+        with open(path) as file:
+            text = file.read()
+    labels = 'layer="service",operation="add_task"'
+    assert f'todo_operation_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"todo_operation_seconds_count{{{labels}}} 3" in text
+    assert f"todo_operation_errors_total{{{labels}}} 1" in text
+
+    with redirect_stdout(io.StringIO()):
+        console.execute_command("stats", ["--reset"])
+    assert metrics.stats("service", "add_task").count == 0
+
+    # The profiler records collapsed stacks of the sampled threads
+    profiler = SampledProfiler(interval=0.001)
+    profiler.start()
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        task_service.get_all_tasks()
+    profiler.stop()
+    assert profiler.sample_count > 0
+    assert any("test_metrics_and_profiler" in stack for stack in profiler.samples)
+
+    print("✓ Metrics and profiler tests completed!")
+
+
+def test_benchmark_suite():
+    """Test the seeded workload generator and the regression gate."""
+    import copy
+    from benchmarks.suite import compare, run_case
+    from benchmarks.workload import TEXT_SIZES, Workload
+    print("\nTesting benchmark suite...")
+
+    # The same seed always produces the same work
+    first, second = Workload(7, "churn", "medium"), Workload(7, "churn", "medium")
+    assert first.preload(50) == second.preload(50)
+    assert list(first.operations(500)) == list(second.operations(500))
+    assert list(Workload(8).operations(100)) != list(Workload(7).operations(100))
+
+    # Operations only ever target tasks that exist at that point
+    workload = Workload(3, "balanced", "large")
+    live = set(range(1, len(workload.preload(20)) + 1))
+    (low, high), _ = TEXT_SIZES["large"]
+    for op, task_id, title, description in workload.operations(2000):
+        if op == "add":
+            assert task_id not in live and low <= len(title) <= high
+            live.add(task_id)
+        elif op == "delete":
+            live.remove(task_id)
+        elif op != "list":
+            assert task_id in live
+
+    for driver in ("service", "console"):
+        result = run_case(driver, 200, "balanced", "small", 300, 1)
+        assert result["ops"] == 300 and result["ops_per_sec"] > 0
+        assert result["latency"]["p50_us"] <= result["latency"]["p99_us"] <= result["latency"]["max_us"]
+        assert sum(op["count"] for op in result["per_operation"].values()) == 300
+
+    # A slower or larger run than the baseline is reported
+    baseline = {"results": [result]}
+    assert compare([result], baseline) == []
+    slower = copy.deepcopy(result)
+    slower["ops_per_sec"] = result["ops_per_sec"] / 2
+    slower["peak_rss_mb"] = result["peak_rss_mb"] * 2
+    regressions = compare([slower], baseline)
+    assert len(regressions) == 2
+    assert "ops/sec" in regressions[0] and "peak RSS" in regressions[1]
+
+    print("✓ Benchmark suite tests completed!")
+
+
+def test_mapped_snapshot():
+    """Test binary snapshots, lazily mapped and eagerly loaded."""
+    print("\nTesting mapped snapshot...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        def open_mapped():
+            return TaskService(MappedTaskStore(), JournalPersistence(directory, snapshot_format="binary"))
+
+        task_service = open_mapped()
+        for i in range(6):
+            task_service.add_task(f"Task {i}", "Details" if i % 2 else None)
+        task_service.persistence.snapshot()
+        store = task_service.store
+        assert len(store.snapshot) == 6 and len(store.overlay) == 0
+
+        # Changes to snapshot tasks go to the overlay and hide the mapped rows
+        task_service.update_task(2, "Renamed")
+        task_service.mark_task_complete(3)
+        task_service.delete_task(4)
+        task_service.add_task("After snapshot")
+        assert [task.id for task in task_service.get_all_tasks()] == [1, 2, 3, 5, 6, 7]
+        assert store.get(2).title == "Renamed" and 4 not in store and len(store) == 6
+        task_service.undo()
+        task_service.undo()
+        assert [task.id for task in task_service.get_all_tasks()] == [1, 2, 3, 4, 5, 6]
+        task_service.delete_task(6)
+        task_service.close()
+
+        # The journal tail is replayed over the mapped snapshot at startup
+        restored = open_mapped()
+        assert isinstance(restored.store.snapshot, MappedSnapshot)
+        assert [task.id for task in restored.get_all_tasks()] == [1, 2, 3, 4, 5]
+        assert restored.get_task_by_id(2).title == "Renamed"
+        assert restored.get_task_by_id(3).completed
+        assert restored.get_task_by_id(1).description is None
+        assert restored.get_task_by_id(2).description == "Details"
+        assert restored.next_id == 8
+        assert [task.id for task in restored.search("renamed")] == [2]
+
+        # Compaction writes a new snapshot and empties the overlay
+        restored.persistence.snapshot()
+        assert len(restored.store.overlay) == 0 and len(restored.store) == 5
+        restored.close()
+
+        # Other stores load a binary snapshot eagerly
+        eager = TaskService(persistence=JournalPersistence(directory))
+        assert [task.title for task in eager.get_all_tasks()][:2] == ["Task 0", "Renamed"]
+        assert eager.next_id == 8
+        eager.close()
+
+        path = os.path.join(directory, "bogus.bin")
+        with open(path, "wb") as handle:
+            handle.write(b"not a snapshot" * 10)
+        try:
+            MappedSnapshot(path)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+
+    print("✓ Mapped snapshot tests completed!")
+
+
+def test_archive_tier():
+    """Test archiving completed tasks to cold segments and bringing them back."""
+    print("\nTesting archive tier...")
+    from datetime import timedelta
+
+    with tempfile.TemporaryDirectory() as directory:
+        def open_service():
+            archive = TaskArchive(os.path.join(directory, "archive"), timedelta(0))
+            archive.SEGMENT_SIZE = 2
+            return TaskService(ColumnarTaskStore(), JournalPersistence(directory), archive=archive)
+
+        task_service = open_service()
+        for i in range(8):
+            task_service.add_task(f"Task {i}", "Details" if i % 2 else None)
+        task_service.complete_many([1, 2, 3, 5, 8])
+        assert task_service.archive_completed(timedelta(days=1)) == 0
+        deleted = []
+        task_service.events.subscribe(lambda events: deleted.extend(events))
+        assert task_service.archive_completed() == 5
+        assert deleted == []  # tier moves are not changes
+        assert len(task_service.archive.segments) == 3
+
+        # Archived tasks leave the hot tier but can still be found
+        assert [task.id for task in task_service.get_all_tasks()] == [4, 6, 7]
+        assert task_service.query(completed=True) == []
+        assert task_service.search("task") and 2 not in [t.id for t in task_service.search("task")]
+        assert task_service.get_task_by_id(2).description == "Details"
+        assert [task.id for task in task_service.iter_tasks(archived=True)] == list(range(1, 9))
+        assert [task.id for task in task_service.iter_tasks(3, 2, archived=True)] == [4, 5]
+
+        # Changing an archived task promotes it back first
+        task_service.mark_task_incomplete(3)
+        assert 3 in task_service.store and 3 not in task_service.archive
+        assert [task.id for task in task_service.query(completed=False)] == [3, 4, 6, 7]
+        task_service.delete_task(8)
+        assert task_service.get_task_by_id(8) is None
+        task_service.close()
+
+        # Both tiers survive a restart; emptied segments are removed
+        restored = open_service()
+        assert [task.id for task in restored.get_all_tasks()] == [3, 4, 6, 7]
+        assert [task.id for task in restored.iter_tasks(archived=True)] == [1, 2, 3, 4, 5, 6, 7]
+        assert len(restored.archive.segments) == 2 and restored.next_id == 9
+        assert not os.path.exists(os.path.join(directory, "archive", "segment-000003.z"))
+
+        # The console lists archived tasks with --all and archives on demand
+        console = ConsoleInterface(restored)
+        restored.mark_task_complete(4)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            console.execute_command("archive", ["--older-than", "0"])
+            console.execute_command("list", [])
+            console.execute_command("list", ["--all", "--limit", "2"])
+        text = output.getvalue()
+        assert "Archived 1 tasks" in text
+        assert "[1] Task 0" in text and "Next page: list --all --after 2 --limit 2" in text
+
+        # A crash after writing a segment leaves a task in both tiers; the hot copy wins
+        restored.archive.add([restored.get_task_by_id(6)])
+        restored.close()
+        recovered = open_service()
+        assert 6 in recovered.store and 6 not in recovered.archive
+        recovered.close()
+
+    with redirect_stdout(io.StringIO()) as output:
+        ConsoleInterface(TaskService()).execute_command("archive", [])
+    assert "--archive-after" in output.getvalue()
+
+    # Export covers both tiers
+    with tempfile.TemporaryDirectory() as directory:
+        task_service = TaskService(archive=TaskArchive(os.path.join(directory, "archive")))
+        task_service.add_many([("A", None), ("B", None), ("C", None), ("D", None)])
+        task_service.complete_many([1, 3])
+        assert task_service.archive_completed(timedelta(0)) == 2
+        path = os.path.join(directory, "tasks.jsonl")
+        assert task_service.export_tasks(path) == 4
+        with open(path) as handle:
+            assert [json.loads(line)["id"] for line in handle] == [1, 2, 3, 4]
+
+    # Interleaved segments are each decompressed once per scan, newest copy winning
+    with tempfile.TemporaryDirectory() as directory:
+        from src.models.task import Task
+        archive = TaskArchive(directory, cached_segments=1)
+        archive.add([Task(i, f"Odd {i}") for i in range(1, 200, 2)])
+        archive.add([Task(i, f"Even {i}") for i in range(2, 201, 2)])
+        archive.add([Task(3, "Newer 3")])
+        archive.remove(5)
+        loads = []
+        load = archive._load
+        archive._load = lambda name: loads.append(name) or load(name)
+        tasks = list(archive.iter_from(2))
+        assert [task.id for task in tasks] == [3, 4] + list(range(6, 201))
+        assert tasks[0].title == "Newer 3" and len(loads) == 3
+
+    print("✓ Archive tier tests completed!")
+
+
+def test_summary_aggregates():
+    """Test incrementally maintained counts and per-day histograms."""
+    print("\nTesting summary aggregates...")
+    from datetime import date
+    from src.services.aggregates import TaskAggregates
+
+    task_service = TaskService()
+    for i in range(6):
+        task_service.add_task(f"Task {i}")
+    summary = task_service.summary()
+    assert (summary.total, summary.open, summary.completed) == (6, 6, 0)
+
+    # Every kind of mutation keeps the counts equal to a fresh recount
+    task_service.mark_task_complete(1)
+    task_service.complete_many([2, 3, 4])
+    task_service.mark_task_incomplete(4)
+    task_service.update_task(2, "Edited after completion")
+    task_service.delete_task(3)
+    task_service.undo()
+    task_service.delete_many([5, 6])
+    summary = task_service.summary()
+    recount = TaskAggregates(task_service.get_all_tasks()).summary()
+    assert summary == recount
+    today = date.today()
+    assert (summary.total, summary.open, summary.completed) == (4, 1, 3)
+    assert summary.created_per_day == {today: 4} and summary.completed_per_day == {today: 3}
+    assert summary.completion_rate == 0.75
+    assert summary.recent(2)[-1] == (today, 4, 3) and summary.recent(2)[0][1:] == (0, 0)
+
+    # Other engines report the same figures
+    sqlite_service = SqliteTaskService(":memory:")
+    sqlite_service.add_many([("A", None), ("B", None)])
+    sqlite_service.mark_task_complete(2)
+    assert sqlite_service.summary() == TaskAggregates(sqlite_service.get_all_tasks()).summary()
+    assert (task_service.summary() + sqlite_service.summary()).total == 6
+    sqlite_service.close()
+
+    # SQLite keeps per-day counts in a table as it writes, and builds it for older databases
+    from datetime import datetime
+    from src.models.task import Task
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "todo.db")
+        sqlite_service = SqliteTaskService(path)
+        old = datetime(2025, 3, 1, 12)
+        sqlite_service.import_many([Task(id=0, title="Old", completed=True, created_at=old, updated_at=old),
+                                    Task(id=0, title="Older", created_at=old, updated_at=old)])
+        sqlite_service.add_many([("A", None), ("B", None), ("C", None)])
+        sqlite_service.complete_many([3, 4])
+        sqlite_service.mark_task_incomplete(3)
+        sqlite_service.update_task(1, "Edited after completion")
+        sqlite_service.delete_many([2, 4])
+        sqlite_service.schedule_task(1, priority=3)
+        sqlite_service.delete_task(5)
+        summary = sqlite_service.summary()
+        assert summary == TaskAggregates(sqlite_service.get_all_tasks()).summary()
+        assert summary.created_per_day == {old.date(): 1, today: 1} and summary.completed_per_day == {today: 1}
+        sqlite_service.connection.executescript("DROP TABLE task_days;")
+        sqlite_service.close()
+
+        sqlite_service = SqliteTaskService(path)
+        assert sqlite_service.summary() == summary
+        sqlite_service.add_task("D")
+        assert sqlite_service.summary().created_per_day[today] == 2
+        sqlite_service.close()
+
+    # Console and API
+    output = io.StringIO()
+    with redirect_stdout(output):
+        ConsoleInterface(task_service).execute_command("summary", ["--days", "3"])
+    assert "4 total, 1 open, 3 completed (75% done)" in output.getvalue()
+    assert [today.isoformat(), "4", "3"] in [line.split() for line in output.getvalue().splitlines()]
+    status, payload = TaskAPI(task_service).handle("GET", "/summary", b"")
+    assert status == 200 and payload["open"] == 1
+    assert payload["completed_per_day"] == {today.isoformat(): 3}
+
+    print("✓ Summary aggregate tests completed!")
+
+
+def test_scheduler():
+    """Test due dates, priorities, the scheduling heaps and reminders."""
+    print("\nTesting scheduler...")
+    import threading
+    from datetime import datetime, timedelta
+    from src.cli.parser import parse_duration
+    from src.storage.mapped import SnapshotView, pack_snapshot
+
+    now = datetime.now()
+    for task_service in (TaskService(), TaskService(ColumnarTaskStore()), SqliteTaskService(":memory:")):
+        task_service.add_task("Someday")
+        task_service.add_task("Urgent", due_at=now + timedelta(minutes=30), priority=9)
+        task_service.add_task("Overdue", due_at=now - timedelta(hours=1), priority=2)
+        task_service.add_task("Next week", due_at=now + timedelta(days=7), priority=9)
+        task_service.add_task("Done", due_at=now - timedelta(days=1), priority=9)
+        task_service.mark_task_complete(5)
+        assert [task.id for task in task_service.next_tasks(10)] == [2, 4, 3, 1]
+        assert [task.id for task in task_service.next_tasks(2, by="due")] == [3, 2]
+        assert [task.id for task in task_service.due_tasks(timedelta(hours=1))] == [3, 2]
+
+        # Changes replace stale heap entries
+        task_service.schedule_task(1, due_at=now + timedelta(minutes=5), priority=9)
+        task_service.schedule_task(2, clear_due=True)
+        task_service.mark_task_complete(3)
+        task_service.delete_task(4)
+        assert [task.id for task in task_service.next_tasks(10)] == [1, 2]
+        assert [task.id for task in task_service.due_tasks(timedelta(hours=1))] == [1]
+        assert task_service.get_task_by_id(2).due_at is None
+        try:
+            task_service.schedule_task(1, priority=10)
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+        if isinstance(task_service, SqliteTaskService):
+            task_service.close()
+
+    # Undo restores the old schedule; the binary snapshot keeps both fields
+    task_service = TaskService()
+    task = task_service.add_task("Report", due_at=now, priority=4)
+    task_service.schedule_task(task.id, priority=1)
+    task_service.undo()
+    assert task_service.next_tasks(1)[0].priority == 4
+    assert SnapshotView(pack_snapshot([task])).get(task.id).to_dict() == task.to_dict()
+
+    # Reminders fire once per due date, woken by the heap rather than polling
+    task_service = TaskService()
+    fired, ready = [], threading.Event()
+
+    def remind(reminders):
+        fired.extend(reminders)
+        ready.set()
+
+    task_service.add_task("Past", due_at=now - timedelta(minutes=1))
+    task_service.start_reminders(remind)
+    assert ready.wait(5) and fired == [(1, now - timedelta(minutes=1))]
+    ready.clear()
+    task_service.add_task("Soon", due_at=datetime.now() + timedelta(milliseconds=50))
+    assert ready.wait(5) and [task_id for task_id, _ in fired] == [1, 2]
+    task_service.stop_reminders()
+
+    # Console and API
+    assert parse_duration("1h30m") == timedelta(hours=1, minutes=30)
+    task_service = TaskService()
+    console = ConsoleInterface(task_service)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        console.execute_command("add", ["Pay rent", "--due", "30m", "--priority", "8"])
+        console.execute_command("add", ["Water plants"])
+        console.execute_command("schedule", ["2", "--priority", "9"])
+        console.execute_command("next", ["--limit", "1"])
+        console.execute_command("due", ["--within", "1h"])
+    assert "Priority: 8" in output.getvalue() and "Due: " in output.getvalue()
+    next_block = output.getvalue().split("Next tasks by priority:")[1].split("Open tasks due")[0]
+    assert "Water plants" in next_block and "Pay rent" not in next_block
+    assert "Pay rent" in output.getvalue().split("Open tasks due within 1h:")[1]
+    status, payload = TaskAPI(task_service).handle("GET", "/due?within=3600", b"")
+    assert status == 200 and [task["id"] for task in payload["tasks"]] == [1]
+
+    # Due dates with a UTC offset are stored as naive local time
+    soon = (datetime.now() + timedelta(minutes=10)).astimezone()
+    with redirect_stdout(output):
+        console.execute_command("add", ["Aware", "--due", soon.isoformat()])
+    status, payload = TaskAPI(task_service).handle(
+        "POST", "/tasks", json.dumps({"title": "Zulu", "due_at": "2026-01-01T00:00:00Z"}).encode())
+    assert status == 201
+    assert task_service.get_task_by_id(3).due_at == soon.replace(tzinfo=None)
+    assert task_service.get_task_by_id(4).due_at.tzinfo is None
+    assert [task.id for task in task_service.due_tasks(timedelta(days=30))] == [4, 3, 1]
+    assert [task.id for task in task_service.next_tasks(10, by="due")] == [4, 3, 1]
+    with redirect_stdout(output):
+        assert console.execute_command("next", ["--by", "due"])
+        assert console.execute_command("due", ["--within", "30d"])
+    status, payload = TaskAPI(task_service).handle("GET", "/next?by=due", b"")
+    assert status == 200 and [task["id"] for task in payload["tasks"]] == [4, 3, 1]
+
+    print("✓ Scheduler tests completed!")
+
+
+def test_idempotent_add_and_dedupe():
+    """Test idempotency keys, the content hash index and the dedupe command."""
+    print("\nTesting idempotent adds and dedupe...")
+    from datetime import timedelta
+    from src.services.dedupe import ContentIndex, DuplicateTaskError, IdempotencyKeys
+
+    # The key map expires keys after the TTL and drops the least recently used
+    now = [0.0]
+    keys = IdempotencyKeys(capacity=2, ttl=timedelta(seconds=10), clock=lambda: now[0])
+    keys.put("a", 1)
+    keys.put("b", 2)
+    assert keys.get("a") == 1
+    keys.put("c", 3)
+    assert "b" not in keys and keys.get("a") == 1 and len(keys) == 2
+    now[0] = 10.0
+    assert keys.get("a") is None and keys.get("c") is None
+
+    for task_service in (TaskService(), TaskService(ColumnarTaskStore()), SqliteTaskService(":memory:")):
+        first = task_service.add_task("Buy milk", key="retry-1")
+        assert task_service.add_task("Buy milk", key="retry-1").id == first.id
+        task_service.add_task("  buy   MILK ")
+        task_service.add_task("Call Bob", "About the rent")
+        task_service.add_task("call bob", "about the  rent")
+        task_service.add_task("Call Bob", "About something else")
+        assert [task.id for task in task_service.find_duplicates("BUY MILK")] == [1, 2]
+        assert [[task.id for task in group] for group in task_service.duplicate_groups()] == [[1, 2], [3, 4]]
+        try:
+            task_service.add_task("buy milk", unique=True)
+            assert False, "Should have raised DuplicateTaskError"
+        except DuplicateTaskError as e:
+            assert e.task.id == 1
+        # Edits move tasks between groups
+        task_service.update_task(2, "Buy oat milk")
+        task_service.update_task(5, None, "About the rent")
+        assert [[task.id for task in group] for group in task_service.duplicate_groups()] == [[3, 4, 5]]
+        if isinstance(task_service, SqliteTaskService):
+            task_service.close()
+
+    # The index agrees with a fresh rebuild after deletes and undo
+    task_service = TaskService()
+    task_service.add_many([("A", None), ("a", None), ("B", None), ("A", None)])
+    task_service.delete_task(2)
+    task_service.undo()
+    task_service.delete_task(4)
+    assert task_service.content_index.groups() == ContentIndex(task_service.get_all_tasks()).groups() == [[1, 2]]
+
+    # Console and API
+    console = ConsoleInterface(task_service)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        console.execute_command("add", ["b", "--unique"])
+        console.execute_command("add", ["Retried", "--key", "k"])
+        console.execute_command("add", ["Retried", "--key", "k"])
+        console.execute_command("dedupe", ["--delete"])
+        console.execute_command("dedupe", [])
+    assert "Task 3 already has this title and description" in output.getvalue()
+    assert output.getvalue().count("ID: 5,") == 2
+    assert "  1, 2: A" in output.getvalue() and "No duplicate tasks." in output.getvalue()
+    assert task_service.get_task_by_id(2) is None
+    api = TaskAPI(task_service)
+    status, payload = api.handle("POST", "/tasks", json.dumps({"title": "A ", "unique": True}).encode())
+    assert status == 409 and payload["task"]["id"] == 1
+
+    print("✓ Idempotent add and dedupe tests completed!")
+
+
 if __name__ == "__main__":
     test_task_operations()
     test_console_commands()
-    print("\n🎉 All Phase I tests completed successfully!")
\ No newline at end of file
+    test_id_index()
+    test_columnar_store()
+    test_journal_persistence()
+    test_sqlite_engine()
+    test_paginated_listing()
+    test_filtered_queries()
+    test_search()
+    test_batch_mode()
+    test_import_export()
+    test_parser_and_dispatch()
+    test_http_api()
+    test_bulk_operations()
+    test_undo_history()
+    test_event_bus()
+    test_thread_safe_service()
+    test_sharded_service()
+    test_render_cache()
+    test_metrics_and_profiler()
+    test_benchmark_suite()
+    test_mapped_snapshot()
+    test_archive_tier()
+    test_summary_aggregates()
+    test_scheduler()
+    test_idempotent_add_and_dedupe()
+    print("\n🎉 All Phase I tests completed successfully!")